@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Category, Review, ReviewReply, Blog, BlogComment, BlogCommentReply, Partner, PartnerComment, PartnerCommentReply, AboutPost, AboutComment, AboutCommentReply, DonationCampaign, Donation, UserProfile, ContactMessage
+from .models import Category, Review, ReviewReply, PlaceRatingSummary, UserStats, Blog, Partner, AboutPost, Comment, CommentReply, DonationCampaign, Donation, UserProfile, ContactMessage
 
 
 @admin.register(ContactMessage)
@@ -56,7 +56,8 @@ class ReviewAdmin(admin.ModelAdmin):
     list_display = ['author_name', 'place_name', 'get_average_rating', 'created_at', 'is_active']
     list_filter = ['is_active', 'created_at', 'place_id']
     search_fields = ['author_name', 'author_email', 'place_name', 'review_text']
-    readonly_fields = ['created_at', 'updated_at']
+    # Engagement is only written by the flush, saving the form leaves it out
+    readonly_fields = ['likes', 'dislikes', 'hearts', 'created_at', 'updated_at']
     list_editable = ['is_active']
     
     fieldsets = (
@@ -108,6 +109,34 @@ class ReviewReplyAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(PlaceRatingSummary)
+class PlaceRatingSummaryAdmin(admin.ModelAdmin):
+    list_display = ['place_id', 'review_count', 'average_rating', 'last_review_at', 'updated_at']
+    search_fields = ['place_id']
+    ordering = ['-last_review_at']
+    
+    def has_add_permission(self, request):
+        # Maintained from reviews, use the reconcile_rating_summaries command to fix drift
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(UserStats)
+class UserStatsAdmin(admin.ModelAdmin):
+    list_display = ['user', 'review_count', 'reply_count', 'likes', 'hearts', 'updated_at']
+    search_fields = ['user__username', 'user__email']
+    raw_id_fields = ['user']
+    
+    def has_add_permission(self, request):
+        # Maintained from reviews and replies, use the reconcile_user_stats command to fix drift
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Blog)
 class BlogAdmin(admin.ModelAdmin):
     list_display = ['title', 'author', 'status', 'created_at', 'updated_at']
@@ -144,69 +173,37 @@ class BlogAdmin(admin.ModelAdmin):
         return readonly
 
 
-@admin.register(PartnerComment)
-class PartnerCommentAdmin(admin.ModelAdmin):
-    list_display = ['author_name', 'partner', 'created_at', 'is_active', 'is_approved']
-    list_filter = ['is_active', 'is_approved', 'created_at']
-    search_fields = ['author_name', 'author_email', 'comment_text', 'partner__title']
-    readonly_fields = ['created_at', 'updated_at']
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ['author_name', 'content_object', 'content_type', 'created_at', 'is_active', 'is_approved']
+    list_filter = ['content_type', 'is_active', 'is_approved', 'created_at']
+    search_fields = ['author_name', 'author_email', 'comment_text']
+    readonly_fields = ['reply_count', 'created_at', 'updated_at']
     list_editable = ['is_active', 'is_approved']
+    list_select_related = ['content_type']
     
     fieldsets = (
         ('Comment Information', {
-            'fields': ('partner', 'author_name', 'author_email', 'comment_text', 'save_info', 'is_active', 'is_approved')
-        }),
-        ('Timestamps', {
-            'fields': ('created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
-    )
-
-
-@admin.register(PartnerCommentReply)
-class PartnerCommentReplyAdmin(admin.ModelAdmin):
-    list_display = ['author_name', 'comment', 'created_at', 'is_active', 'is_approved']
-    list_filter = ['is_active', 'is_approved', 'created_at']
-    search_fields = ['author_name', 'author_email', 'reply_text', 'comment__partner__title']
-    readonly_fields = ['created_at', 'updated_at']
-    list_editable = ['is_active', 'is_approved']
-    
-    fieldsets = (
-        ('Reply Information', {
-            'fields': ('comment', 'parent_reply', 'author_name', 'author_email', 'reply_text', 'is_active', 'is_approved')
+            'fields': ('content_type', 'object_id', 'author_name', 'author_email', 'comment_text', 'save_info', 'is_active', 'is_approved', 'reply_count')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
-
-
-@admin.register(BlogComment)
-class BlogCommentAdmin(admin.ModelAdmin):
-    list_display = ['author_name', 'blog', 'created_at', 'is_active', 'is_approved']
-    list_filter = ['is_active', 'is_approved', 'created_at']
-    search_fields = ['author_name', 'author_email', 'comment_text', 'blog__title']
-    readonly_fields = ['created_at', 'updated_at', 'is_approved']
-    list_editable = ['is_active', 'is_approved']
     
-    fieldsets = (
-        ('Comment Information', {
-            'fields': ('blog', 'author_name', 'author_email', 'comment_text', 'save_info', 'is_active', 'is_approved')
-        }),
-        ('Timestamps', {
-            'fields': ('created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
-    )
+    def get_queryset(self, request):
+        # The commented posts of a page in one query per post type, not one per row
+        return super().get_queryset(request).prefetch_related('content_object')
 
 
-@admin.register(BlogCommentReply)
-class BlogCommentReplyAdmin(admin.ModelAdmin):
+@admin.register(CommentReply)
+class CommentReplyAdmin(admin.ModelAdmin):
     list_display = ['author_name', 'comment', 'created_at', 'is_active', 'is_approved']
-    list_filter = ['is_active', 'is_approved', 'created_at']
-    search_fields = ['author_name', 'author_email', 'reply_text', 'comment__blog__title']
-    readonly_fields = ['created_at', 'updated_at', 'is_approved']
+    list_filter = ['comment__content_type', 'is_active', 'is_approved', 'created_at']
+    search_fields = ['author_name', 'author_email', 'reply_text']
+    readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['comment', 'parent_reply']
     list_editable = ['is_active', 'is_approved']
     
     fieldsets = (
@@ -296,44 +293,6 @@ class AboutPostAdmin(admin.ModelAdmin):
         return readonly
 
 
-@admin.register(AboutComment)
-class AboutCommentAdmin(admin.ModelAdmin):
-    list_display = ['author_name', 'about_post', 'created_at', 'is_active', 'is_approved']
-    list_filter = ['is_active', 'is_approved', 'created_at']
-    search_fields = ['author_name', 'author_email', 'comment_text', 'about_post__title']
-    readonly_fields = ['created_at', 'updated_at']
-    list_editable = ['is_active', 'is_approved']
-    
-    fieldsets = (
-        ('Comment Information', {
-            'fields': ('about_post', 'author_name', 'author_email', 'comment_text', 'save_info', 'is_active', 'is_approved')
-        }),
-        ('Timestamps', {
-            'fields': ('created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
-    )
-
-
-@admin.register(AboutCommentReply)
-class AboutCommentReplyAdmin(admin.ModelAdmin):
-    list_display = ['author_name', 'comment', 'created_at', 'is_active', 'is_approved']
-    list_filter = ['is_active', 'is_approved', 'created_at']
-    search_fields = ['author_name', 'author_email', 'reply_text', 'comment__about_post__title']
-    readonly_fields = ['created_at', 'updated_at']
-    list_editable = ['is_active', 'is_approved']
-    
-    fieldsets = (
-        ('Reply Information', {
-            'fields': ('comment', 'parent_reply', 'author_name', 'author_email', 'reply_text', 'is_active', 'is_approved')
-        }),
-        ('Timestamps', {
-            'fields': ('created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
-    )
-
-
 @admin.register(DonationCampaign)
 class DonationCampaignAdmin(admin.ModelAdmin):
     list_display = ['title', 'target_amount', 'raised_amount', 'is_active', 'order', 'created_at']
@@ -0,0 +1,354 @@
+"""
+Incrementally maintained aggregates.
+
+Review, comment and reply changes are turned into deltas and applied with
+single F() expression UPDATEs inside the same transaction as the write, so
+readers get per-place rating totals, per-user contribution stats and
+comment/reply counts in O(1). The
+rebuild functions recompute everything from scratch and back the
+reconcile management commands.
+"""
+from collections import namedtuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, ExpressionWrapper, F, FloatField, Max, Q, Sum, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import (
+    COMMENTABLE_MODELS, Comment, CommentReply, PlaceRatingSummary, Review, ReviewReply, UserStats,
+)
+
+
+SUMMARY_SUM_FIELDS = {
+    'quality_rating': 'quality_sum',
+    'location_rating': 'location_sum',
+    'service_rating': 'service_sum',
+    'price_rating': 'price_sum',
+}
+
+
+def _rating_contribution(values):
+    """(place_id, {sum_field: rating}) counted by an active review, or None"""
+    if not values or not values.get('is_active'):
+        return None
+    return values['place_id'], {
+        sum_field: values[rating_field] for rating_field, sum_field in SUMMARY_SUM_FIELDS.items()
+    }
+
+
+def _current_values(review):
+    return {name: getattr(review, name) for name in Review.tracked_fields}
+
+
+def apply_place_rating_delta(place_id, count, sums, review_time=None):
+    """
+    Add `count` reviews and the rating `sums` to a place summary in one
+    UPDATE, creating the summary on first review. The average is computed
+    from the pre-update column values plus the deltas, so it is consistent
+    with the new totals.
+    """
+    new_count = F('review_count') + count
+    new_total = sum((F(field) + sums.get(field, 0) for field in SUMMARY_SUM_FIELDS.values()), Value(0))
+    updates = {field: F(field) + sums.get(field, 0) for field in SUMMARY_SUM_FIELDS.values()}
+    updates.update(
+        review_count=new_count,
+        average_rating=Case(
+            When(review_count__gt=-count, then=ExpressionWrapper(new_total * 1.0 / (new_count * 4), output_field=FloatField())),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+        updated_at=timezone.now(),
+    )
+
+    with transaction.atomic():
+        updated = PlaceRatingSummary.objects.filter(place_id=place_id).update(**updates)
+        if not updated and count > 0:
+            try:
+                with transaction.atomic():
+                    PlaceRatingSummary.objects.create(
+                        place_id=place_id,
+                        review_count=count,
+                        average_rating=sum(sums.values()) / (count * 4),
+                        last_review_at=review_time,
+                        **sums
+                    )
+                return
+            except IntegrityError:
+                # Created concurrently, apply as an update instead
+                PlaceRatingSummary.objects.filter(place_id=place_id).update(**updates)
+        if review_time and count > 0:
+            PlaceRatingSummary.objects.filter(place_id=place_id).filter(
+                Q(last_review_at__isnull=True) | Q(last_review_at__lt=review_time)
+            ).update(last_review_at=review_time)
+
+
+def bump_place_versions(place_ids):
+    """Mark the reviews of these places as changed for clients holding a copy (ETags)"""
+    PlaceRatingSummary.objects.filter(place_id__in=list(place_ids)).update(version=F('version') + 1)
+
+
+def bump_place_versions_of_reviews(reviews):
+    """bump_place_versions() for the places of a Review queryset, in one UPDATE"""
+    PlaceRatingSummary.objects.filter(place_id__in=reviews.values('place_id')).update(version=F('version') + 1)
+
+
+def update_place_rating_summary(review, deleted=False):
+    """Apply the change between a review's loaded and current state to its place summary"""
+    current = _current_values(review)
+    loaded = review.get_loaded_values()
+    # Fields deferred at load time are treated as unchanged
+    old = _rating_contribution(dict(current, **loaded) if loaded is not None else None)
+    new = None if deleted else _rating_contribution(current)
+    if old == new:
+        return
+
+    if old and new and old[0] == new[0]:
+        place_id = new[0]
+        sums = {field: new[1][field] - old[1][field] for field in SUMMARY_SUM_FIELDS.values()}
+        apply_place_rating_delta(place_id, 0, sums)
+        return
+
+    if old:
+        apply_place_rating_delta(old[0], -1, {field: -value for field, value in old[1].items()})
+    if new:
+        apply_place_rating_delta(new[0], 1, new[1], review_time=review.created_at)
+
+
+def rebuild_place_rating_summaries(batch_size=1000):
+    """
+    Recompute every place summary from active reviews.
+    Returns (created, updated, deleted) counts.
+    """
+    existing = {summary.place_id: summary for summary in PlaceRatingSummary.objects.all()}
+    totals = Review.objects.active().values('place_id').annotate(
+        review_count=Count('id'),
+        quality_sum=Sum('quality_rating'),
+        location_sum=Sum('location_rating'),
+        service_sum=Sum('service_rating'),
+        price_sum=Sum('price_rating'),
+        last_review_at=Max('created_at'),
+    ).order_by()
+
+    fields = ['review_count', 'last_review_at'] + list(SUMMARY_SUM_FIELDS.values())
+    now = timezone.now()
+    to_create, to_update, seen = [], [], set()
+    for row in totals.iterator():
+        place_id = row.pop('place_id')
+        seen.add(place_id)
+        row['average_rating'] = sum(row[field] for field in SUMMARY_SUM_FIELDS.values()) / (row['review_count'] * 4)
+        summary = existing.get(place_id)
+        if summary is None:
+            to_create.append(PlaceRatingSummary(place_id=place_id, **row))
+        elif (any(getattr(summary, field) != row[field] for field in fields)
+                or abs(summary.average_rating - row['average_rating']) > 1e-9):
+            for field, value in row.items():
+                setattr(summary, field, value)
+            summary.updated_at = now
+            to_update.append(summary)
+
+    stale = [place_id for place_id in existing if place_id not in seen]
+    with transaction.atomic():
+        PlaceRatingSummary.objects.bulk_create(to_create, batch_size=batch_size)
+        PlaceRatingSummary.objects.bulk_update(to_update, fields + ['average_rating', 'updated_at'], batch_size=batch_size)
+        for start in range(0, len(to_update), batch_size):
+            bump_place_versions(summary.place_id for summary in to_update[start:start + batch_size])
+        for start in range(0, len(stale), batch_size):
+            PlaceRatingSummary.objects.filter(place_id__in=stale[start:start + batch_size]).delete()
+    return len(to_create), len(to_update), len(stale)
+
+
+# A child row counts towards `counter_field` of its parent while all of
+# its `conditions` flags are set. A tuple of parent models means a generic
+# parent, identified by the child's (content_type_id, object_id)
+CounterSpec = namedtuple('CounterSpec', 'model parent_field parent_model counter_field conditions')
+
+COUNTER_SPECS = (
+    CounterSpec(ReviewReply, 'review', Review, 'reply_count', ('is_active',)),
+    CounterSpec(CommentReply, 'comment', Comment, 'reply_count', ('is_active', 'is_approved')),
+    CounterSpec(Comment, 'content_object', COMMENTABLE_MODELS, 'comment_count', ('is_active', 'is_approved')),
+)
+
+COUNTER_SPECS_BY_MODEL = {}
+for _spec in COUNTER_SPECS:
+    COUNTER_SPECS_BY_MODEL.setdefault(_spec.model, []).append(_spec)
+
+
+def _counted_parent(spec, values):
+    """Parent id a child with these values counts towards, or None"""
+    if not values or not all(values.get(flag) for flag in spec.conditions):
+        return None
+    if isinstance(spec.parent_model, tuple):
+        return values.get('content_type_id'), values.get('object_id')
+    return values.get(f'{spec.parent_field}_id')
+
+
+def adjust_counter(spec, parent, delta):
+    field = spec.counter_field
+    if isinstance(spec.parent_model, tuple):
+        content_type_id, parent = parent
+        parent_model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if parent_model not in spec.parent_model:
+            return
+    else:
+        parent_model = spec.parent_model
+    parent_model.objects.filter(pk=parent).update(**{field: Greatest(F(field) + delta, Value(0))})
+
+
+def update_counters(instance, deleted=False):
+    """Apply the change between a child's loaded and current state to its parent counters"""
+    current = {name: getattr(instance, name) for name in instance.tracked_fields}
+    loaded = instance.get_loaded_values()
+    for spec in COUNTER_SPECS_BY_MODEL.get(type(instance), ()):
+        old = _counted_parent(spec, dict(current, **loaded) if loaded is not None else None)
+        new = None if deleted else _counted_parent(spec, current)
+        if old == new:
+            continue
+        if old is not None:
+            adjust_counter(spec, old, -1)
+        if new is not None:
+            adjust_counter(spec, new, 1)
+
+
+def rebuild_counters(batch_size=1000):
+    """
+    Recompute every comment and reply counter from the child rows.
+    Returns {'<Parent>.<counter_field>': corrected rows}.
+    """
+    corrected = {}
+    for spec in COUNTER_SPECS:
+        generic = isinstance(spec.parent_model, tuple)
+        for parent_model in spec.parent_model if generic else (spec.parent_model,):
+            children = spec.model.objects.filter(**{flag: True for flag in spec.conditions})
+            if generic:
+                children = children.filter(content_type=ContentType.objects.get_for_model(parent_model))
+                parent_id_field = 'object_id'
+            else:
+                parent_id_field = f'{spec.parent_field}_id'
+            with transaction.atomic():
+                actual = dict(children.values_list(parent_id_field).annotate(count=Count('id')).order_by())
+                stale = []
+                for parent in parent_model.objects.only('pk', spec.counter_field).iterator():
+                    count = actual.get(parent.pk, 0)
+                    if getattr(parent, spec.counter_field) != count:
+                        setattr(parent, spec.counter_field, count)
+                        stale.append(parent)
+                parent_model.objects.bulk_update(stale, [spec.counter_field], batch_size=batch_size)
+            corrected[f'{parent_model.__name__}.{spec.counter_field}'] = len(stale)
+    return corrected
+
+
+USER_STATS_FIELDS = ('review_count', 'reply_count', 'rating_sum') + Review.ENGAGEMENT_FIELDS
+
+
+def _user_contribution(model, values):
+    """(user_id, {stats_field: value}) counted by an active owned review or reply, or None"""
+    if not values or not values.get('is_active') or not values.get('user_id'):
+        return None
+    if model is ReviewReply:
+        return values['user_id'], {'reply_count': 1}
+    contribution = {'review_count': 1, 'rating_sum': sum(values[field] for field in Review.RATING_FIELDS)}
+    contribution.update((field, values[field]) for field in Review.ENGAGEMENT_FIELDS)
+    return values['user_id'], contribution
+
+
+def apply_user_stats_delta(user_id, deltas):
+    """Add `deltas` to a user's stats in one UPDATE, creating the row on first contribution"""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updates = {field: Greatest(F(field) + delta, Value(0)) for field, delta in deltas.items()}
+    updates['updated_at'] = timezone.now()
+
+    with transaction.atomic():
+        if UserStats.objects.filter(user_id=user_id).update(**updates):
+            return
+        try:
+            with transaction.atomic():
+                UserStats.objects.create(
+                    user_id=user_id, **{field: max(delta, 0) for field, delta in deltas.items()}
+                )
+        except IntegrityError:
+            # Created concurrently, apply as an update instead
+            UserStats.objects.filter(user_id=user_id).update(**updates)
+
+
+def update_user_stats(instance, deleted=False):
+    """Apply the change between a review's or reply's loaded and current state to its owner's stats"""
+    model = type(instance)
+    current = {name: getattr(instance, name) for name in instance.tracked_fields}
+    loaded = instance.get_loaded_values()
+    old = _user_contribution(model, dict(current, **loaded) if loaded is not None else None)
+    new = None if deleted else _user_contribution(model, current)
+    if old == new:
+        return
+
+    if old and new and old[0] == new[0]:
+        apply_user_stats_delta(new[0], {field: new[1][field] - old[1][field] for field in new[1]})
+        return
+    if old:
+        apply_user_stats_delta(old[0], {field: -value for field, value in old[1].items()})
+    if new:
+        apply_user_stats_delta(new[0], new[1])
+
+
+def add_review_engagement_to_user_stats(review_deltas):
+    """
+    Carry engagement deltas about to be written to reviews, {review_pk: {field: delta}},
+    over to their owners' stats. Deltas are clamped the way the review UPDATE clamps them.
+    """
+    fields = list(Review.ENGAGEMENT_FIELDS)
+    per_user = {}
+    reviews = Review.objects.filter(
+        pk__in=list(review_deltas), is_active=True, user__isnull=False
+    ).values_list('pk', 'user_id', *fields)
+    for pk, user_id, *stored in reviews:
+        totals = per_user.setdefault(user_id, dict.fromkeys(fields, 0))
+        for field, value in zip(fields, stored):
+            delta = review_deltas[pk].get(field, 0)
+            totals[field] += max(value + delta, 0) - value
+    for user_id, deltas in per_user.items():
+        apply_user_stats_delta(user_id, deltas)
+
+
+def rebuild_user_stats(batch_size=1000):
+    """
+    Recompute every user's stats from active reviews and replies.
+    Returns (created, updated, deleted) counts.
+    """
+    rows = {}
+    review_totals = Review.objects.active().filter(user__isnull=False).values('user_id').annotate(
+        review_count=Count('id'),
+        rating_sum=Sum(sum((F(field) for field in Review.RATING_FIELDS[1:]), F(Review.RATING_FIELDS[0]))),
+        **{field: Sum(field) for field in Review.ENGAGEMENT_FIELDS},
+    ).order_by()
+    for row in review_totals.iterator():
+        rows[row.pop('user_id')] = row
+    reply_totals = ReviewReply.objects.active().filter(user__isnull=False).values('user_id').annotate(
+        reply_count=Count('id'),
+    ).order_by()
+    for row in reply_totals.iterator():
+        rows.setdefault(row['user_id'], {})['reply_count'] = row['reply_count']
+
+    existing = {stats.user_id: stats for stats in UserStats.objects.all()}
+    now = timezone.now()
+    to_create, to_update = [], []
+    for user_id, row in rows.items():
+        row = {field: row.get(field) or 0 for field in USER_STATS_FIELDS}
+        stats = existing.get(user_id)
+        if stats is None:
+            to_create.append(UserStats(user_id=user_id, **row))
+        elif any(getattr(stats, field) != value for field, value in row.items()):
+            for field, value in row.items():
+                setattr(stats, field, value)
+            stats.updated_at = now
+            to_update.append(stats)
+
+    stale = [user_id for user_id in existing if user_id not in rows]
+    with transaction.atomic():
+        UserStats.objects.bulk_create(to_create, batch_size=batch_size)
+        UserStats.objects.bulk_update(to_update, list(USER_STATS_FIELDS) + ['updated_at'], batch_size=batch_size)
+        for start in range(0, len(stale), batch_size):
+            UserStats.objects.filter(user_id__in=stale[start:start + batch_size]).delete()
+    return len(to_create), len(to_update), len(stale)
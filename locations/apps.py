@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class LocationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'locations'
+
+    def ready(self):
+        # Register cache invalidation and aggregate maintenance receivers
+        from . import signals  # noqa: F401
+        # Refuse engagement buffer caches that would lose clicks
+        from . import checks  # noqa: F401
@@ -0,0 +1,42 @@
+"""
+Initials avatars for people and places without a picture.
+
+The SVG depends on nothing but the name: up to two initials on a
+background picked from the brand palette by a hash of the name. The same
+name therefore always gets the same image at the same URL, and the
+endpoint lets browsers cache it forever (see views_avatars.py).
+"""
+import hashlib
+import re
+
+from django.utils.html import escape
+
+
+AVATAR_COLORS = ('#FF431E', '#FF6B35', '#E8590C', '#D9480F', '#C2255C', '#7048E8', '#1971C2', '#0C8599', '#2F9E44')
+# Longer names are cut, they only add URL length
+MAX_NAME_LENGTH = 100
+
+
+def initials(name):
+    """First letters of the first and last words, '?' for empty names"""
+    words = re.findall(r'\w+', name)
+    if not words:
+        return '?'
+    letters = words[0][0] + (words[-1][0] if len(words) > 1 else '')
+    return letters.upper()
+
+
+def avatar_color(name):
+    digest = hashlib.md5(name.strip().lower().encode('utf-8')).digest()
+    return AVATAR_COLORS[digest[0] % len(AVATAR_COLORS)]
+
+
+def initials_avatar_svg(name):
+    name = name[:MAX_NAME_LENGTH]
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" width="80" height="80" viewBox="0 0 80 80" role="img" aria-label="{label}">'
+        '<rect width="80" height="80" fill="{color}"/>'
+        '<text x="40" y="40" dy=".35em" text-anchor="middle" fill="#fff" '
+        'font-family="Arial, Helvetica, sans-serif" font-size="32" font-weight="700">{initials}</text>'
+        '</svg>'
+    ).format(label=escape(name), color=avatar_color(name), initials=escape(initials(name)))
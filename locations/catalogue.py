@@ -0,0 +1,79 @@
+"""
+Cached category catalogue with active location and review counts.
+
+The catalogue is rebuilt lazily after any Category, Location or Review
+change (see signals.py) and shared by the page views and the
+/api/categories/ endpoints.
+"""
+import hashlib
+import json
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Category, Location, Review
+
+
+CATALOGUE_CACHE_KEY = 'categories:catalogue'
+CATALOGUE_CACHE_TIMEOUT = 60 * 60
+
+
+def build_category_catalogue():
+    """Build the catalogue from the database (two aggregate queries plus one lookup)"""
+    categories = list(
+        Category.objects.annotate(
+            active_location_count=Count('location', filter=Q(location__status='active'))
+        ).order_by('name').values('id', 'name', 'icon', 'active_location_count')
+    )
+
+    # Reviews are keyed by Google place_id, so count them through the
+    # active locations linked to each place
+    active_places = Location.objects.filter(
+        status='active', category__isnull=False
+    ).exclude(place_id='')
+    review_counts = dict(
+        Review.objects.active().filter(
+            place_id__in=active_places.values('place_id'),
+        ).values_list('place_id').annotate(count=Count('id'))
+    )
+    category_review_counts = defaultdict(int)
+    for category_id, place_id in active_places.values_list('category_id', 'place_id').distinct():
+        category_review_counts[category_id] += review_counts.get(place_id, 0)
+
+    for category in categories:
+        category['review_count'] = category_review_counts.get(category['id'], 0)
+
+    payload = json.dumps(categories, sort_keys=True)
+    return {
+        'categories': categories,
+        'etag': hashlib.md5(payload.encode('utf-8')).hexdigest(),
+    }
+
+
+def _get_catalogue():
+    catalogue = cache.get(CATALOGUE_CACHE_KEY)
+    if catalogue is None:
+        catalogue = build_category_catalogue()
+        cache.set(CATALOGUE_CACHE_KEY, catalogue, CATALOGUE_CACHE_TIMEOUT)
+    return catalogue
+
+
+def get_category_catalogue():
+    """All categories, ordered by name, with active_location_count and review_count"""
+    return _get_catalogue()['categories']
+
+
+def get_active_categories():
+    """Categories that have at least one active location"""
+    return [category for category in get_category_catalogue() if category['active_location_count'] > 0]
+
+
+def catalogue_etag(active_only=False):
+    """ETag for the catalogue endpoints, changes whenever the catalogue does"""
+    etag = _get_catalogue()['etag']
+    return f"{etag}-active" if active_only else etag
+
+
+def invalidate_category_catalogue():
+    cache.delete(CATALOGUE_CACHE_KEY)
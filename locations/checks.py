@@ -0,0 +1,49 @@
+"""
+Startup checks for the engagement buffer cache (see engagement.py).
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from .engagement import ENGAGEMENT_CACHE_ALIAS
+
+
+LOCMEM_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+# Backends that would lose buffered clicks, with the reason why
+UNSUITABLE_ENGAGEMENT_BACKENDS = {
+    'django.core.cache.backends.dummy.DummyCache': 'stores nothing',
+    'django.core.cache.backends.memcached.PyMemcacheCache': 'evicts entries when memory runs short',
+    'django.core.cache.backends.memcached.PyLibMCCache': 'evicts entries when memory runs short',
+    'django.core.cache.backends.db.DatabaseCache': 'culls entries past MAX_ENTRIES and increments with a separate read and write',
+    'django.core.cache.backends.filebased.FileBasedCache': 'culls entries past MAX_ENTRIES and increments with a separate read and write',
+}
+
+
+@register(Tags.caches)
+def check_engagement_cache(app_configs, **kwargs):
+    config = settings.CACHES.get(ENGAGEMENT_CACHE_ALIAS)
+    if config is None:
+        return [Error(
+            f"CACHES has no '{ENGAGEMENT_CACHE_ALIAS}' alias.",
+            hint='Add it; with a LocMemCache engagement is written to the database directly.',
+            id='locations.E001',
+        )]
+
+    backend = config['BACKEND']
+    if backend == LOCMEM_BACKEND:
+        return []
+    if backend in UNSUITABLE_ENGAGEMENT_BACKENDS:
+        return [Error(
+            f"The '{ENGAGEMENT_CACHE_ALIAS}' cache {UNSUITABLE_ENGAGEMENT_BACKENDS[backend]}, "
+            'buffered likes, dislikes and hearts would be lost.',
+            hint='Use a shared Redis that does not evict, or a LocMemCache to write engagement directly.',
+            id='locations.E002',
+        )]
+    default = settings.CACHES.get('default', {})
+    if (default.get('BACKEND'), default.get('LOCATION')) == (backend, config.get('LOCATION')):
+        return [Error(
+            f"The '{ENGAGEMENT_CACHE_ALIAS}' cache shares its location with the default cache, "
+            'page and fragment entries would compete with buffered engagement for memory.',
+            hint='Point ENGAGEMENT_CACHE_LOCATION at a separate Redis database.',
+            id='locations.E003',
+        )]
+    return []
@@ -0,0 +1,87 @@
+"""
+Comments on any commentable content (see models.COMMENTABLE_MODELS).
+
+Every target shares the Comment/CommentReply tables, their partial
+indexes, counters and this loading path, so detail pages and the submit
+endpoints behave the same whatever the comment is attached to.
+
+The loaded comment tree of a post is cached under the post's
+comments_version, which the signals bump on every comment or reply write
+(submissions, admin approval, deactivation, deletion). A cache hit costs
+no comment queries; the count comes from the post's comment_count. The
+bump also stamps comments_updated_at, which feeds the Last-Modified of
+the detail pages (see conditional.py).
+"""
+from collections import namedtuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .models import COMMENTABLE_MODELS, AboutPost, Blog, Comment, CommentReply, Partner
+from .threads import attach_reply_trees
+
+
+# How the submit endpoints find a target: request field holding its id,
+# name used in error messages and the statuses that accept comments
+CommentTarget = namedtuple('CommentTarget', 'model id_field label statuses')
+
+COMMENT_TARGETS = {
+    'blog': CommentTarget(Blog, 'blog_id', 'Blog', ('published',)),
+    'partner': CommentTarget(Partner, 'partner_id', 'Partner', ('active', 'published')),
+    'about': CommentTarget(AboutPost, 'about_post_id', 'About post', ('published',)),
+}
+
+
+COMMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _thread_key(obj):
+    return f'comment_tree:{obj._meta.label_lower}:{obj.pk}:{obj.comments_version}'
+
+
+def comments_for(obj):
+    """
+    Visible comments of `obj`, newest first, each with its visible reply
+    tree attached as `replies`. Served from the cache when the post's
+    comments_version is unchanged, otherwise two queries, both answered
+    from the partial indexes.
+    """
+    key = _thread_key(obj)
+    comments = cache.get(key)
+    if comments is None:
+        comments = attach_reply_trees(
+            Comment.objects.active().filter(
+                content_type=ContentType.objects.get_for_model(obj),
+                object_id=obj.pk,
+            ).order_by('-created_at'),
+            CommentReply, 'comment',
+        )
+        cache.set(key, comments, COMMENT_CACHE_TIMEOUT)
+
+    # Linked after caching so the post is not stored with every thread
+    target = Comment.content_object
+    for comment in comments:
+        target.set_cached_value(comment, obj)
+    return comments
+
+
+def bump_comment_versions(targets):
+    """
+    Retire the cached comment threads of these (content_type_id, object_id)
+    posts. Returns the models of the posts.
+    """
+    object_ids = {}
+    for content_type_id, object_id in targets:
+        object_ids.setdefault(content_type_id, set()).add(object_id)
+    models = set()
+    for content_type_id, ids in object_ids.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model in COMMENTABLE_MODELS:
+            model.objects.filter(pk__in=ids).update(
+                comments_version=F('comments_version') + 1,
+                comments_updated_at=timezone.now(),
+            )
+            models.add(model)
+    return models
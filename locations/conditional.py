@@ -0,0 +1,59 @@
+"""
+Conditional GET for the blog, partner and about post detail pages.
+
+The validators come from one narrow query on the post, before it is
+loaded in full or anything is rendered. The ETag covers the post's
+updated_at and comments_version, the page cache version of its group
+(the sidebars list other posts of the same kind) and the visitor, as
+pages differ per signed in user. Last-Modified is the later of the
+post's updated_at and comments_updated_at.
+
+The responses are marked private, no-cache: with validators alone
+browsers may reuse a page heuristically for a while without asking, so a
+visitor would miss their own new comment.
+"""
+import hashlib
+
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .page_cache import group_version
+
+
+class ConditionalDetailMixin:
+    """DetailView mixin answering If-None-Match / If-Modified-Since with 304"""
+    # Page cache group whose version is folded into the ETag
+    page_cache_group = None
+
+    def get_validator_values(self):
+        """(pk, updated_at, comments_version, comments_updated_at) of the post, or None"""
+        if not hasattr(self, '_validator_values'):
+            slug = self.kwargs.get(self.slug_url_kwarg)
+            self._validator_values = self.get_queryset().filter(**{self.slug_field: slug}).values_list(
+                'pk', 'updated_at', 'comments_version', 'comments_updated_at',
+            ).first()
+        return self._validator_values
+
+    def get_etag(self, request, *args, **kwargs):
+        values = self.get_validator_values()
+        if values is None:
+            return None
+        pk, updated_at, comments_version, _ = values
+        parts = (
+            self.model._meta.label_lower, pk, updated_at.isoformat(), comments_version,
+            group_version(self.page_cache_group), request.user.pk,
+        )
+        return hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+    def get_last_modified(self, request, *args, **kwargs):
+        values = self.get_validator_values()
+        if values is None:
+            return None
+        _, updated_at, _, comments_updated_at = values
+        return max(updated_at, comments_updated_at or updated_at)
+
+    def get(self, request, *args, **kwargs):
+        view = condition(etag_func=self.get_etag, last_modified_func=self.get_last_modified)(super().get)
+        response = view(request, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
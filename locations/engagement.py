@@ -0,0 +1,236 @@
+"""
+Write-behind buffer for review and reply engagement counters.
+
+Likes, dislikes and hearts are accumulated as deltas with atomic cache
+increments instead of a read-modify-write of the row on every click.
+Additions and removals go to separate counters that only ever grow, since
+memcached stops decrementing at 0. Objects with pending deltas are
+appended to a dirty log, and
+flush_engagement() applies them in batched F() expression UPDATEs, at most
+once per FLUSH_INTERVAL from the request path and on demand from the
+flush_engagement management command. Readers add the pending deltas to the
+stored counts so clients still see fresh numbers. Review deltas are also
+carried over to the owners' UserStats in the same transaction, and every
+flush bumps the version of the reviews it touched (see fragments.py).
+
+The buffer lives in the `engagement` cache alias, which has to be shared by
+every process and must not evict (see checks.py). While that alias is a
+per-process LocMemCache, clicks are written straight to the database with
+the same F() expression UPDATEs instead.
+"""
+import hashlib
+from collections import defaultdict
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils.connection import ConnectionProxy
+
+from .aggregates import add_review_engagement_to_user_stats, bump_place_versions_of_reviews
+from .models import Review, ReviewReply
+
+
+ENGAGEMENT_CACHE_ALIAS = 'engagement'
+ENGAGEMENT_FIELDS = {'like': 'likes', 'dislike': 'dislikes', 'heart': 'hearts'}
+ENGAGEMENT_MODELS = {'review': Review, 'reply': ReviewReply}
+# Like django.core.cache.cache, for the engagement alias
+buffer = ConnectionProxy(caches, ENGAGEMENT_CACHE_ALIAS)
+FLUSH_INTERVAL = 30
+# Dirty log entries read per cache round trip while flushing
+FLUSH_BATCH_SIZE = 500
+
+DIRTY_SEQ_KEY = 'engagement:dirty:seq'
+FLUSHED_SEQ_KEY = 'engagement:dirty:flushed'
+FLUSH_LOCK_KEY = 'engagement:flush-lock'
+DIRTY_RETRY_KEY = 'engagement:dirty:retry'
+FLUSHING_KEY = 'engagement:flushing'
+FLUSHING_TIMEOUT = 60 * 5
+# An object is logged again after this long even if its log entry got lost
+MARK_TIMEOUT = 60 * 10
+
+
+def is_buffered():
+    """Whether clicks are buffered; a per-process LocMemCache would strand them in one worker"""
+    return not isinstance(caches[ENGAGEMENT_CACHE_ALIAS], LocMemCache)
+
+
+def _delta_keys(kind, pk, field):
+    """Keys of the (added, removed) counters of one field"""
+    key = f'engagement:{kind}:{pk}:{field}'
+    return f'{key}:added', f'{key}:removed'
+
+
+def _marked_key(kind, pk):
+    return f'engagement:marked:{kind}:{pk}'
+
+
+def _dirty_key(seq):
+    return f'engagement:dirty:{seq}'
+
+
+def _incr(key, amount):
+    """Atomically add a non-negative `amount` to a counter, creating it at 0"""
+    buffer.add(key, 0, timeout=None)
+    return buffer.incr(key, amount)
+
+
+def _read_deltas(objects):
+    """{(kind, pk): {field: delta}} and {counter key: value read} of the buffered changes"""
+    keys = {}
+    for kind, pk in objects:
+        for field in ENGAGEMENT_FIELDS.values():
+            added, removed = _delta_keys(kind, pk, field)
+            keys[added] = (kind, pk, field, 1)
+            keys[removed] = (kind, pk, field, -1)
+    counters = {key: value for key, value in buffer.get_many(list(keys)).items() if value}
+    deltas = defaultdict(lambda: defaultdict(int))
+    for key, value in counters.items():
+        kind, pk, field, sign = keys[key]
+        deltas[(kind, pk)][field] += sign * value
+    deltas = {
+        obj: {field: delta for field, delta in changes.items() if delta}
+        for obj, changes in deltas.items()
+    }
+    return {obj: changes for obj, changes in deltas.items() if changes}, counters
+
+
+def record_engagement(kind, pk, action, delta):
+    """Buffer a +1/-1 change of one engagement counter, or write it at once when unbuffered"""
+    if not is_buffered():
+        _write_deltas({(kind, pk): {ENGAGEMENT_FIELDS[action]: delta}})
+        return
+    added, removed = _delta_keys(kind, pk, ENGAGEMENT_FIELDS[action])
+    _incr(added if delta >= 0 else removed, abs(delta))
+    # Log the object once until its next flush
+    if buffer.add(_marked_key(kind, pk), 1, MARK_TIMEOUT):
+        seq = _incr(DIRTY_SEQ_KEY, 1)
+        buffer.set(_dirty_key(seq), (kind, pk), timeout=None)
+
+
+def pending_engagement(kind, pks):
+    """
+    {pk: {field: delta}} of buffered changes not yet written to the database.
+    `pks` may be a lazy queryset, it is only evaluated while buffering.
+    """
+    if not is_buffered():
+        return {}
+    deltas, _ = _read_deltas([(kind, pk) for pk in pks])
+    return {pk: changes for (_, pk), changes in deltas.items()}
+
+
+def engagement_tag(pending):
+    """Short digest of a pending_engagement() result, '' when nothing is buffered"""
+    if not pending:
+        return ''
+    state = sorted((pk, sorted(changes.items())) for pk, changes in pending.items())
+    return hashlib.md5(repr(state).encode()).hexdigest()[:12]
+
+
+def apply_pending_engagement(kind, objects, pending=None):
+    """Add buffered deltas, read now unless given, to the counters of already loaded objects"""
+    objects = list(objects)
+    if pending is None:
+        pending = pending_engagement(kind, [obj.pk for obj in objects])
+    for obj in objects:
+        for field, delta in pending.get(obj.pk, {}).items():
+            setattr(obj, field, max(0, getattr(obj, field) + delta))
+    return objects
+
+
+def current_engagement(kind, pk, stored):
+    """Stored {field: count} merged with the buffered deltas for one object"""
+    pending = pending_engagement(kind, [pk]).get(pk, {})
+    return {field: max(0, stored[field] + pending.get(field, 0)) for field in ENGAGEMENT_FIELDS.values()}
+
+
+def _take_dirty_objects():
+    """
+    Claim the dirty log written since the last flush.
+    A writer may have taken a sequence number without having stored its
+    entry yet; such entries are looked for again by the next flush only,
+    after that the marked key's timeout lets the object be logged again.
+    """
+    last = buffer.get(DIRTY_SEQ_KEY) or 0
+    first = (buffer.get(FLUSHED_SEQ_KEY) or 0) + 1
+    seqs = (buffer.get(DIRTY_RETRY_KEY) or []) + list(range(first, last + 1))
+    objects = set()
+    missing = []
+    for start in range(0, len(seqs), FLUSH_BATCH_SIZE):
+        batch = {_dirty_key(seq): seq for seq in seqs[start:start + FLUSH_BATCH_SIZE]}
+        found = buffer.get_many(list(batch))
+        objects.update(found.values())
+        buffer.delete_many(list(found))
+        missing.extend(seq for key, seq in batch.items() if key not in found and seq >= first)
+    buffer.set_many({FLUSHED_SEQ_KEY: last, DIRTY_RETRY_KEY: missing}, timeout=None)
+    # Unmark before reading deltas so clicks from now on are logged again
+    buffer.delete_many([_marked_key(kind, pk) for kind, pk in objects])
+    return objects
+
+
+def flush_engagement():
+    """
+    Write buffered deltas to the database.
+    Objects with identical deltas share one UPDATE; returns the number of objects written.
+    """
+    if not is_buffered():
+        return 0
+    # Only one flush at a time, a second one would apply the same deltas again
+    if not buffer.add(FLUSHING_KEY, 1, FLUSHING_TIMEOUT):
+        return 0
+    try:
+        return _flush_dirty_objects()
+    finally:
+        buffer.delete(FLUSHING_KEY)
+
+
+def _flush_dirty_objects():
+    objects = _take_dirty_objects()
+    if not objects:
+        return 0
+
+    deltas, counters = _read_deltas(objects)
+    _write_deltas(deltas, counters)
+    return len(deltas)
+
+
+def _write_deltas(deltas, counters=None):
+    """
+    Apply {(kind, pk): {field: delta}} to the database and retire the cached
+    fragments of the reviews touched; `counters` read from the buffer are
+    subtracted from it once the UPDATEs committed.
+    """
+    groups = defaultdict(list)
+    for (kind, pk), changes in deltas.items():
+        groups[(kind, tuple(sorted(changes.items())))].append(pk)
+
+    with transaction.atomic():
+        # Read the stored counts before they are updated below
+        add_review_engagement_to_user_stats({
+            pk: changes for (kind, pk), changes in deltas.items() if kind == 'review'
+        })
+        for (kind, changes), pks in groups.items():
+            ENGAGEMENT_MODELS[kind].objects.filter(pk__in=pks).update(**{
+                field: Greatest(F(field) + delta, Value(0)) for field, delta in changes
+            })
+
+    # Subtract what was written, keeping clicks that arrived meanwhile. The
+    # counters only grew since they were read, so they stay non-negative.
+    for key, value in (counters or {}).items():
+        buffer.decr(key, value)
+
+    # Retire cached review fragments only now, one rendered mid-flush may count a delta twice
+    review_pks = [pk for kind, pk in deltas if kind == 'review']
+    reply_pks = [pk for kind, pk in deltas if kind == 'reply']
+    reviews = Review.objects.filter(
+        Q(pk__in=review_pks) | Q(pk__in=ReviewReply.objects.filter(pk__in=reply_pks).values('review_id'))
+    )
+    reviews.update(version=F('version') + 1)
+    bump_place_versions_of_reviews(reviews)
+
+
+def maybe_flush_engagement():
+    """Flush from the request path at most once per FLUSH_INTERVAL"""
+    if is_buffered() and buffer.add(FLUSH_LOCK_KEY, 1, FLUSH_INTERVAL):
+        flush_engagement()
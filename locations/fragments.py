@@ -0,0 +1,80 @@
+"""
+Rendered-fragment cache for review cards and reply threads.
+
+Fragments are cached under the review id plus Review.version, which is
+bumped on every edit of the review, any change to its replies and every
+engagement flush touching either (see signals.py and engagement.py). A
+new version simply misses, so nothing is ever invalidated explicitly and
+old entries age out. Clicks still buffered between flushes are shown too:
+a card's key also carries its merged counts, and a thread remembers the
+buffered deltas of its replies it was rendered with. A page of cards is read with one get_many and only
+the misses are rendered.
+
+Fragments are shared by all visitors and rendered without a request, so
+they must not depend on the current user; per-user parts such as the
+Edit links are revealed client-side.
+"""
+from django.core.cache import cache
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from .aggregates import bump_place_versions_of_reviews
+from .engagement import apply_pending_engagement, engagement_tag, pending_engagement
+from .models import Review, ReviewReply
+from .threads import build_reply_tree
+
+
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+CARD_TEMPLATE = 'components/review_item.html'
+THREAD_TEMPLATE = 'components/review_thread.html'
+
+
+def _card_key(review):
+    # The counts include the buffered deltas applied by the caller
+    return f'review_fragment:card:{review.pk}:{review.version}:{review.likes}-{review.dislikes}-{review.hearts}'
+
+
+def _thread_key(review):
+    return f'review_fragment:reply_thread:{review.pk}:{review.version}'
+
+
+def render_review_cards(reviews):
+    """Concatenated card markup of `reviews` in order, rendering only the cache misses"""
+    reviews = list(reviews)
+    keys = [_card_key(review) for review in reviews]
+    cached = cache.get_many(keys)
+
+    fresh = {
+        key: render_to_string(CARD_TEMPLATE, {'r': review})
+        for key, review in zip(keys, reviews) if key not in cached
+    }
+    if fresh:
+        cache.set_many(fresh, FRAGMENT_CACHE_TIMEOUT)
+        cached.update(fresh)
+    return mark_safe(''.join(cached[key] for key in keys))
+
+
+def render_review_thread(review):
+    """(markup, reply count) of the active reply thread of `review`"""
+    key = _thread_key(review)
+    thread = cache.get(key)
+    # Rendered with other buffered reply clicks than there are now
+    if thread is not None and thread[3] != engagement_tag(pending_engagement('reply', thread[2])):
+        thread = None
+    if thread is None:
+        # One query in path order, linked into a tree by build_reply_tree()
+        replies = list(ReviewReply.objects.active().filter(review_id=review.pk).order_by('path'))
+        pending = pending_engagement('reply', [reply.pk for reply in replies])
+        apply_pending_engagement('reply', replies, pending)
+        html = render_to_string(THREAD_TEMPLATE, {'replies': build_reply_tree(replies), 'review_id': review.pk})
+        thread = (html, len(replies), [reply.pk for reply in replies], engagement_tag(pending))
+        cache.set(key, thread, FRAGMENT_CACHE_TIMEOUT)
+    return mark_safe(thread[0]), thread[1]
+
+
+def bump_review_versions(review_ids):
+    """Retire the cached fragments of these reviews and the validators of their places"""
+    reviews = Review.objects.filter(pk__in=list(review_ids))
+    reviews.update(version=F('version') + 1)
+    bump_place_versions_of_reviews(reviews)
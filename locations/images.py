@@ -0,0 +1,133 @@
+"""
+Resized derivatives of uploaded images.
+
+Every uploaded post image and profile picture gets WebP and JPEG copies
+at the DERIVATIVE_WIDTHS narrower than the original, stored next to it
+under derivatives/. They are generated after the upload's transaction
+commits on a small thread pool, so requests never wait for Pillow, and
+deleted together with the original (see models.TrackedImageMixin). What
+was generated is recorded on the model row, so rendering never has to
+look at storage. The generate_image_derivatives command backfills
+existing media.
+
+Templates use {% responsive_image %} (templatetags/image_tags.py), which
+emits srcset/sizes for the recorded widths plus the original, and the
+original alone until they are recorded.
+"""
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.dispatch import Signal
+from PIL import Image, ImageOps
+
+
+logger = logging.getLogger(__name__)
+
+# Sent by TrackedImageMixin.record_derivatives() once a row's record is stored
+derivatives_recorded = Signal()
+
+# Card, sidebar and avatar sizes at 1x and 2x up to full-width heroes
+DERIVATIVE_WIDTHS = (160, 320, 640, 960, 1280)
+# Format: (Pillow format, save options)
+DERIVATIVE_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-derivatives')
+
+
+def derivative_name(name, width, extension):
+    directory, filename = os.path.split(name)
+    return f"{directory}/derivatives/{filename}.{width}w.{extension}"
+
+
+def _encode(image, pillow_format, options):
+    if pillow_format == 'JPEG' and image.mode != 'RGB':
+        # Flatten transparency onto white rather than black
+        rgba = image.convert('RGBA')
+        flattened = Image.new('RGB', rgba.size, (255, 255, 255))
+        flattened.paste(rgba, mask=rgba.getchannel('A'))
+        image = flattened
+    buffer = BytesIO()
+    image.save(buffer, pillow_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_derivatives(storage, name):
+    """
+    Write the derivatives of the image `name`. Returns the record to store
+    with the image, {'widths': [generated widths], 'original_width': width}
+    """
+    with storage.open(name, 'rb') as f:
+        original = ImageOps.exif_transpose(Image.open(f))
+        original.load()
+    if original.mode not in ('RGB', 'RGBA'):
+        # Palette, grayscale and CMYK images; RGBA keeps any transparency
+        original = original.convert('RGBA')
+
+    widths = tuple(width for width in DERIVATIVE_WIDTHS if width < original.width)
+    for width in widths:
+        height = max(1, round(original.height * width / original.width))
+        resized = original.resize((width, height), Image.LANCZOS)
+        for extension, (pillow_format, options) in DERIVATIVE_FORMATS.items():
+            target = derivative_name(name, width, extension)
+            # Replace a leftover of an earlier image stored under the same name
+            storage.delete(target)
+            storage.save(target, _encode(resized, pillow_format, options))
+    return {'widths': list(widths), 'original_width': original.width}
+
+
+def shrink_upload(upload, max_size):
+    """
+    `upload` scaled down to fit in max_size x max_size, in its own format.
+    Returned as is when it already fits or is not a readable image.
+    """
+    try:
+        upload.seek(0)
+        image = Image.open(upload)
+        pillow_format = image.format
+        image = ImageOps.exif_transpose(image)
+    except (OSError, Image.DecompressionBombError):
+        upload.seek(0)
+        return upload
+    if max(image.size) <= max_size:
+        upload.seek(0)
+        return upload
+
+    image.thumbnail((max_size, max_size), Image.LANCZOS)
+    options = {pillow: options for pillow, options in DERIVATIVE_FORMATS.values()}.get(pillow_format, {})
+    shrunk = _encode(image, pillow_format, options)
+    shrunk.name = os.path.basename(upload.name)
+    return shrunk
+
+
+def _generate_in_background(storage, name, on_generated):
+    try:
+        on_generated(generate_derivatives(storage, name))
+    except Exception:
+        # Nobody waits on the future, so the failure would go unnoticed
+        logger.exception('Could not generate derivatives of %s', name)
+    finally:
+        # The pool thread outlives the job, don't keep its connection open
+        connection.close()
+
+
+def schedule_derivatives(storage, name, on_generated):
+    """
+    Generate the derivatives of `name` off the request thread once the
+    upload commits, then pass their record to `on_generated`
+    """
+    transaction.on_commit(lambda: _executor.submit(_generate_in_background, storage, name, on_generated))
+
+
+def delete_image(storage, name):
+    """Delete an original and its derivatives"""
+    storage.delete(name)
+    for width in DERIVATIVE_WIDTHS:
+        for extension in DERIVATIVE_FORMATS:
+            storage.delete(derivative_name(name, width, extension))
+
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from locations.engagement import flush_engagement
+
+
+class Command(BaseCommand):
+    help = 'Write buffered review and reply likes, dislikes and hearts to the database'
+
+    def handle(self, *args, **options):
+        flushed = flush_engagement()
+        self.stdout.write(self.style.SUCCESS(f'Engagement flushed for {flushed} reviews and replies'))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from locations.images import generate_derivatives
+from locations.models import AboutPost, Blog, Partner, UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Generate the resized WebP/JPEG derivatives of existing post images and profile pictures'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate derivatives that already exist'
+        )
+
+    def handle(self, *args, **options):
+        generated = skipped = failed = 0
+        for model in (Blog, Partner, AboutPost, UserProfile):
+            field = model.image_field
+            rows = model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True}).values_list(
+                'pk', field, model.derivatives_field
+            )
+            storage = model._meta.get_field(field).storage
+            for pk, name, derivatives in rows.iterator():
+                if not options['force'] and derivatives:
+                    skipped += 1
+                    continue
+                if not storage.exists(name):
+                    self.stderr.write(f'{model.__name__}: {name} is missing')
+                    failed += 1
+                    continue
+                try:
+                    model.record_derivatives(pk, name, generate_derivatives(storage, name))
+                except Exception as e:
+                    self.stderr.write(f'{model.__name__}: {name}: {e}')
+                    failed += 1
+                    continue
+                generated += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Derivatives generated for {generated} images ({skipped} already done, {failed} failed)'
+        ))
@@ -0,0 +1,324 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from locations.aggregates import rebuild_counters, rebuild_place_rating_summaries, rebuild_user_stats
+from locations.catalogue import invalidate_category_catalogue
+from locations.models import (
+    Amenity, Blog, Category, Comment, CommentReply, Location,
+    Partner, Review, ReviewReply,
+)
+
+
+CATEGORIES = ['Restaurants', 'Hotels', 'Cafes', 'Museums', 'Parks', 'Shopping', 'Theatres', 'Libraries', 'Education', 'Transport']
+AMENITIES = ['Step free access', 'Accessible toilets', 'Accessible parking', 'Lifts', 'Hearing loop', 'Changing Places', 'Braille signage', 'Quiet hours']
+FEATURES = [
+    'Accessible parking available', 'Accessible toilets available', 'Personal assistance available',
+    'Step free access', 'Help points available', 'Lifts available', 'Changing Places available',
+]
+SENTENCES = [
+    'The entrance had a gentle ramp and automatic doors.',
+    'Staff were friendly and happy to help without being asked.',
+    'Corridors were wide enough for a power chair.',
+    'The accessible toilet was clean but used as a storeroom.',
+    'Parking bays were close to the entrance and clearly marked.',
+    'Lighting was good and the signage easy to read.',
+    'It got very busy and noisy around lunchtime.',
+    'The lift was out of order on our visit.',
+    'Seating was comfortable with space to transfer.',
+    'Prices were fair for what you get.',
+    'Would definitely come back with the family.',
+    'Booking ahead made everything much smoother.',
+]
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Priya', 'Tom', 'Aisha', 'Chen', 'Maria', 'Oliver', 'Fatima', 'Liam', 'Zoe']
+LAST_NAMES = ['Smith', 'Patel', 'Jones', 'Khan', 'Brown', 'Williams', 'Garcia', 'Taylor', 'Nguyen', 'Evans']
+
+# Rough bounding box of Great Britain
+LATITUDE_RANGE = (50.0, 58.5)
+LONGITUDE_RANGE = (-5.5, 1.7)
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the generated created_at/updated_at instead of stamping now()"""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def next_id(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a large deterministic data set (users, locations, reviews with reply trees '
+        'and engagement, blogs, partners and comments) for load testing'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reviews', type=int, default=100000, help='Reviews to create (default 100000)')
+        parser.add_argument('--places', type=int, default=None, help='Distinct Google places reviewed (default reviews / 20)')
+        parser.add_argument('--replies-per-review', type=float, default=0.6, help='Average replies per review (default 0.6)')
+        parser.add_argument('--users', type=int, default=5000, help='Registered users (default 5000)')
+        parser.add_argument('--locations', type=int, default=5000, help='Locations (default 5000)')
+        parser.add_argument('--blogs', type=int, default=200, help='Published blog posts (default 200)')
+        parser.add_argument('--partners', type=int, default=50, help='Active partners (default 50)')
+        parser.add_argument('--comments-per-post', type=float, default=15, help='Average comments per blog or partner post (default 15)')
+        parser.add_argument('--days', type=int, default=730, help='Spread creation dates over this many days (default 730)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed, the same seed gives the same data (default 42)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create (default 5000)')
+        parser.add_argument('--skip-reconcile', action='store_true', help='Do not rebuild rating summaries, counters and user stats afterwards')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if min(options['reviews'], options['users'], options['locations'], options['blogs'], options['partners']) < 0:
+            raise CommandError('Counts cannot be negative')
+        if options['replies_per_review'] < 0 or options['comments_per_post'] < 0:
+            raise CommandError('Averages cannot be negative')
+
+        self.rng = random.Random(options['seed'])
+        self.created = {}
+        self.batch_size = options['batch_size']
+        self.end = timezone.now()
+        self.start = self.end - timedelta(days=options['days'])
+
+        models = (User, Location, Review, ReviewReply, Blog, Partner, Comment, CommentReply)
+        with explicit_timestamps(*models):
+            user_ids = self.create_users(options['users'])
+            place_count = options['places'] or max(1, options['reviews'] // 20)
+            self.create_locations(options['locations'], place_count, user_ids)
+            self.create_reviews(options['reviews'], place_count, options['replies_per_review'], user_ids)
+            self.create_posts(Blog, options['blogs'], options['comments_per_post'])
+            self.create_posts(Partner, options['partners'], options['comments_per_post'])
+
+        if not options['skip_reconcile']:
+            # bulk_create bypasses the signals that maintain the aggregates
+            self.stdout.write('Rebuilding rating summaries, counters and user stats...')
+            rebuild_place_rating_summaries(batch_size=self.batch_size)
+            rebuild_counters(batch_size=self.batch_size)
+            rebuild_user_stats(batch_size=self.batch_size)
+        invalidate_category_catalogue()
+        self.stdout.write(self.style.SUCCESS('Load data generated'))
+
+    # Helpers
+
+    def timestamp(self, fraction):
+        """A time `fraction` of the way through the generated period, so ids grow with time"""
+        return self.start + (self.end - self.start) * min(fraction, 1.0)
+
+    def person(self):
+        return f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}'
+
+    def text(self, sentences):
+        return ' '.join(self.rng.sample(SENTENCES, sentences))
+
+    def count(self, mean):
+        """Geometric count with the given mean, mostly small with a long tail"""
+        more = mean / (1 + mean)
+        count = 0
+        while self.rng.random() < more:
+            count += 1
+        return count
+
+    def engagement(self):
+        # Most posts get a few reactions, a handful get a lot
+        return {
+            'likes': int(self.rng.paretovariate(1.5)) - 1,
+            'dislikes': int(self.rng.paretovariate(3)) - 1,
+            'hearts': int(self.rng.paretovariate(2)) - 1,
+        }
+
+    def flush(self, model, objects, label):
+        if not objects:
+            return
+        with transaction.atomic():
+            model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.created[label] = self.created.get(label, 0) + len(objects)
+        self.stdout.write(f'  {label}: {self.created[label]}', ending='\r')
+        objects.clear()
+
+    def done(self, label):
+        self.stdout.write(self.style.SUCCESS(f'  {label}: {self.created.get(label, 0)} created'))
+
+    # Generators
+
+    def create_users(self, count):
+        first_id = next_id(User)
+        password = make_password(None)
+        users = []
+        for pk in range(first_id, first_id + count):
+            joined = self.timestamp(self.rng.random() * 0.5)
+            users.append(User(
+                pk=pk, username=f'loaduser{pk}', email=f'loaduser{pk}@example.com',
+                first_name=self.rng.choice(FIRST_NAMES), last_name=self.rng.choice(LAST_NAMES),
+                password=password, date_joined=joined,
+            ))
+            if len(users) >= self.batch_size:
+                self.flush(User, users, 'users')
+        self.flush(User, users, 'users')
+        self.done('users')
+        return list(range(first_id, first_id + count))
+
+    def create_locations(self, count, place_count, user_ids):
+        categories = [Category.objects.get_or_create(name=name)[0] for name in CATEGORIES]
+        amenities = [Amenity.objects.get_or_create(name=name)[0] for name in AMENITIES]
+        first_id = next_id(Location)
+        through = Location.amenities.through
+        locations, links = [], []
+        for index, pk in enumerate(range(first_id, first_id + count)):
+            created = self.timestamp(self.rng.random())
+            locations.append(Location(
+                pk=pk,
+                name=f'{self.rng.choice(LAST_NAMES)} {self.rng.choice(CATEGORIES)[:-1]} {pk}',
+                slug=f'load-location-{pk}',
+                category=self.rng.choice(categories),
+                created_by_id=self.rng.choice(user_ids) if user_ids else None,
+                latitude=Decimal(f'{self.rng.uniform(*LATITUDE_RANGE):.6f}'),
+                longitude=Decimal(f'{self.rng.uniform(*LONGITUDE_RANGE):.6f}'),
+                keywords=', '.join(self.rng.sample(AMENITIES, 2)).lower(),
+                description=self.text(3),
+                address=f'{self.rng.randint(1, 300)} High Street',
+                status='active' if self.rng.random() < 0.9 else 'inactive',
+                rating=Decimal(f'{self.rng.uniform(2, 5):.2f}'),
+                # Link locations to the reviewed places, most popular places first
+                place_id=f'load_place_{index}' if index < place_count else '',
+                created_at=created, updated_at=created,
+            ))
+            links.extend(
+                through(location_id=pk, amenity_id=amenity.pk)
+                for amenity in self.rng.sample(amenities, self.rng.randint(0, 4))
+            )
+            if len(locations) >= self.batch_size:
+                self.flush(Location, locations, 'locations')
+                with transaction.atomic():
+                    through.objects.bulk_create(links, batch_size=self.batch_size)
+                links.clear()
+        self.flush(Location, locations, 'locations')
+        with transaction.atomic():
+            through.objects.bulk_create(links, batch_size=self.batch_size)
+        self.done('locations')
+
+    def create_reviews(self, count, place_count, replies_per_review, user_ids):
+        review_id = next_id(Review)
+        reply_id = next_id(ReviewReply)
+        reviews, replies = [], []
+        step = ReviewReply.path_step
+        for index in range(count):
+            created = self.timestamp((index + self.rng.random()) / max(count, 1))
+            # Skewed towards popular places, a few get thousands of reviews
+            place = int(place_count * self.rng.random() ** 3)
+            user_id = self.rng.choice(user_ids) if user_ids and self.rng.random() < 0.7 else None
+            name = self.person()
+            text = self.text(self.rng.randint(1, 4))
+            if self.rng.random() < 0.4:
+                text += '\n\nAccessible Features:\n' + '\n'.join(
+                    f'✓ {feature}' for feature in self.rng.sample(FEATURES, self.rng.randint(1, 4))
+                )
+            reviews.append(Review(
+                pk=review_id, place_id=f'load_place_{place}', place_name=f'Load Test Place {place}',
+                user_id=user_id, author_name=name,
+                author_email=f'loaduser{user_id}@example.com' if user_id else f'guest{review_id}@example.com',
+                quality_rating=self.rng.randint(1, 5), location_rating=self.rng.randint(1, 5),
+                service_rating=self.rng.randint(1, 5), price_rating=self.rng.randint(1, 5),
+                review_text=text, is_active=self.rng.random() < 0.97,
+                created_at=created, updated_at=created, **self.engagement()
+            ))
+
+            # A reply tree: each reply answers the review or an earlier reply
+            thread = []
+            for _ in range(self.count(replies_per_review)):
+                parent = self.rng.choice(thread) if thread and self.rng.random() < 0.5 else None
+                replied = created + timedelta(minutes=self.rng.randint(1, 60 * 24 * 14))
+                replier_id = self.rng.choice(user_ids) if user_ids and self.rng.random() < 0.7 else None
+                reply = ReviewReply(
+                    pk=reply_id, review_id=review_id, parent_reply_id=parent.pk if parent else None,
+                    path=(parent.path if parent else '') + step(reply_id),
+                    user_id=replier_id, author_name=self.person(),
+                    author_email=f'loaduser{replier_id}@example.com' if replier_id else f'guest{reply_id}@example.com',
+                    reply_text=self.text(1), is_active=self.rng.random() < 0.97,
+                    created_at=replied, updated_at=replied, **self.engagement()
+                )
+                thread.append(reply)
+                replies.append(reply)
+                reply_id += 1
+            review_id += 1
+
+            if len(reviews) >= self.batch_size:
+                self.flush(Review, reviews, 'reviews')
+                self.flush(ReviewReply, replies, 'review replies')
+        self.flush(Review, reviews, 'reviews')
+        self.flush(ReviewReply, replies, 'review replies')
+        self.done('reviews')
+        self.done('review replies')
+
+    def flush_posts(self, post_model, posts, comments, replies, label):
+        # Parents first, SQLite checks foreign keys at commit
+        self.flush(post_model, posts, label)
+        self.flush(Comment, comments, f'{label} comments')
+        self.flush(CommentReply, replies, f'{label} comment replies')
+
+    def create_posts(self, post_model, count, comments_per_post):
+        label = post_model._meta.verbose_name_plural
+        status = 'published' if post_model is Blog else 'active'
+        content_type = ContentType.objects.get_for_model(post_model)
+        post_id, comment_id, reply_id = next_id(post_model), next_id(Comment), next_id(CommentReply)
+        posts, comments, replies = [], [], []
+        step = CommentReply.path_step
+        for index in range(count):
+            created = self.timestamp((index + self.rng.random()) / max(count, 1))
+            posts.append(post_model(
+                pk=post_id, title=f'{self.rng.choice(CATEGORIES)} access guide {post_id}',
+                slug=f'load-{post_model._meta.model_name}-{post_id}', content=self.text(6), status=status,
+                created_at=created, updated_at=created,
+            ))
+            for _ in range(self.count(comments_per_post)):
+                commented = created + timedelta(minutes=self.rng.randint(1, 60 * 24 * 60))
+                comments.append(Comment(
+                    pk=comment_id, content_type=content_type, object_id=post_id,
+                    author_name=self.person(), author_email=f'guest{comment_id}@example.com',
+                    comment_text=self.text(self.rng.randint(1, 3)),
+                    is_approved=self.rng.random() < 0.85, is_active=self.rng.random() < 0.97,
+                    created_at=commented, updated_at=commented,
+                ))
+                thread = []
+                for _ in range(self.count(0.8)):
+                    parent = self.rng.choice(thread) if thread and self.rng.random() < 0.5 else None
+                    replied = commented + timedelta(minutes=self.rng.randint(1, 60 * 24 * 7))
+                    reply = CommentReply(
+                        pk=reply_id, comment_id=comment_id, parent_reply_id=parent.pk if parent else None,
+                        path=(parent.path if parent else '') + step(reply_id),
+                        author_name=self.person(), author_email=f'guest{reply_id}@example.com',
+                        reply_text=self.text(1), is_approved=self.rng.random() < 0.85,
+                        is_active=self.rng.random() < 0.97, created_at=replied, updated_at=replied,
+                    )
+                    thread.append(reply)
+                    replies.append(reply)
+                    reply_id += 1
+                comment_id += 1
+            post_id += 1
+            if len(comments) >= self.batch_size:
+                self.flush_posts(post_model, posts, comments, replies, label)
+        self.flush_posts(post_model, posts, comments, replies, label)
+        self.done(label)
+        self.done(f'{label} comments')
+        self.done(f'{label} comment replies')
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from locations.aggregates import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute comment and reply counters from the comment and reply tables and fix any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk write (default 1000)'
+        )
+
+    def handle(self, *args, **options):
+        corrected = rebuild_counters(batch_size=options['batch_size'])
+        for counter, count in corrected.items():
+            self.stdout.write(f'{counter}: {count} corrected')
+        self.stdout.write(self.style.SUCCESS(f'Counters reconciled: {sum(corrected.values())} rows corrected'))
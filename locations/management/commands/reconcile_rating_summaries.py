@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from locations.aggregates import rebuild_place_rating_summaries
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-place rating summaries from active reviews and fix any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk write (default 1000)'
+        )
+
+    def handle(self, *args, **options):
+        created, updated, deleted = rebuild_place_rating_summaries(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Rating summaries reconciled: {created} created, {updated} corrected, {deleted} removed'
+            )
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from locations.aggregates import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute per-user contribution stats from active reviews and replies and fix any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk write (default 1000)'
+        )
+
+    def handle(self, *args, **options):
+        created, updated, deleted = rebuild_user_stats(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'User stats reconciled: {created} created, {updated} corrected, {deleted} removed'
+            )
+        )
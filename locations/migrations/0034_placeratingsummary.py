@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:25
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def backfill_place_rating_summaries(apps, schema_editor):
+    """One PlaceRatingSummary row per place with active reviews"""
+    Review = apps.get_model('locations', 'Review')
+    PlaceRatingSummary = apps.get_model('locations', 'PlaceRatingSummary')
+
+    totals = Review.objects.filter(is_active=True).values('place_id').annotate(
+        review_count=Count('id'),
+        quality_sum=Sum('quality_rating'),
+        location_sum=Sum('location_rating'),
+        service_sum=Sum('service_rating'),
+        price_sum=Sum('price_rating'),
+        last_review_at=Max('created_at'),
+    ).order_by()
+    summaries = []
+    for row in totals.iterator():
+        rating_sum = row['quality_sum'] + row['location_sum'] + row['service_sum'] + row['price_sum']
+        summaries.append(PlaceRatingSummary(average_rating=rating_sum / (row['review_count'] * 4), **row))
+    PlaceRatingSummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0033_location_place_id_location_slug_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlaceRatingSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('place_id', models.CharField(help_text='Google Place ID', max_length=255, unique=True)),
+                ('review_count', models.IntegerField(default=0)),
+                ('quality_sum', models.IntegerField(default=0)),
+                ('location_sum', models.IntegerField(default=0)),
+                ('service_sum', models.IntegerField(default=0)),
+                ('price_sum', models.IntegerField(default=0)),
+                ('average_rating', models.FloatField(default=0, help_text='Average of all four ratings over active reviews')),
+                ('last_review_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Place Rating Summary',
+                'verbose_name_plural': 'Place Rating Summaries',
+                'indexes': [models.Index(fields=['average_rating'], name='locations_p_average_250953_idx'), models.Index(fields=['last_review_at'], name='locations_p_last_re_31a018_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_place_rating_summaries, migrations.RunPython.noop),
+    ]
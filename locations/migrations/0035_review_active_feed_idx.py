@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0034_placeratingsummary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['is_active', '-created_at', '-id'], name='review_active_feed_idx'),
+        ),
+    ]
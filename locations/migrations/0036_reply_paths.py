@@ -0,0 +1,79 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:35
+
+from django.db import migrations, models
+
+
+REPLY_MODELS = ('ReviewReply', 'PartnerCommentReply', 'BlogCommentReply', 'AboutCommentReply')
+
+
+def backfill_reply_paths(apps, schema_editor):
+    """Build materialized paths for existing replies from their parent links"""
+    for model_name in REPLY_MODELS:
+        Reply = apps.get_model('locations', model_name)
+        parents = dict(Reply.objects.values_list('id', 'parent_reply_id'))
+        paths = {}
+
+        def path_for(reply_id):
+            # Walk up to the first ancestor with a known path
+            chain = []
+            while reply_id is not None and reply_id not in paths:
+                chain.append(reply_id)
+                reply_id = parents.get(reply_id)
+            path = paths.get(reply_id, '')
+            for ancestor_id in reversed(chain):
+                path += f"{ancestor_id:010d}/"
+                paths[ancestor_id] = path
+            return path
+
+        updated = []
+        for reply in Reply.objects.only('id', 'path').iterator():
+            reply.path = path_for(reply.id)
+            updated.append(reply)
+        Reply.objects.bulk_update(updated, ['path'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0035_review_active_feed_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aboutcommentreply',
+            name='path',
+            field=models.CharField(blank=True, default='', editable=False, max_length=550),
+        ),
+        migrations.AddField(
+            model_name='blogcommentreply',
+            name='path',
+            field=models.CharField(blank=True, default='', editable=False, max_length=550),
+        ),
+        migrations.AddField(
+            model_name='partnercommentreply',
+            name='path',
+            field=models.CharField(blank=True, default='', editable=False, max_length=550),
+        ),
+        migrations.AddField(
+            model_name='reviewreply',
+            name='path',
+            field=models.CharField(blank=True, default='', editable=False, max_length=550),
+        ),
+        migrations.AddIndex(
+            model_name='aboutcommentreply',
+            index=models.Index(fields=['comment', 'path'], name='locations_a_comment_f5150b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogcommentreply',
+            index=models.Index(fields=['comment', 'path'], name='locations_b_comment_649add_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partnercommentreply',
+            index=models.Index(fields=['comment', 'path'], name='locations_p_comment_752993_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewreply',
+            index=models.Index(fields=['review', 'path'], name='locations_r_review__396823_idx'),
+        ),
+        migrations.RunPython(backfill_reply_paths, migrations.RunPython.noop),
+    ]
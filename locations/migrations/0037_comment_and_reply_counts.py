@@ -0,0 +1,74 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:38
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# (child model, parent field, parent model, counter field, required flags)
+COUNTERS = (
+    ('ReviewReply', 'review', 'Review', 'reply_count', ('is_active',)),
+    ('BlogCommentReply', 'comment', 'BlogComment', 'reply_count', ('is_active', 'is_approved')),
+    ('PartnerCommentReply', 'comment', 'PartnerComment', 'reply_count', ('is_active', 'is_approved')),
+    ('AboutCommentReply', 'comment', 'AboutComment', 'reply_count', ('is_active', 'is_approved')),
+    ('BlogComment', 'blog', 'Blog', 'comment_count', ('is_active', 'is_approved')),
+    ('PartnerComment', 'partner', 'Partner', 'comment_count', ('is_active', 'is_approved')),
+    ('AboutComment', 'about_post', 'AboutPost', 'comment_count', ('is_active', 'is_approved')),
+)
+
+
+def backfill_counters(apps, schema_editor):
+    """Set every new counter with one correlated UPDATE per counter"""
+    for child_name, parent_field, parent_name, counter_field, flags in COUNTERS:
+        Child = apps.get_model('locations', child_name)
+        Parent = apps.get_model('locations', parent_name)
+        counts = Child.objects.filter(
+            **{parent_field: OuterRef('pk')}, **{flag: True for flag in flags}
+        ).order_by().values(parent_field).annotate(count=Count('pk')).values('count')
+        Parent.objects.update(**{counter_field: Coalesce(Subquery(counts), 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0036_reply_paths'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aboutcomment',
+            name='reply_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Approved active replies at any depth'),
+        ),
+        migrations.AddField(
+            model_name='aboutpost',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Approved active comments'),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Approved active comments'),
+        ),
+        migrations.AddField(
+            model_name='blogcomment',
+            name='reply_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Approved active replies at any depth'),
+        ),
+        migrations.AddField(
+            model_name='partner',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Approved active comments'),
+        ),
+        migrations.AddField(
+            model_name='partnercomment',
+            name='reply_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Approved active replies at any depth'),
+        ),
+        migrations.AddField(
+            model_name='review',
+            name='reply_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Active replies at any depth'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:41
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Lower
+import django.db.models.deletion
+
+
+def link_owners_by_email(apps, schema_editor):
+    """
+    Point unowned reviews and replies at the account with the same email.
+    Emails shared by several accounts are ambiguous and left unlinked.
+    """
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    unique_emails = User.objects.exclude(email='').annotate(
+        normalized=Lower('email')
+    ).values('normalized').annotate(accounts=Count('pk')).filter(accounts=1).values('normalized')
+
+    for model_name in ('Review', 'ReviewReply'):
+        model = apps.get_model('locations', model_name)
+        owner = User.objects.annotate(normalized=Lower('email')).filter(
+            normalized=Lower(OuterRef('author_email')),
+            normalized__in=unique_emails,
+        ).values('pk')[:1]
+        model.objects.filter(user__isnull=True).exclude(author_email='').update(user=Subquery(owner))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('locations', '0037_comment_and_reply_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewreply',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='review_replies', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', 'is_active', '-created_at'], name='review_user_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewreply',
+            index=models.Index(fields=['user', 'is_active', '-created_at'], name='reviewreply_user_feed_idx'),
+        ),
+        migrations.RunPython(link_owners_by_email, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:43
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+import django.db.models.deletion
+
+
+def backfill_user_stats(apps, schema_editor):
+    """One UserStats row per user with active reviews or replies"""
+    Review = apps.get_model('locations', 'Review')
+    ReviewReply = apps.get_model('locations', 'ReviewReply')
+    UserStats = apps.get_model('locations', 'UserStats')
+
+    rows = {}
+    review_totals = Review.objects.filter(is_active=True, user__isnull=False).values('user_id').annotate(
+        review_count=Count('id'),
+        rating_sum=Sum(F('quality_rating') + F('location_rating') + F('service_rating') + F('price_rating')),
+        likes=Sum('likes'),
+        dislikes=Sum('dislikes'),
+        hearts=Sum('hearts'),
+    ).order_by()
+    for row in review_totals.iterator():
+        rows[row.pop('user_id')] = row
+    reply_totals = ReviewReply.objects.filter(is_active=True, user__isnull=False).values('user_id').annotate(
+        reply_count=Count('id'),
+    ).order_by()
+    for row in reply_totals.iterator():
+        rows.setdefault(row['user_id'], {})['reply_count'] = row['reply_count']
+
+    UserStats.objects.bulk_create(
+        [UserStats(user_id=user_id, **row) for user_id, row in rows.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('locations', '0038_review_and_reply_owners'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.IntegerField(default=0)),
+                ('reply_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0, help_text='Sum of all four ratings over active reviews')),
+                ('likes', models.IntegerField(default=0)),
+                ('dislikes', models.IntegerField(default=0)),
+                ('hearts', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Stats',
+                'verbose_name_plural': 'User Stats',
+            },
+        ),
+        migrations.RunPython(backfill_user_stats, migrations.RunPython.noop),
+    ]
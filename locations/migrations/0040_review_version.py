@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0039_user_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='version',
+            field=models.IntegerField(default=0, editable=False, help_text='Bumped whenever the rendered review or its replies change'),
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0040_review_version'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='aboutcomment',
+            name='locations_a_is_acti_a9c0e0_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='aboutcommentreply',
+            name='locations_a_is_acti_5b135d_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='aboutcommentreply',
+            name='locations_a_comment_f5150b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='blogcomment',
+            name='locations_b_is_acti_036b58_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='blogcommentreply',
+            name='locations_b_is_acti_61ed41_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='blogcommentreply',
+            name='locations_b_comment_649add_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='partnercomment',
+            name='locations_p_is_acti_419980_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='partnercommentreply',
+            name='locations_p_is_acti_e9391e_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='partnercommentreply',
+            name='locations_p_comment_752993_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='locations_r_is_acti_2b28fb_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_active_feed_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_user_feed_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reviewreply',
+            name='locations_r_is_acti_08d097_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reviewreply',
+            name='locations_r_review__396823_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reviewreply',
+            name='reviewreply_user_feed_idx',
+        ),
+        migrations.AddIndex(
+            model_name='aboutcomment',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_approved', True)), fields=['about_post', '-created_at'], name='aboutcomment_visible_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aboutcommentreply',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_approved', True)), fields=['comment', 'path'], name='aboutcommentreply_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogcomment',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_approved', True)), fields=['blog', '-created_at'], name='blogcomment_visible_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogcommentreply',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_approved', True)), fields=['comment', 'path'], name='blogcommentreply_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partnercomment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['partner', '-created_at'], name='partnercomment_visible_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partnercommentreply',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['comment', 'path'], name='partnercommentreply_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='review_active_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['place_id', '-created_at', '-id'], name='review_place_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-created_at'], name='review_user_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewreply',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['review', 'path'], name='reviewreply_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviewreply',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-created_at'], name='reviewreply_user_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,154 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:56
+
+from django.core.management.color import no_style
+from django.db import migrations, models
+import django.db.models.deletion
+import locations.models
+
+
+# (comment model, reply model, commented model, foreign key to it)
+LEGACY_COMMENTS = (
+    ('BlogComment', 'BlogCommentReply', 'Blog', 'blog'),
+    ('PartnerComment', 'PartnerCommentReply', 'Partner', 'partner'),
+    ('AboutComment', 'AboutCommentReply', 'AboutPost', 'about_post'),
+)
+BATCH_SIZE = 1000
+
+
+def path_step(pk):
+    # ThreadedReply.path_step, historical models have no custom methods
+    return f"{pk:010d}/"
+
+
+def copy_legacy_comments(apps, schema_editor):
+    """
+    Move the per-type comments and replies into Comment/CommentReply.
+    Ids are assigned here so reply paths, which embed them, can be rebuilt
+    before insert; replies are copied in path order so parents come first.
+    Timestamps and counters are copied as they are.
+    """
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Comment = apps.get_model('locations', 'Comment')
+    CommentReply = apps.get_model('locations', 'CommentReply')
+    for model in (Comment, CommentReply):
+        for field in model._meta.concrete_fields:
+            field.auto_now = field.auto_now_add = False
+
+    comment_id = reply_id = 1
+    for comment_name, reply_name, target_name, target_field in LEGACY_COMMENTS:
+        OldComment = apps.get_model('locations', comment_name)
+        OldReply = apps.get_model('locations', reply_name)
+        content_type, _ = ContentType.objects.get_or_create(app_label='locations', model=target_name.lower())
+
+        comment_ids, batch = {}, []
+        for old in OldComment.objects.order_by('pk').iterator():
+            comment_ids[old.pk] = comment_id
+            batch.append(Comment(
+                pk=comment_id, content_type=content_type, object_id=getattr(old, f'{target_field}_id'),
+                author_name=old.author_name, author_email=old.author_email, comment_text=old.comment_text,
+                save_info=old.save_info, is_approved=old.is_approved, is_active=old.is_active,
+                reply_count=old.reply_count, created_at=old.created_at, updated_at=old.updated_at,
+            ))
+            comment_id += 1
+            if len(batch) >= BATCH_SIZE:
+                Comment.objects.bulk_create(batch)
+                batch = []
+        Comment.objects.bulk_create(batch)
+
+        # old reply id -> (new id, new path)
+        replies, batch = {}, []
+        for old in OldReply.objects.order_by('path', 'pk').iterator():
+            parent = replies.get(old.parent_reply_id)
+            path = (parent[1] if parent else '') + path_step(reply_id)
+            replies[old.pk] = (reply_id, path)
+            batch.append(CommentReply(
+                pk=reply_id, comment_id=comment_ids[old.comment_id], parent_reply_id=parent[0] if parent else None,
+                path=path, author_name=old.author_name, author_email=old.author_email, reply_text=old.reply_text,
+                is_approved=old.is_approved, is_active=old.is_active,
+                created_at=old.created_at, updated_at=old.updated_at,
+            ))
+            reply_id += 1
+            if len(batch) >= BATCH_SIZE:
+                CommentReply.objects.bulk_create(batch)
+                batch = []
+        CommentReply.objects.bulk_create(batch)
+
+    # Explicit ids leave sequences behind on backends that have them
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), [Comment, CommentReply]):
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('locations', '0041_partial_active_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Comment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('author_name', models.CharField(max_length=100)),
+                ('author_email', models.EmailField(max_length=254)),
+                ('comment_text', models.TextField()),
+                ('save_info', models.BooleanField(default=False, help_text='Save name, email for next time')),
+                ('is_approved', models.BooleanField(default=False, help_text='Comment is approved and visible')),
+                ('is_active', models.BooleanField(default=True)),
+                ('reply_count', models.IntegerField(default=0, editable=False, help_text='Approved active replies at any depth')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+            bases=(locations.models.LoadedValuesMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='CommentReply',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(blank=True, default='', editable=False, max_length=550)),
+                ('author_name', models.CharField(max_length=100)),
+                ('author_email', models.EmailField(max_length=254)),
+                ('reply_text', models.TextField()),
+                ('is_approved', models.BooleanField(default=False, help_text='Reply is approved and visible')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('comment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='locations.comment')),
+                ('parent_reply', models.ForeignKey(blank=True, help_text='Parent reply if this is a nested reply', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='child_replies', to='locations.commentreply')),
+            ],
+            options={
+                'verbose_name_plural': 'Comment Replies',
+                'ordering': ['created_at'],
+            },
+            bases=(locations.models.LoadedValuesMixin, models.Model),
+        ),
+        migrations.AddIndex(
+            model_name='commentreply',
+            index=models.Index(fields=['created_at'], name='locations_c_created_d89fb0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='commentreply',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_approved', True)), fields=['comment', 'path'], name='commentreply_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['content_type', 'object_id'], name='locations_c_content_ab50cc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['created_at'], name='locations_c_created_c92018_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_approved', True)), fields=['content_type', 'object_id', '-created_at'], name='comment_visible_idx'),
+        ),
+        migrations.RunPython(copy_legacy_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:56
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0042_generic_comments'),
+    ]
+
+    # Replies first, they reference the comments
+    operations = [
+        migrations.DeleteModel(
+            name='BlogCommentReply',
+        ),
+        migrations.DeleteModel(
+            name='BlogComment',
+        ),
+        migrations.DeleteModel(
+            name='PartnerCommentReply',
+        ),
+        migrations.DeleteModel(
+            name='PartnerComment',
+        ),
+        migrations.DeleteModel(
+            name='AboutCommentReply',
+        ),
+        migrations.DeleteModel(
+            name='AboutComment',
+        ),
+    ]
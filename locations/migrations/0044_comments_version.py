@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-19 00:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0043_remove_legacy_comments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aboutpost',
+            name='comments_version',
+            field=models.IntegerField(default=0, editable=False, help_text='Bumped whenever a comment or reply on this post changes'),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='comments_version',
+            field=models.IntegerField(default=0, editable=False, help_text='Bumped whenever a comment or reply on this post changes'),
+        ),
+        migrations.AddField(
+            model_name='partner',
+            name='comments_version',
+            field=models.IntegerField(default=0, editable=False, help_text='Bumped whenever a comment or reply on this post changes'),
+        ),
+    ]
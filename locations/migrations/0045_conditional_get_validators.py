@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0044_comments_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aboutpost',
+            name='comments_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When a comment or reply on this post last changed', null=True),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='comments_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When a comment or reply on this post last changed', null=True),
+        ),
+        migrations.AddField(
+            model_name='partner',
+            name='comments_updated_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='When a comment or reply on this post last changed', null=True),
+        ),
+        migrations.AddField(
+            model_name='placeratingsummary',
+            name='version',
+            field=models.IntegerField(default=0, editable=False, help_text='Bumped whenever a review of the place or its replies change'),
+        ),
+    ]
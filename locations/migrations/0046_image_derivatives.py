@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0045_conditional_get_validators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aboutpost',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Widths of the generated derivatives and of the original, see images.py'),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Widths of the generated derivatives and of the original, see images.py'),
+        ),
+        migrations.AddField(
+            model_name='partner',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Widths of the generated derivatives and of the original, see images.py'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Widths of the generated derivatives and of the original, see images.py'),
+        ),
+    ]
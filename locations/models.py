@@ -1,10 +1,17 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Left
 from django.utils.text import slugify
 from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth.models import User
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 import os
+from functools import partial
+
+from .images import delete_image, derivatives_recorded, schedule_derivatives, shrink_upload
+
 
 def partner_image_upload_path(instance, filename):
     """Generate upload path for partner images - uses slug to prevent duplicates"""
@@ -46,10 +53,225 @@ def profile_picture_upload_path(instance, filename):
     return f"profile_pictures/{filename}"
 
 
-class UserProfile(models.Model):
+class LoadedValuesMixin:
+    """
+    Remember the database values of `tracked_fields` when an instance is
+    loaded or saved, so signal handlers can compute what changed without
+    re-fetching the row
+    """
+    tracked_fields = ()
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.tracked_fields
+        }
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # Receivers maintaining aggregates commit together with the row
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_values = {name: getattr(self, name) for name in self.tracked_fields}
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+    
+    def get_loaded_values(self):
+        """Values as last read from or written to the database, None for unsaved instances"""
+        return getattr(self, '_loaded_values', None)
+
+
+# Room kept at the end of a slug for a "-<n>" collision suffix
+SLUG_SUFFIX_LENGTH = 8
+# Slug bases matched per query when allocating for a batch
+SLUG_BASES_PER_QUERY = 100
+
+
+def _slug_base(instance):
+    field = instance._meta.get_field('slug')
+    base = slugify(getattr(instance, instance.slug_source))[:field.max_length - SLUG_SUFFIX_LENGTH].strip('-')
+    return base or instance._meta.model_name
+
+
+def assign_slugs(instances):
+    """
+    Give each of `instances` (one model, slug blank) a unique slug derived
+    from its `slug_source`: the base, else the base with the lowest free
+    "-<n>" suffix. Existing slugs are read with one LIKE 'base%' query per
+    SLUG_BASES_PER_QUERY bases instead of probing candidates one by one,
+    and slugs handed out earlier in the batch count as taken.
+    """
+    instances = list(instances)
+    if not instances:
+        return
+    model = type(instances[0])
+    bases = [(instance, _slug_base(instance)) for instance in instances]
+    exclude_pks = [instance.pk for instance in instances if instance.pk is not None]
+
+    taken = set()
+    distinct_bases = sorted({base for _, base in bases})
+    for start in range(0, len(distinct_bases), SLUG_BASES_PER_QUERY):
+        condition = models.Q()
+        for base in distinct_bases[start:start + SLUG_BASES_PER_QUERY]:
+            condition |= models.Q(slug__startswith=base)
+        taken.update(
+            model._default_manager.filter(condition).exclude(pk__in=exclude_pks).order_by().values_list('slug', flat=True)
+        )
+
+    for instance, base in bases:
+        slug, counter = base, 1
+        while slug in taken:
+            slug = f"{base}-{counter}"
+            counter += 1
+        instance.slug = slug
+        taken.add(slug)
+
+
+def _file_name(value):
+    """Stored name of a FieldFile or of the raw column value"""
+    return getattr(value, 'name', value) or ''
+
+
+class TrackedImageMixin(LoadedValuesMixin):
+    """
+    Models with an uploaded image in `image_field`. The image name is
+    tracked from load, so saving never re-reads the row to find the file
+    being replaced. New images get resized derivatives in the background,
+    recorded in `derivatives_field` once generated, and replaced, cleared
+    or deleted ones are removed from storage along with theirs (see images.py).
+    """
+    image_field = 'image'
+    derivatives_field = 'image_derivatives'
+    tracked_fields = ('image',)
+    # Uploads larger than this many pixels on a side are scaled down before storing
+    max_image_size = None
+    
+    def _image_storage(self):
+        return self._meta.get_field(self.image_field).storage
+    
+    def save(self, *args, **kwargs):
+        image = getattr(self, self.image_field)
+        # A new upload may reuse the old name once the old file was deleted
+        uploaded = bool(image) and not image._committed
+        if uploaded and self.max_image_size:
+            setattr(self, self.image_field, shrink_upload(image.file, self.max_image_size))
+        # Missing when the image was deferred, then it is left alone
+        loaded = self.get_loaded_values() or {}
+        old_image = _file_name(loaded.get(self.image_field))
+        if uploaded or (self.image_field in loaded and _file_name(getattr(self, self.image_field)) != old_image):
+            # Recorded again once the new image's derivatives exist
+            setattr(self, self.derivatives_field, {})
+        super().save(*args, **kwargs)
+        new_image = _file_name(getattr(self, self.image_field))
+        if old_image and old_image != new_image:
+            delete_image(self._image_storage(), old_image)
+        if new_image and (uploaded or new_image != old_image):
+            schedule_derivatives(
+                self._image_storage(), new_image, partial(type(self).record_derivatives, self.pk, new_image)
+            )
+    
+    @classmethod
+    def record_derivatives(cls, pk, name, derivatives):
+        """Store generate_derivatives()'s record of `name`, unless the row has another image by now"""
+        if cls._default_manager.filter(pk=pk, **{cls.image_field: name}).update(**{cls.derivatives_field: derivatives}):
+            derivatives_recorded.send(sender=cls, pk=pk)
+    
+    def delete(self, *args, **kwargs):
+        image = _file_name(getattr(self, self.image_field))
+        result = super().delete(*args, **kwargs)
+        if image:
+            delete_image(self._image_storage(), image)
+        return result
+
+
+class SlugImageMixin(TrackedImageMixin):
+    """Posts with a title-derived unique slug and a tracked image"""
+    slug_source = 'title'
+    
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            assign_slugs([self])
+        super().save(*args, **kwargs)
+
+
+class SlugQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """Allocates the missing slugs of the whole batch first, see assign_slugs()"""
+        objs = list(objs)
+        assign_slugs([obj for obj in objs if not obj.slug])
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+# Rows the public pages show. Hot queries filter on exactly these, so the
+# partial indexes below share the condition and stay small as soft-deleted
+# and unmoderated rows pile up
+ACTIVE = models.Q(is_active=True)
+ACTIVE_APPROVED = models.Q(is_active=True, is_approved=True)
+
+
+class ActiveQuerySet(models.QuerySet):
+    def active(self):
+        """Visible rows only, matching the condition of the model's partial indexes"""
+        return self.filter(self.model.active_condition)
+
+
+# Enough of a post body for the summaries cards cut from it
+EXCERPT_LENGTH = 1000
+
+
+class CardQuerySet(models.QuerySet):
+    def cards(self):
+        """
+        Only the model's `card_fields`, for list pages and sidebars. The body
+        named by `excerpt_source` is replaced by its first EXCERPT_LENGTH
+        characters as `excerpt`.
+        """
+        queryset = self.only(*self.model.card_fields)
+        if self.model.excerpt_source:
+            queryset = queryset.annotate(excerpt=Left(self.model.excerpt_source, EXCERPT_LENGTH))
+        return queryset
+
+
+class PostQuerySet(SlugQuerySet, CardQuerySet):
+    """Blog, partner and about posts: card lists and slugged bulk creation"""
+
+
+class CounterFieldsMixin:
+    """
+    Models carrying `counter_fields` that are only ever written by UPDATE
+    queries, so saving an existing row leaves them out: an instance loaded
+    before the last UPDATE would otherwise write back its stale values.
+    """
+    counter_fields = ()
+    
+    def save(self, *args, **kwargs):
+        if not args and not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+class CommentCountersMixin(CounterFieldsMixin):
+    """Posts carrying comment counters, written by the comment receivers"""
+    counter_fields = ('comment_count', 'comments_version', 'comments_updated_at')
+
+
+class UserProfile(TrackedImageMixin, models.Model):
     """Extended user profile with additional fields"""
+    image_field = 'profile_picture'
+    tracked_fields = ('profile_picture',)
+    # Shown at 150px at most, this leaves room for 2x screens
+    max_image_size = 320
+    
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     profile_picture = models.ImageField(upload_to=profile_picture_upload_path, null=True, blank=True)
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False, help_text="Widths of the generated derivatives and of the original, see images.py")
     bio = models.TextField(max_length=500, blank=True)
     location = models.CharField(max_length=100, blank=True)
     website = models.URLField(max_length=200, blank=True)
@@ -172,8 +394,14 @@ class Location(models.Model):
         return []
 
 
-class Review(models.Model):
+class Review(CounterFieldsMixin, LoadedValuesMixin, models.Model):
     """Review model for storing user reviews of places"""
+    RATING_FIELDS = ('quality_rating', 'location_rating', 'service_rating', 'price_rating')
+    ENGAGEMENT_FIELDS = ('likes', 'dislikes', 'hearts')
+    tracked_fields = ('place_id', 'user_id', 'is_active') + RATING_FIELDS + ENGAGEMENT_FIELDS
+    # Written by the engagement flush and the reply receivers (see engagement.py and aggregates.py)
+    counter_fields = ENGAGEMENT_FIELDS + ('reply_count',)
+    
     place_id = models.CharField(max_length=255, help_text="Google Place ID")
     place_name = models.CharField(max_length=200, blank=True, help_text="Place name for reference")
     
@@ -195,6 +423,8 @@ class Review(models.Model):
     likes = models.IntegerField(default=0)
     dislikes = models.IntegerField(default=0)
     hearts = models.IntegerField(default=0)
+    reply_count = models.IntegerField(default=0, editable=False, help_text="Active replies at any depth")
+    version = models.IntegerField(default=0, editable=False, help_text="Bumped whenever the rendered review or its replies change")
     
     # Metadata
     save_info = models.BooleanField(default=False, help_text="User wants to save info for next time")
@@ -202,12 +432,20 @@ class Review(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
+    active_condition = ACTIVE
+    objects = ActiveQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['place_id']),
             models.Index(fields=['created_at']),
-            models.Index(fields=['is_active']),
+            # Keyset pagination of active reviews, newest first
+            models.Index(fields=['-created_at', '-id'], name='review_active_feed_idx', condition=ACTIVE),
+            # A place's reviews, newest first
+            models.Index(fields=['place_id', '-created_at', '-id'], name='review_place_feed_idx', condition=ACTIVE),
+            # Profile pages, a user's reviews newest first
+            models.Index(fields=['user', '-created_at'], name='review_user_feed_idx', condition=ACTIVE),
         ]
     
     def __str__(self):
@@ -216,87 +454,185 @@ class Review(models.Model):
     def get_average_rating(self):
         """Calculate average of all ratings"""
         return round((self.quality_rating + self.location_rating + self.service_rating + self.price_rating) / 4, 1)
+    
+    def save(self, *args, **kwargs):
+        bump = not self._state.adding
+        if bump:
+            # Incremented in the database, so saving a stale instance never rolls it back
+            self.version = models.F('version') + 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'version'}
+        super().save(*args, **kwargs)
+        if bump:
+            self.refresh_from_db(fields=['version'])
 
 
-class ReviewReply(models.Model):
-    """Model for storing replies to reviews and nested replies"""
-    review = models.ForeignKey(Review, on_delete=models.CASCADE, related_name='replies')
-    parent_reply = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='child_replies', help_text="Parent reply if this is a nested reply")
-    author_name = models.CharField(max_length=100)
-    author_email = models.EmailField(blank=True)
-    reply_text = models.TextField()
+class PlaceRatingSummary(models.Model):
+    """Running rating totals of active reviews per Google place, kept in step with Review changes"""
+    place_id = models.CharField(max_length=255, unique=True, help_text="Google Place ID")
+    review_count = models.IntegerField(default=0)
     
-    # Engagement counts
-    likes = models.IntegerField(default=0)
-    dislikes = models.IntegerField(default=0)
-    hearts = models.IntegerField(default=0)
+    # Sums of each rating dimension over active reviews
+    quality_sum = models.IntegerField(default=0)
+    location_sum = models.IntegerField(default=0)
+    service_sum = models.IntegerField(default=0)
+    price_sum = models.IntegerField(default=0)
+    average_rating = models.FloatField(default=0, help_text="Average of all four ratings over active reviews")
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    version = models.IntegerField(default=0, editable=False, help_text="Bumped whenever a review of the place or its replies change")
+    
+    last_review_at = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
-    is_active = models.BooleanField(default=True)
     
     class Meta:
-        ordering = ['created_at']
-        verbose_name_plural = 'Review Replies'
+        verbose_name = 'Place Rating Summary'
+        verbose_name_plural = 'Place Rating Summaries'
         indexes = [
-            models.Index(fields=['review']),
-            models.Index(fields=['created_at']),
-            models.Index(fields=['is_active']),
+            models.Index(fields=['average_rating']),
+            models.Index(fields=['last_review_at']),
         ]
     
     def __str__(self):
-        return f"Reply by {self.author_name} to review {self.review.id}"
+        return f"{self.place_id}: {self.average_rating:.1f} ({self.review_count} reviews)"
+    
+    def _dimension_average(self, total):
+        return round(total / self.review_count, 1) if self.review_count else 0
+    
+    @property
+    def quality_average(self):
+        return self._dimension_average(self.quality_sum)
+    
+    @property
+    def location_average(self):
+        return self._dimension_average(self.location_sum)
+    
+    @property
+    def service_average(self):
+        return self._dimension_average(self.service_sum)
+    
+    @property
+    def price_average(self):
+        return self._dimension_average(self.price_sum)
 
 
-class PartnerComment(models.Model):
-    """Model for storing comments on partner posts"""
-    partner = models.ForeignKey('Partner', on_delete=models.CASCADE, related_name='comments')
-    author_name = models.CharField(max_length=100)
-    author_email = models.EmailField()
-    comment_text = models.TextField()
-    save_info = models.BooleanField(default=False, help_text='Save name, email for next time')
-    is_approved = models.BooleanField(default=False, help_text='Comment is approved and visible')
-    is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+class UserStats(models.Model):
+    """All-time contribution totals per user over active reviews and replies, kept in step with their changes"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='stats')
+    review_count = models.IntegerField(default=0)
+    reply_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0, help_text="Sum of all four ratings over active reviews")
+    
+    # Engagement received on active reviews
+    likes = models.IntegerField(default=0)
+    dislikes = models.IntegerField(default=0)
+    hearts = models.IntegerField(default=0)
+    
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        ordering = ['-created_at']
-        indexes = [
-            models.Index(fields=['partner', 'is_approved']),
-            models.Index(fields=['created_at']),
-            models.Index(fields=['is_active']),
-        ]
+        verbose_name = 'User Stats'
+        verbose_name_plural = 'User Stats'
     
     def __str__(self):
-        return f"Comment by {self.author_name} on {self.partner.title}"
+        return f"{self.user}: {self.review_count} reviews, {self.reply_count} replies"
+    
+    @property
+    def average_rating(self):
+        return round(self.rating_sum / (self.review_count * 4), 1) if self.review_count else 0
 
 
-class PartnerCommentReply(models.Model):
-    """Model for storing replies to partner comments"""
-    comment = models.ForeignKey(PartnerComment, on_delete=models.CASCADE, related_name='replies')
-    parent_reply = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='child_replies', help_text='Parent reply if this is a nested reply')
+class ThreadedReply(models.Model):
+    """
+    Reply with a materialized path: the zero-padded ids of its ancestors and
+    itself. Ordering a thread by path gives depth-first order, so a whole
+    thread of any depth is one ordered range query (see threads.py)
+    """
+    PATH_STEP_WIDTH = 10
+    PATH_SEPARATOR = '/'
+    MAX_DEPTH = 50
+    
+    path = models.CharField(max_length=(PATH_STEP_WIDTH + 1) * MAX_DEPTH, blank=True, default='', editable=False)
+    
+    class Meta:
+        abstract = True
+    
+    @classmethod
+    def path_step(cls, pk):
+        return f"{pk:0{cls.PATH_STEP_WIDTH}d}{cls.PATH_SEPARATOR}"
+    
+    @property
+    def depth(self):
+        return self.path.count(self.PATH_SEPARATOR)
+    
+    def _attach_to_parent(self):
+        """Path of the parent, after moving a too deep reply up to its grandparent"""
+        parent_path = self.parent_reply.path if self.parent_reply_id else ''
+        if parent_path.count(self.PATH_SEPARATOR) >= self.MAX_DEPTH:
+            # Too deep, attach to the grandparent instead
+            parent_path = parent_path[:-(self.PATH_STEP_WIDTH + 1)]
+            self.parent_reply_id = int(parent_path[-(self.PATH_STEP_WIDTH + 1):-1])
+        return parent_path
+    
+    def save(self, *args, **kwargs):
+        if not self.path:
+            # Before pre_save, so every receiver sees the final parent
+            self._parent_path = self._attach_to_parent()
+        super().save(*args, **kwargs)
+    
+    def _save_table(self, *args, **kwargs):
+        updated = super()._save_table(*args, **kwargs)
+        if not self.path:
+            # The path ends with our own id, so it is written right after the
+            # insert, still before post_save receivers get to see the reply
+            parent_path = self.__dict__.pop('_parent_path', None)
+            if parent_path is None:
+                parent_path = self._attach_to_parent()
+            self.path = parent_path + self.path_step(self.pk)
+            type(self).objects.filter(pk=self.pk).update(path=self.path, parent_reply_id=self.parent_reply_id)
+        return updated
+
+
+class ReviewReply(CounterFieldsMixin, LoadedValuesMixin, ThreadedReply):
+    """Model for storing replies to reviews and nested replies"""
+    tracked_fields = ('review_id', 'user_id', 'is_active')
+    # Written by the engagement flush (see engagement.py)
+    counter_fields = ('likes', 'dislikes', 'hearts')
+    
+    review = models.ForeignKey(Review, on_delete=models.CASCADE, related_name='replies')
+    parent_reply = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='child_replies', help_text="Parent reply if this is a nested reply")
+    user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='review_replies')
     author_name = models.CharField(max_length=100)
-    author_email = models.EmailField()
+    author_email = models.EmailField(blank=True)
     reply_text = models.TextField()
-    is_approved = models.BooleanField(default=False, help_text='Reply is approved and visible')
-    is_active = models.BooleanField(default=True)
+    
+    # Engagement counts
+    likes = models.IntegerField(default=0)
+    dislikes = models.IntegerField(default=0)
+    hearts = models.IntegerField(default=0)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    is_active = models.BooleanField(default=True)
+    
+    active_condition = ACTIVE
+    objects = ActiveQuerySet.as_manager()
     
     class Meta:
         ordering = ['created_at']
+        verbose_name_plural = 'Review Replies'
         indexes = [
-            models.Index(fields=['comment', 'is_approved']),
+            models.Index(fields=['review']),
             models.Index(fields=['created_at']),
-            models.Index(fields=['is_active']),
+            # Reply threads in path order
+            models.Index(fields=['review', 'path'], name='reviewreply_thread_idx', condition=ACTIVE),
+            models.Index(fields=['user', '-created_at'], name='reviewreply_user_feed_idx', condition=ACTIVE),
         ]
     
     def __str__(self):
-        return f"Reply by {self.author_name} to comment {self.comment.id}"
+        return f"Reply by {self.author_name} to review {self.review.id}"
 
 
-class Blog(models.Model):
+class Blog(CommentCountersMixin, SlugImageMixin, models.Model):
     """Blog model for storing blog posts"""
     STATUS_CHOICES = [
         ('draft', 'Draft'),
@@ -308,12 +644,21 @@ class Blog(models.Model):
     author = models.CharField(max_length=100, default="AccessAdvisr", help_text="Author name")
     content = models.TextField(help_text="Full blog post content (HTML supported)")
     image = models.ImageField(upload_to=blog_image_upload_path, blank=True, null=True, help_text="Blog featured image")
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False, help_text="Widths of the generated derivatives and of the original, see images.py")
     video_url = models.URLField(blank=True, help_text="YouTube video URL")
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft', help_text="Blog status")
+    comment_count = models.IntegerField(default=0, editable=False, help_text="Approved active comments")
+    comments = GenericRelation('Comment')
+    comments_version = models.IntegerField(default=0, editable=False, help_text="Bumped whenever a comment or reply on this post changes")
+    comments_updated_at = models.DateTimeField(null=True, blank=True, editable=False, help_text="When a comment or reply on this post last changed")
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    card_fields = ('id', 'title', 'slug', 'author', 'image', 'image_derivatives', 'status', 'comment_count', 'created_at')
+    excerpt_source = 'content'
+    objects = PostQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -322,46 +667,6 @@ class Blog(models.Model):
             models.Index(fields=['created_at']),
         ]
     
-    def save(self, *args, **kwargs):
-        """Auto-generate slug if not provided and handle image cleanup"""
-        # Store old image path before saving
-        old_image_path = None
-        if self.pk:
-            try:
-                old_blog = Blog.objects.get(pk=self.pk)
-                old_image_path = old_blog.image.path if old_blog.image else None
-            except Blog.DoesNotExist:
-                pass
-        
-        # Generate slug if not provided
-        if not self.slug:
-            self.slug = slugify(self.title)
-            # Ensure uniqueness
-            original_slug = self.slug
-            counter = 1
-            while Blog.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-        
-        # Save first to get the slug
-        super().save(*args, **kwargs)
-        
-        # If image was updated/removed, delete old image file
-        if old_image_path:
-            current_image_path = self.image.path if (self.image and hasattr(self.image, 'path')) else None
-            if old_image_path != current_image_path and os.path.isfile(old_image_path):
-                try:
-                    os.remove(old_image_path)
-                except (OSError, FileNotFoundError):
-                    pass
-    
-    def delete(self, *args, **kwargs):
-        """Delete image file when blog is deleted"""
-        if self.image:
-            if os.path.isfile(self.image.path):
-                os.remove(self.image.path)
-        super().delete(*args, **kwargs)
-    
     def __str__(self):
         return self.title
     
@@ -371,59 +676,11 @@ class Blog(models.Model):
         return reverse('blog-detail', kwargs={'slug': self.slug})
     
     def get_comment_count(self):
-        """Get count of approved comments"""
-        return self.comments.filter(is_approved=True, is_active=True).count()
-
-
-class BlogComment(models.Model):
-    """Model for storing comments on blog posts"""
-    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='comments')
-    author_name = models.CharField(max_length=100)
-    author_email = models.EmailField()
-    comment_text = models.TextField()
-    save_info = models.BooleanField(default=False, help_text='Save name, email for next time')
-    is_approved = models.BooleanField(default=False, help_text='Comment is approved and visible')
-    is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-    
-    class Meta:
-        ordering = ['-created_at']
-        indexes = [
-            models.Index(fields=['blog', 'is_approved']),
-            models.Index(fields=['created_at']),
-            models.Index(fields=['is_active']),
-        ]
-    
-    def __str__(self):
-        return f"Comment by {self.author_name} on {self.blog.title}"
-
-
-class BlogCommentReply(models.Model):
-    """Model for storing replies to blog comments"""
-    comment = models.ForeignKey(BlogComment, on_delete=models.CASCADE, related_name='replies')
-    parent_reply = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='child_replies', help_text='Parent reply if this is a nested reply')
-    author_name = models.CharField(max_length=100)
-    author_email = models.EmailField()
-    reply_text = models.TextField()
-    is_approved = models.BooleanField(default=False, help_text='Reply is approved and visible')
-    is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-    
-    class Meta:
-        ordering = ['created_at']
-        indexes = [
-            models.Index(fields=['comment', 'is_approved']),
-            models.Index(fields=['created_at']),
-            models.Index(fields=['is_active']),
-        ]
-    
-    def __str__(self):
-        return f"Reply by {self.author_name} to comment {self.comment.id}"
+        """Get count of approved comments, kept up to date by the comment receivers"""
+        return self.comment_count
 
 
-class Partner(models.Model):
+class Partner(CommentCountersMixin, SlugImageMixin, models.Model):
     """Partner model for storing partner/friend posts"""
     STATUS_CHOICES = [
         ('draft', 'Draft'),
@@ -437,6 +694,7 @@ class Partner(models.Model):
     slug = models.SlugField(max_length=300, unique=True, blank=True, help_text="URL-friendly name (auto-generated from title if left blank)")
     author = models.CharField(max_length=100, default="AccessAdvisr", help_text="Author name")
     image = models.ImageField(upload_to=partner_image_upload_path, blank=True, null=True, help_text="Partner logo/image for card")
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False, help_text="Widths of the generated derivatives and of the original, see images.py")
     short_description = models.TextField(blank=True, help_text="Short description for card view")
     
     # Video
@@ -469,10 +727,18 @@ class Partner(models.Model):
     # Status and ordering
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft', help_text="Partner post status")
     order = models.IntegerField(default=0, help_text="Display order (lower numbers appear first)")
+    comment_count = models.IntegerField(default=0, editable=False, help_text="Approved active comments")
+    comments = GenericRelation('Comment')
+    comments_version = models.IntegerField(default=0, editable=False, help_text="Bumped whenever a comment or reply on this post changes")
+    comments_updated_at = models.DateTimeField(null=True, blank=True, editable=False, help_text="When a comment or reply on this post last changed")
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    card_fields = ('id', 'title', 'slug', 'image', 'image_derivatives', 'short_description', 'status', 'order', 'created_at')
+    excerpt_source = None
+    objects = PostQuerySet.as_manager()
+    
     class Meta:
         ordering = ['order', 'title']
         indexes = [
@@ -481,46 +747,6 @@ class Partner(models.Model):
             models.Index(fields=['created_at']),
         ]
     
-    def save(self, *args, **kwargs):
-        """Auto-generate slug if not provided and handle image cleanup"""
-        # Store old image path before saving
-        old_image_path = None
-        if self.pk:
-            try:
-                old_partner = Partner.objects.get(pk=self.pk)
-                old_image_path = old_partner.image.path if old_partner.image else None
-            except Partner.DoesNotExist:
-                pass
-        
-        # Generate slug if not provided
-        if not self.slug:
-            self.slug = slugify(self.title)
-            # Ensure uniqueness
-            original_slug = self.slug
-            counter = 1
-            while Partner.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-        
-        # Save first to get the slug
-        super().save(*args, **kwargs)
-        
-        # If image was updated/removed, delete old image file
-        if old_image_path:
-            current_image_path = self.image.path if (self.image and hasattr(self.image, 'path')) else None
-            if old_image_path != current_image_path and os.path.isfile(old_image_path):
-                try:
-                    os.remove(old_image_path)
-                except (OSError, FileNotFoundError):
-                    pass
-    
-    def delete(self, *args, **kwargs):
-        """Delete image file when partner is deleted"""
-        if self.image:
-            if os.path.isfile(self.image.path):
-                os.remove(self.image.path)
-        super().delete(*args, **kwargs)
-    
     def __str__(self):
         return self.title
     
@@ -543,7 +769,7 @@ def about_post_image_upload_path(instance, filename):
     return f"images/about/{filename}"
 
 
-class AboutPost(models.Model):
+class AboutPost(CommentCountersMixin, SlugImageMixin, models.Model):
     """About Post model for storing about page posts"""
     STATUS_CHOICES = [
         ('draft', 'Draft'),
@@ -553,6 +779,7 @@ class AboutPost(models.Model):
     title = models.CharField(max_length=300, help_text="About post title")
     slug = models.SlugField(max_length=300, unique=True, blank=True, help_text="URL-friendly name (auto-generated from title if left blank)")
     image = models.ImageField(upload_to=about_post_image_upload_path, blank=True, null=True, help_text="Featured image for the post")
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False, help_text="Widths of the generated derivatives and of the original, see images.py")
     content = models.TextField(help_text="Full post content (HTML supported)")
     share_this_post = models.BooleanField(default=True, help_text="Show share buttons for this post")
     
@@ -566,10 +793,18 @@ class AboutPost(models.Model):
     order = models.IntegerField(default=0, help_text="Display order (lower numbers appear first)")
     
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft', help_text="Post status")
+    comment_count = models.IntegerField(default=0, editable=False, help_text="Approved active comments")
+    comments = GenericRelation('Comment')
+    comments_version = models.IntegerField(default=0, editable=False, help_text="Bumped whenever a comment or reply on this post changes")
+    comments_updated_at = models.DateTimeField(null=True, blank=True, editable=False, help_text="When a comment or reply on this post last changed")
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    card_fields = ('id', 'title', 'slug', 'image', 'image_derivatives', 'status', 'order', 'created_at')
+    excerpt_source = 'content'
+    objects = PostQuerySet.as_manager()
+    
     class Meta:
         ordering = ['order', '-created_at']
         verbose_name = 'About Post'
@@ -580,43 +815,6 @@ class AboutPost(models.Model):
             models.Index(fields=['created_at']),
         ]
     
-    def save(self, *args, **kwargs):
-        """Auto-generate slug if not provided and handle image cleanup"""
-        old_image_path = None
-        if self.pk:
-            try:
-                old_post = AboutPost.objects.get(pk=self.pk)
-                old_image_path = old_post.image.path if old_post.image else None
-            except AboutPost.DoesNotExist:
-                pass
-        
-        # Generate slug if not provided
-        if not self.slug:
-            self.slug = slugify(self.title)
-            original_slug = self.slug
-            counter = 1
-            while AboutPost.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-                self.slug = f"{original_slug}-{counter}"
-                counter += 1
-        
-        super().save(*args, **kwargs)
-        
-        # If image was updated/removed, delete old image file
-        if old_image_path:
-            current_image_path = self.image.path if (self.image and hasattr(self.image, 'path')) else None
-            if old_image_path != current_image_path and os.path.isfile(old_image_path):
-                try:
-                    os.remove(old_image_path)
-                except (OSError, FileNotFoundError):
-                    pass
-    
-    def delete(self, *args, **kwargs):
-        """Delete image file when post is deleted"""
-        if self.image:
-            if os.path.isfile(self.image.path):
-                os.remove(self.image.path)
-        super().delete(*args, **kwargs)
-    
     def __str__(self):
         return self.title
     
@@ -626,33 +824,48 @@ class AboutPost(models.Model):
         return reverse('about-post-detail', kwargs={'slug': self.slug})
 
 
-class AboutComment(models.Model):
-    """Model for storing comments on about posts"""
-    about_post = models.ForeignKey(AboutPost, on_delete=models.CASCADE, related_name='comments')
+# Content comments can be attached to. Each keeps a comment_count and a
+# `comments` GenericRelation, so deleting it deletes its comments
+COMMENTABLE_MODELS = (Blog, Partner, AboutPost)
+
+
+class Comment(LoadedValuesMixin, models.Model):
+    """Comment on any commentable content object (blog, partner and about posts)"""
+    tracked_fields = ('content_type_id', 'object_id', 'is_active', 'is_approved')
+    
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey('content_type', 'object_id')
     author_name = models.CharField(max_length=100)
     author_email = models.EmailField()
     comment_text = models.TextField()
     save_info = models.BooleanField(default=False, help_text='Save name, email for next time')
     is_approved = models.BooleanField(default=False, help_text='Comment is approved and visible')
     is_active = models.BooleanField(default=True)
+    reply_count = models.IntegerField(default=0, editable=False, help_text='Approved active replies at any depth')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    active_condition = ACTIVE_APPROVED
+    objects = ActiveQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['about_post', 'is_approved']),
+            models.Index(fields=['content_type', 'object_id']),
             models.Index(fields=['created_at']),
-            models.Index(fields=['is_active']),
+            models.Index(fields=['content_type', 'object_id', '-created_at'], name='comment_visible_idx', condition=ACTIVE_APPROVED),
         ]
     
     def __str__(self):
-        return f"Comment by {self.author_name} on {self.about_post.title}"
+        return f"Comment by {self.author_name} on {self.content_object}"
 
 
-class AboutCommentReply(models.Model):
-    """Model for storing replies to about post comments"""
-    comment = models.ForeignKey(AboutComment, on_delete=models.CASCADE, related_name='replies')
+class CommentReply(LoadedValuesMixin, ThreadedReply):
+    """Model for storing replies to comments and nested replies"""
+    tracked_fields = ('comment_id', 'is_active', 'is_approved')
+    
+    comment = models.ForeignKey(Comment, on_delete=models.CASCADE, related_name='replies')
     parent_reply = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='child_replies', help_text='Parent reply if this is a nested reply')
     author_name = models.CharField(max_length=100)
     author_email = models.EmailField()
@@ -662,16 +875,20 @@ class AboutCommentReply(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    active_condition = ACTIVE_APPROVED
+    objects = ActiveQuerySet.as_manager()
+    
     class Meta:
         ordering = ['created_at']
+        verbose_name_plural = 'Comment Replies'
         indexes = [
-            models.Index(fields=['comment', 'is_approved']),
             models.Index(fields=['created_at']),
-            models.Index(fields=['is_active']),
+            # Reply threads in path order
+            models.Index(fields=['comment', 'path'], name='commentreply_thread_idx', condition=ACTIVE_APPROVED),
         ]
     
     def __str__(self):
-        return f"Reply by {self.author_name} to comment {self.comment.id}"
+        return f"Reply by {self.author_name} to comment {self.comment_id}"
 
 
 class DonationCampaign(models.Model):
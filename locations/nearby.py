@@ -0,0 +1,231 @@
+"""
+Server-side radius search used to render the first page of results
+without waiting for the Google Maps JS bundle.
+
+The first page never waits on Google: it holds the DB locations plus
+Nearby Search results already in the cache. On a miss the upstream
+request runs on a background thread to warm the cache for the next
+visitor, and the browse page fetches the missing results client-side.
+"""
+import hashlib
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from .models import Location
+from .ratings import get_rating_overlays
+from .utils import haversine_distance, validate_coordinates
+
+
+logger = logging.getLogger(__name__)
+
+# Google Nearby Search caps the radius at 50 km
+MAX_RADIUS_KM = 50
+DEFAULT_RADIUS_KM = 25
+INITIAL_RESULTS_LIMIT = 20
+UPSTREAM_CACHE_TIMEOUT = 60 * 15
+KM_PER_DEGREE_LAT = 111.32
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='nearby-google')
+
+# Same terms the browse page uses for its client-side Google search
+CATEGORY_SEARCH_TERMS = {
+    'accommodation': 'hotel lodge motel accommodation',
+    'entertainment': 'cinema theater entertainment amusement',
+    'food': 'restaurant cafe food dining',
+    'shopping': 'shopping mall store boutique',
+    'sport': 'gym stadium sports fitness recreation',
+    'transport': 'bus train transport station',
+    'travel': 'hotel travel tour airport flight',
+    'education': 'school university college education',
+}
+
+
+def parse_search_point(lat, lng, radius):
+    """
+    Parse lat/lng/radius query parameters
+    Returns (lat, lng, radius_km) or None if the point is not usable
+    """
+    if not lat or not lng:
+        return None
+    is_valid, _ = validate_coordinates(lat, lng)
+    if not is_valid:
+        return None
+    try:
+        radius_km = float(radius)
+    except (ValueError, TypeError):
+        radius_km = DEFAULT_RADIUS_KM
+    radius_km = max(0.1, min(radius_km, MAX_RADIUS_KM))
+    return float(lat), float(lng), radius_km
+
+
+def bounding_box(lat, lng, radius_km):
+    """
+    Return (min_lat, max_lat, min_lng, max_lng) enclosing the search circle,
+    so the (latitude, longitude) index can narrow candidates before the
+    exact haversine check
+    """
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    dlng = min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 180)
+    return lat - dlat, lat + dlat, lng - dlng, lng + dlng
+
+
+def nearby_locations(lat, lng, radius_km, category_name='', keywords='', limit=INITIAL_RESULTS_LIMIT):
+    """Active DB locations within radius_km of the point, nearest first"""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+    queryset = Location.objects.filter(
+        status='active',
+        latitude__range=(min_lat, max_lat),
+        longitude__range=(min_lng, max_lng),
+    ).select_related('category').only(
+        'name', 'latitude', 'longitude', 'address', 'phone', 'rating',
+        'place_id', 'image', 'category__name',
+    )
+    if category_name:
+        queryset = queryset.filter(category__name__iexact=category_name)
+    if keywords:
+        queryset = queryset.filter(Q(name__icontains=keywords) | Q(keywords__icontains=keywords))
+
+    results = []
+    for location in queryset:
+        distance = haversine_distance(lat, lng, location.latitude, location.longitude)
+        if distance > radius_km:
+            continue
+        results.append({
+            'source': 'db',
+            'place_id': location.place_id,
+            'name': location.name,
+            'vicinity': location.address,
+            'lat': float(location.latitude),
+            'lng': float(location.longitude),
+            'rating': float(location.rating),
+            'types': [location.category.name] if location.category else [],
+            'phone': location.phone,
+            'photo_url': location.image.url if location.image else '',
+            'url': f"/place/{location.place_id or location.id}/",
+            'distance_km': round(distance, 2),
+        })
+    results.sort(key=lambda item: item['distance_km'])
+    return results[:limit]
+
+
+def _google_cache_key(lat, lng, radius_km, query):
+    """Cached per rounded point (~100 m), radius and query"""
+    key_source = f"{lat:.3f}:{lng:.3f}:{radius_km:.1f}:{query.lower()}"
+    return 'nearby:google:' + hashlib.md5(key_source.encode('utf-8')).hexdigest()
+
+
+def cached_google_places(lat, lng, radius_km, query=''):
+    """Cached Google Nearby Search results for the point, None on a miss"""
+    if not getattr(settings, 'GOOGLE_MAPS_API_KEY', ''):
+        return []
+    return cache.get(_google_cache_key(lat, lng, radius_km, query))
+
+
+def fetch_google_places(lat, lng, radius_km, query=''):
+    """Google Nearby Search results for the point, fetched and cached"""
+    api_key = getattr(settings, 'GOOGLE_MAPS_API_KEY', '')
+    if not api_key:
+        return []
+
+    params = {
+        'location': f"{lat},{lng}",
+        'radius': int(radius_km * 1000),
+        'key': api_key,
+    }
+    if query:
+        params['keyword'] = query
+    else:
+        params['type'] = 'establishment'
+
+    try:
+        resp = requests.get(
+            'https://maps.googleapis.com/maps/api/place/nearbysearch/json',
+            params=params,
+            timeout=5,
+        )
+        data = resp.json()
+    except (requests.RequestException, ValueError):
+        return []
+
+    if data.get('status') not in ('OK', 'ZERO_RESULTS'):
+        return []
+
+    results = []
+    for place in data.get('results', []):
+        loc = (place.get('geometry') or {}).get('location') or {}
+        if 'lat' not in loc or 'lng' not in loc:
+            continue
+        photo_url = ''
+        if place.get('photos'):
+            photo_url = (
+                'https://maps.googleapis.com/maps/api/place/photo'
+                f"?maxwidth=400&photoreference={place['photos'][0].get('photo_reference', '')}&key={api_key}"
+            )
+        results.append({
+            'source': 'google',
+            'place_id': place.get('place_id', ''),
+            'name': place.get('name', ''),
+            'vicinity': place.get('vicinity', ''),
+            'lat': loc['lat'],
+            'lng': loc['lng'],
+            'rating': place.get('rating') or 0,
+            'types': place.get('types', []),
+            'business_status': place.get('business_status', ''),
+            'photo_url': photo_url,
+            'url': f"/place/google/{place.get('place_id', '')}/",
+        })
+
+    cache.set(_google_cache_key(lat, lng, radius_km, query), results, UPSTREAM_CACHE_TIMEOUT)
+    return results
+
+
+def _fetch_in_background(lat, lng, radius_km, query):
+    try:
+        fetch_google_places(lat, lng, radius_km, query=query)
+    except Exception:
+        # Nobody waits on the future, so the failure would go unnoticed
+        logger.exception('Could not fetch Google places near %s,%s', lat, lng)
+
+
+def initial_browse_results(lat, lng, radius_km, category_name='', query='', keywords='', limit=INITIAL_RESULTS_LIMIT):
+    """
+    First page of browse results: DB locations merged with cached upstream
+    results, de-duplicated by place_id and sorted by distance.
+    Each result carries the community_rating of its rating summary, None
+    for places nobody reviewed here yet.
+    Returns (results, whether the upstream results were included).
+    """
+    results = nearby_locations(lat, lng, radius_km, category_name=category_name, keywords=keywords, limit=limit)
+    seen_place_ids = {item['place_id'] for item in results if item['place_id']}
+
+    upstream = cached_google_places(lat, lng, radius_km, query=query)
+    if upstream is None:
+        _executor.submit(_fetch_in_background, lat, lng, radius_km, query)
+        return _with_community_ratings(results), False
+
+    for place in upstream:
+        if place['place_id'] in seen_place_ids:
+            continue
+        distance = haversine_distance(lat, lng, place['lat'], place['lng'])
+        if distance > radius_km:
+            continue
+        seen_place_ids.add(place['place_id'])
+        results.append(dict(place, distance_km=round(distance, 2)))
+
+    results.sort(key=lambda item: item['distance_km'])
+    return _with_community_ratings(results[:limit]), True
+
+
+def _with_community_ratings(results):
+    overlays = get_rating_overlays(item['place_id'] for item in results)
+    for item in results:
+        overlay = overlays.get(item['place_id'])
+        item['community_rating'] = overlay['average_rating'] if overlay else None
+    return results
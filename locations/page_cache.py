@@ -0,0 +1,140 @@
+"""
+Full-page cache for anonymous visitors.
+
+Content pages look the same to every anonymous visitor, so their rendered
+HTML is cached per path and normalized query string. Each cached view
+belongs to a group ('blogs', 'partners', ...) whose version is part of the
+key; the signals bump a group's version when its models change, so only
+the affected pages are re-rendered (see signals.py).
+
+Authenticated users, visitors with pending messages and non-GET requests
+always reach the view. The CSRF token in cached pages is swapped for a
+fresh one on every hit, which also sets the visitor's CSRF cookie. The
+view's ETag, Last-Modified and Cache-Control are cached with the page, so
+a matching conditional request gets a 304 from the cache as well, and
+browsers revalidate hits the same way as the view's own responses.
+"""
+import hashlib
+import re
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date, urlencode
+
+
+PAGE_CACHE_TIMEOUT = 60 * 60
+# Campaign parameters don't change the page, leave them out of the key
+IGNORED_QUERY_PARAMS = ('fbclid', 'gclid', 'msclkid')
+IGNORED_QUERY_PREFIXES = ('utm_',)
+
+CSRF_INPUT = re.compile(r'(name="csrfmiddlewaretoken" value=")[^"]*(")')
+CSRF_PLACEHOLDER = '__page_cache_csrf_token__'
+# Kept with the page so cache hits answer conditional requests too
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+
+def _version_key(group):
+    return f'page_cache:version:{group}'
+
+
+def group_version(group):
+    """Current version of a page cache group, changes whenever the group is invalidated"""
+    version = cache.get(_version_key(group))
+    if version is None:
+        # Start from the clock so a lost version never reuses old keys
+        cache.add(_version_key(group), int(time.time() * 1000), None)
+        version = cache.get(_version_key(group))
+    return version
+
+
+def _bump_versions(groups):
+    for group in groups:
+        try:
+            cache.incr(_version_key(group))
+        except ValueError:
+            # No version yet, so nothing of this group is cached
+            pass
+
+
+def invalidate_pages(*groups):
+    """
+    Retire every cached page of these groups once the current transaction
+    commits, so a page rendered from the old rows in the meantime is not
+    cached under the new version
+    """
+    if groups:
+        transaction.on_commit(lambda: _bump_versions(groups))
+
+
+def _normalized_query(request):
+    params = sorted(
+        (name, sorted(values)) for name, values in request.GET.lists()
+        if name not in IGNORED_QUERY_PARAMS and not name.startswith(IGNORED_QUERY_PREFIXES)
+    )
+    return urlencode(params, doseq=True)
+
+
+def _page_key(request, group):
+    url = f'{request.path}?{_normalized_query(request)}'
+    digest = hashlib.md5(url.encode('utf-8')).hexdigest()
+    return f'page_cache:page:{group}:{group_version(group)}:{digest}'
+
+
+def _cacheable_request(request):
+    return (
+        request.method in ('GET', 'HEAD')
+        and not request.user.is_authenticated
+        and CookieStorage.cookie_name not in request.COOKIES
+    )
+
+
+def _cacheable_response(response):
+    # Cookies other than the CSRF one (messages, session) are per visitor
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and set(response.cookies) <= {settings.CSRF_COOKIE_NAME}
+    )
+
+
+def cache_anonymous_page(group):
+    """Serve the view's response to anonymous GETs from the page cache of `group`"""
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if not _cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _page_key(request, group)
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type, headers = cached
+                last_modified = headers.get('Last-Modified')
+                response = get_conditional_response(
+                    request,
+                    etag=headers.get('ETag'),
+                    last_modified=last_modified and parse_http_date(last_modified),
+                )
+                if response is None:
+                    response = HttpResponse(content.replace(CSRF_PLACEHOLDER, get_token(request)), content_type=content_type)
+                for header, value in headers.items():
+                    response.headers[header] = value
+                return response
+
+            response = view_func(request, *args, **kwargs)
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+            if request.method == 'GET' and _cacheable_response(response):
+                content = CSRF_INPUT.sub(rf'\g<1>{CSRF_PLACEHOLDER}\g<2>', response.content.decode(response.charset))
+                headers = {header: response[header] for header in CACHED_HEADERS if response.has_header(header)}
+                cache.set(key, (content, response['Content-Type'], headers), PAGE_CACHE_TIMEOUT)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,77 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are sliced with a WHERE on the ordering key, by default
+(created_at, id) newest first, instead of OFFSET, so fetching any page
+costs the same index range scan regardless of how deep it is. The cursor
+is an opaque token holding the last row's key.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+NEWEST_FIRST = ('-created_at', '-pk')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _key_fields(model, ordering):
+    """[(attribute name, model field, descending)] for an ordering ending in pk"""
+    fields = []
+    for name in ordering:
+        descending = name.startswith('-')
+        name = name.lstrip('-')
+        field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+        fields.append((name, field, descending))
+    return fields
+
+
+def encode_cursor(obj, ordering=NEWEST_FIRST):
+    values = [field.value_to_string(obj) for _, field, _ in _key_fields(type(obj), ordering)]
+    return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, model, ordering=NEWEST_FIRST):
+    """Key values from a cursor, raises InvalidCursor for malformed tokens"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        fields = _key_fields(model, ordering)
+        if not isinstance(values, list) or len(values) != len(fields):
+            raise ValueError('Cursor does not match the ordering')
+        return [field.to_python(value) for (_, field, _), value in zip(fields, values)]
+    except (ValueError, UnicodeError, ValidationError) as e:
+        raise InvalidCursor(str(e)) from e
+
+
+def _after(fields, values):
+    """Rows strictly after the key `values` in the order given by `fields`"""
+    condition = Q()
+    equal = {}
+    for (name, _, descending), value in zip(fields, values):
+        condition |= Q(**equal, **{f"{name}__{'lt' if descending else 'gt'}": value})
+        equal[name] = value
+    return condition
+
+
+def keyset_page(queryset, cursor=None, page_size=20, ordering=NEWEST_FIRST):
+    """
+    One page of `queryset` in `ordering` after `cursor`. The ordering must
+    end in a unique field (pk) so every row has a distinct key.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, ordering)
+        queryset = queryset.filter(_after(_key_fields(queryset.model, ordering), values))
+
+    # One extra row tells whether another page exists without a COUNT
+    items = list(queryset[:page_size + 1])
+    if len(items) > page_size:
+        items = items[:page_size]
+        return items, encode_cursor(items[-1], ordering)
+    return items, None
@@ -0,0 +1,103 @@
+"""
+Community rating overlays for Google search result cards.
+
+Listing pages post the place_ids of a whole result page at once and get
+back our own aggregate ratings and the most reported accessibility
+features for each. Overlays are cached per place_id, so only the ids that
+miss are read from the database, with one IN query against the rating
+summaries and one against the reviews for their feature lists. The Review
+receivers in signals.py drop the cached overlay whenever a review changes.
+"""
+import hashlib
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+
+from .models import PlaceRatingSummary, Review
+
+
+MAX_PLACE_IDS = 100
+TOP_FEATURES = 3
+OVERLAY_CACHE_TIMEOUT = 60 * 60
+FEATURES_HEADING = 'Accessible Features:'
+FEATURE_MARK = '✓'
+
+
+def overlay_cache_key(place_id):
+    # Google place_ids can be long, hash them to stay within key limits
+    return 'place_rating:' + hashlib.md5(place_id.encode('utf-8')).hexdigest()
+
+
+def parse_accessibility_features(review_text):
+    """Feature names listed under the "Accessible Features:" heading of a review"""
+    _, heading, rest = (review_text or '').partition(FEATURES_HEADING)
+    if not heading:
+        return []
+    features = []
+    for line in rest.splitlines():
+        line = line.strip()
+        if line.startswith(FEATURE_MARK):
+            feature = line[len(FEATURE_MARK):].strip()
+            if feature:
+                features.append(feature)
+    return features
+
+
+def build_rating_overlays(place_ids):
+    """Overlays for the given place_ids straight from the database"""
+    overlays = {
+        summary.place_id: {
+            'review_count': summary.review_count,
+            'average_rating': round(summary.average_rating, 1),
+            'quality_rating': summary.quality_average,
+            'location_rating': summary.location_average,
+            'service_rating': summary.service_average,
+            'price_rating': summary.price_average,
+            'top_features': [],
+        }
+        for summary in PlaceRatingSummary.objects.filter(place_id__in=place_ids, review_count__gt=0)
+    }
+    if not overlays:
+        return overlays
+
+    feature_counts = defaultdict(Counter)
+    reviews = Review.objects.active().filter(
+        place_id__in=list(overlays),
+        review_text__contains=FEATURES_HEADING,
+    ).values_list('place_id', 'review_text')
+    for place_id, review_text in reviews.iterator():
+        feature_counts[place_id].update(set(parse_accessibility_features(review_text)))
+
+    for place_id, counts in feature_counts.items():
+        overlays[place_id]['top_features'] = [
+            {'name': name, 'count': count} for name, count in counts.most_common(TOP_FEATURES)
+        ]
+    return overlays
+
+
+def get_rating_overlays(place_ids):
+    """
+    {place_id: overlay} for the reviewed places among `place_ids`.
+    Places without active reviews are cached too but left out of the result.
+    """
+    place_ids = list(dict.fromkeys(place_id for place_id in place_ids if place_id))
+    keys = {overlay_cache_key(place_id): place_id for place_id in place_ids}
+    cached = cache.get_many(list(keys))
+
+    overlays = {keys[key]: overlay for key, overlay in cached.items()}
+    misses = [place_id for place_id in place_ids if place_id not in overlays]
+    if misses:
+        fresh = build_rating_overlays(misses)
+        # An empty dict marks a place we have no reviews for
+        missing = {place_id: fresh.get(place_id, {}) for place_id in misses}
+        cache.set_many(
+            {overlay_cache_key(place_id): overlay for place_id, overlay in missing.items()},
+            OVERLAY_CACHE_TIMEOUT,
+        )
+        overlays.update(missing)
+
+    return {place_id: overlays[place_id] for place_id in place_ids if overlays[place_id]}
+
+
+def invalidate_rating_overlays(*place_ids):
+    cache.delete_many([overlay_cache_key(place_id) for place_id in set(place_ids) if place_id])
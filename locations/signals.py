@@ -0,0 +1,156 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import (
+    AboutPost, Blog, Category, Comment, CommentReply, DonationCampaign, Location, Partner, Review, ReviewReply,
+)
+from .catalogue import invalidate_category_catalogue
+from .aggregates import bump_place_versions, update_place_rating_summary, update_counters, update_user_stats
+from .ratings import invalidate_rating_overlays
+from .fragments import bump_review_versions
+from .images import derivatives_recorded
+from .comments import bump_comment_versions
+from .page_cache import invalidate_pages
+from .sitemaps import sitemap_cache_groups_for
+from . import suggest
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Location)
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_catalogue_on_change(sender, **kwargs):
+    """Category counts depend on categories, locations and their reviews"""
+    invalidate_category_catalogue()
+
+
+@receiver(post_save, sender=Location)
+def index_location_on_save(sender, instance, **kwargs):
+    suggest.index_location(instance)
+
+
+@receiver(post_save, sender=Category)
+def index_category_on_save(sender, instance, **kwargs):
+    suggest.index_category(instance)
+
+
+@receiver(post_save, sender=Review)
+def index_review_on_save(sender, instance, created, **kwargs):
+    suggest.index_review(instance, created)
+
+
+@receiver(post_delete, sender=Location)
+def unindex_location_on_delete(sender, instance, **kwargs):
+    suggest.suggest_index.remove(('location', instance.pk))
+
+
+@receiver(post_delete, sender=Category)
+def unindex_category_on_delete(sender, instance, **kwargs):
+    suggest.suggest_index.remove(('category', instance.pk))
+
+
+@receiver(post_delete, sender=Review)
+def unindex_review_on_delete(sender, instance, **kwargs):
+    suggest.unindex_review(instance)
+
+
+@receiver(post_save, sender=Review)
+def update_rating_summary_on_save(sender, instance, **kwargs):
+    update_place_rating_summary(instance)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_summary_on_delete(sender, instance, **kwargs):
+    update_place_rating_summary(instance, deleted=True)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_save, sender=ReviewReply)
+def update_user_stats_on_save(sender, instance, **kwargs):
+    update_user_stats(instance)
+
+
+@receiver(post_delete, sender=Review)
+@receiver(post_delete, sender=ReviewReply)
+def update_user_stats_on_delete(sender, instance, **kwargs):
+    update_user_stats(instance, deleted=True)
+
+
+@receiver([post_save, post_delete], sender=ReviewReply)
+def bump_review_version_on_reply_change(sender, instance, **kwargs):
+    """A reply change alters the cached card (reply count) and thread of its review"""
+    loaded = instance.get_loaded_values() or {}
+    bump_review_versions({instance.review_id, loaded.get('review_id')} - {None})
+
+
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_rating_overlay_on_change(sender, instance, **kwargs):
+    # A review moved to another place changes the overlays of both
+    loaded = instance.get_loaded_values() or {}
+    invalidate_rating_overlays(instance.place_id, loaded.get('place_id'))
+
+
+@receiver([post_save, post_delete], sender=Review)
+def bump_place_version_on_review_change(sender, instance, **kwargs):
+    """The place reviews API validates against the summary version (see views.py)"""
+    loaded = instance.get_loaded_values() or {}
+    bump_place_versions({instance.place_id, loaded.get('place_id')} - {None})
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def bump_comment_version_on_comment_change(sender, instance, **kwargs):
+    """Any comment write, admin approval or deactivation included, retires the cached thread of its post"""
+    loaded = instance.get_loaded_values() or {}
+    targets = {(instance.content_type_id, instance.object_id)}
+    if loaded:
+        targets.add((loaded['content_type_id'], loaded['object_id']))
+    models = bump_comment_versions(targets)
+    invalidate_pages(*(PAGE_CACHE_GROUPS[model] for model in models))
+
+
+@receiver([post_save, post_delete], sender=CommentReply)
+def bump_comment_version_on_reply_change(sender, instance, **kwargs):
+    loaded = instance.get_loaded_values() or {}
+    comment_ids = {instance.comment_id, loaded.get('comment_id')} - {None}
+    models = bump_comment_versions(Comment.objects.filter(pk__in=comment_ids).values_list('content_type_id', 'object_id'))
+    invalidate_pages(*(PAGE_CACHE_GROUPS[model] for model in models))
+
+
+# Page cache group (see page_cache.py) of the pages rendering each model
+PAGE_CACHE_GROUPS = {
+    Blog: 'blogs',
+    Partner: 'partners',
+    AboutPost: 'about',
+    DonationCampaign: 'donate',
+}
+
+
+@receiver([post_save, post_delete, derivatives_recorded], sender=Blog)
+@receiver([post_save, post_delete, derivatives_recorded], sender=Partner)
+@receiver([post_save, post_delete, derivatives_recorded], sender=AboutPost)
+@receiver([post_save, post_delete], sender=DonationCampaign)
+def invalidate_pages_on_content_change(sender, **kwargs):
+    invalidate_pages(PAGE_CACHE_GROUPS[sender])
+
+
+@receiver([post_save, post_delete], sender=Blog)
+@receiver([post_save, post_delete], sender=Partner)
+@receiver([post_save, post_delete], sender=AboutPost)
+@receiver([post_save, post_delete], sender=Location)
+@receiver([post_save, post_delete], sender=Review)
+def invalidate_sitemaps_on_change(sender, **kwargs):
+    invalidate_pages(*sitemap_cache_groups_for(sender))
+
+
+@receiver(post_save, sender=ReviewReply)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=CommentReply)
+def update_counters_on_save(sender, instance, **kwargs):
+    """Comment and reply counts on the parent follow create, approve and deactivate"""
+    update_counters(instance)
+
+
+@receiver(post_delete, sender=ReviewReply)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=CommentReply)
+def update_counters_on_delete(sender, instance, **kwargs):
+    update_counters(instance, deleted=True)
@@ -1,13 +1,27 @@
+"""
+Sitemap sections served through the sitemap index.
+
+Every database backed section is paged by SITEMAP_PAGE_SIZE and reports
+its latest lastmod with one aggregate, so neither the index nor any page
+loads a whole table. The rendered output is cached gzipped in
+views_seo.py under the page cache versions of the sections involved,
+which the signals bump when one of a section's `models` changes.
+"""
 from django.contrib.sitemaps import Sitemap
+from django.db.models import Max
 from django.urls import reverse
-from django.utils import timezone
-from .models import Blog, Partner, AboutPost, Location
+from .models import Blog, Partner, AboutPost, Location, PlaceRatingSummary, Review
+
+
+# URLs per sitemap page, well under the protocol's 50,000 so rendering a page stays cheap
+SITEMAP_PAGE_SIZE = 5000
 
 
 class StaticViewSitemap(Sitemap):
     """Sitemap for static pages"""
     priority = 0.8
     changefreq = 'weekly'
+    models = ()
 
     def items(self):
         return [
@@ -35,65 +49,104 @@ class StaticViewSitemap(Sitemap):
         return reverse(item)
 
 
-class BlogSitemap(Sitemap):
+class ModelSitemap(Sitemap):
+    """Paged section over a queryset, `models` are the ones whose writes change it"""
+    limit = SITEMAP_PAGE_SIZE
+    lastmod_field = 'updated_at'
+    models = ()
+
+    def lastmod(self, obj):
+        return getattr(obj, self.lastmod_field)
+
+    def get_latest_lastmod(self):
+        return self.items().aggregate(latest=Max(self.lastmod_field))['latest']
+
+    def location(self, obj):
+        return obj.get_absolute_url()
+
+
+class BlogSitemap(ModelSitemap):
     """Sitemap for blog posts"""
     changefreq = 'weekly'
     priority = 0.9
+    models = (Blog,)
 
     def items(self):
-        return Blog.objects.filter(status='published').order_by('-created_at')
-
-    def lastmod(self, obj):
-        return obj.updated_at if hasattr(obj, 'updated_at') else obj.created_at
-    
-    def location(self, obj):
-        return obj.get_absolute_url()
+        return Blog.objects.filter(status='published').only('id', 'slug', 'updated_at').order_by('-created_at', '-id')
 
 
-class PartnerSitemap(Sitemap):
+class PartnerSitemap(ModelSitemap):
     """Sitemap for partner pages"""
     changefreq = 'monthly'
     priority = 0.7
+    models = (Partner,)
 
     def items(self):
-        return Partner.objects.filter(status='published').order_by('-created_at')
-
-    def lastmod(self, obj):
-        return obj.updated_at if hasattr(obj, 'updated_at') else obj.created_at
-    
-    def location(self, obj):
-        return obj.get_absolute_url()
+        # Same statuses as PartnerDetailView
+        return Partner.objects.filter(
+            status__in=['active', 'published']
+        ).only('id', 'slug', 'updated_at').order_by('-created_at', '-id')
 
 
-class AboutPostSitemap(Sitemap):
+class AboutPostSitemap(ModelSitemap):
     """Sitemap for about posts"""
     changefreq = 'monthly'
     priority = 0.6
+    models = (AboutPost,)
 
     def items(self):
-        return AboutPost.objects.filter(status='published').order_by('order')
+        return AboutPost.objects.filter(status='published').only('id', 'slug', 'updated_at').order_by('order', 'id')
 
-    def lastmod(self, obj):
-        return obj.updated_at if hasattr(obj, 'updated_at') else obj.created_at
-    
-    def location(self, obj):
-        return obj.get_absolute_url()
 
-
-class LocationSitemap(Sitemap):
+class LocationSitemap(ModelSitemap):
     """Sitemap for location detail pages"""
     changefreq = 'weekly'
     priority = 0.8
+    models = (Location,)
 
     def items(self):
-        # Get active locations from database
-        locations = Location.objects.filter(status='active').order_by('-created_at')[:500]  # Limit to 500 for performance
-        return locations
+        # In id order, so new locations land on the last page and earlier pages stay put
+        return Location.objects.filter(status='active').only('id', 'place_id', 'updated_at').order_by('id')
 
     def location(self, obj):
         # Use place_id if available, otherwise use primary key
         place_id = obj.place_id or str(obj.id)
         return reverse('place-detail', kwargs={'place_id': place_id})
 
-    def lastmod(self, obj):
-        return obj.updated_at if hasattr(obj, 'updated_at') else obj.created_at
+
+class ReviewedPlaceSitemap(ModelSitemap):
+    """Sitemap for Google place pages known only from their reviews"""
+    changefreq = 'weekly'
+    priority = 0.7
+    lastmod_field = 'last_review_at'
+    models = (Review, Location)
+
+    def items(self):
+        # One summary row per place with active reviews; places with a
+        # location are already listed by LocationSitemap
+        return PlaceRatingSummary.objects.filter(review_count__gt=0).exclude(
+            place_id__in=Location.objects.filter(status='active').exclude(place_id='').values('place_id')
+        ).only('id', 'place_id', 'last_review_at').order_by('id')
+
+    def location(self, obj):
+        return reverse('place-detail', kwargs={'place_id': obj.place_id})
+
+
+SITEMAPS = {
+    'static': StaticViewSitemap,
+    'blogs': BlogSitemap,
+    'partners': PartnerSitemap,
+    'about': AboutPostSitemap,
+    'locations': LocationSitemap,
+    'places': ReviewedPlaceSitemap,
+}
+
+
+def sitemap_cache_group(section):
+    """Page cache group (see page_cache.py) of a section's cached output"""
+    return f'sitemap-{section}'
+
+
+def sitemap_cache_groups_for(model):
+    """Groups of the sections listing `model`"""
+    return [sitemap_cache_group(section) for section, sitemap in SITEMAPS.items() if model in sitemap.models]
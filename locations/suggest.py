@@ -0,0 +1,240 @@
+"""
+In-memory prefix index for search box suggestions.
+
+Names of active locations, categories and reviewed places are kept in a
+sorted array of (token, entry key) pairs, so a prefix lookup is a bisect
+followed by a short scan. Every word of a name starts a token, which lets
+"eye" match "London Eye". The index is built lazily per process, kept up to
+date by the receivers in signals.py and rebuilt periodically to pick up
+changes made by other processes.
+"""
+import bisect
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from urllib.parse import quote
+
+from django.db.models import Count, Max
+
+from .models import Category, Location, Review
+
+
+MIN_QUERY_LENGTH = 2
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+# Upper bound on index rows scanned per lookup, keeps short prefixes cheap
+MAX_SCAN = 2000
+REBUILD_INTERVAL = 60 * 30
+
+_word_split = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(text):
+    """Lowercase, strip accents and collapse punctuation to single spaces"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = text.encode('ascii', 'ignore').decode('ascii').lower()
+    return ' '.join(word for word in _word_split.split(text) if word)
+
+
+def name_tokens(name):
+    """Index tokens for a name: the normalized name from each word onwards"""
+    words = normalize(name).split(' ')
+    return {' '.join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+def location_url(pk, place_id):
+    return f"/place/{place_id or pk}/"
+
+
+def category_url(name):
+    return f"/listing-half-map/?category={quote(name)}"
+
+
+def place_url(place_id):
+    return f"/place/google/{place_id}/"
+
+
+class PrefixIndex:
+    """Sorted-array prefix index of suggestion entries ranked by popularity"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._rows = []
+        self._entries = {}
+        self._built_at = None
+
+    @property
+    def is_built(self):
+        return self._built_at is not None
+
+    def build(self):
+        """Rebuild the whole index from the database"""
+        entries = {}
+        for pk, name, place_id in Location.objects.filter(status='active').values_list('id', 'name', 'place_id'):
+            entries[('location', pk)] = {
+                'type': 'location',
+                'label': name,
+                'url': location_url(pk, place_id),
+                'popularity': 1,
+            }
+
+        for pk, name, location_count in Category.objects.annotate(
+            location_count=Count('location')
+        ).values_list('id', 'name', 'location_count'):
+            entries[('category', pk)] = {
+                'type': 'category',
+                'label': name,
+                'url': category_url(name),
+                'popularity': location_count,
+            }
+
+        places = Review.objects.active().exclude(place_name='').values('place_id').annotate(
+            name=Max('place_name'), review_count=Count('id')
+        )
+        for place in places:
+            entries[('place', place['place_id'])] = {
+                'type': 'place',
+                'label': place['name'],
+                'url': place_url(place['place_id']),
+                'popularity': place['review_count'],
+            }
+
+        rows = []
+        for key, entry in entries.items():
+            entry['tokens'] = name_tokens(entry['label'])
+            rows.extend((token, key) for token in entry['tokens'])
+        rows.sort()
+
+        with self._lock:
+            self._entries = entries
+            self._rows = rows
+            self._built_at = time.monotonic()
+
+    def ensure_built(self):
+        if self._built_at is None or time.monotonic() - self._built_at > REBUILD_INTERVAL:
+            self.build()
+
+    def upsert(self, key, label, url, popularity=None):
+        """Add an entry or refresh its label; keeps popularity unless given"""
+        with self._lock:
+            if not self.is_built:
+                return
+            existing = self._entries.get(key)
+            if popularity is None:
+                popularity = existing['popularity'] if existing else 1
+            if existing:
+                self._remove_rows(key, existing['tokens'])
+            tokens = name_tokens(label)
+            self._entries[key] = {
+                'type': key[0],
+                'label': label,
+                'url': url,
+                'popularity': popularity,
+                'tokens': tokens,
+            }
+            for token in tokens:
+                bisect.insort(self._rows, (token, key))
+
+    def adjust_popularity(self, key, delta):
+        """Change an entry's popularity; returns the new popularity, None if the entry is not indexed"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry['popularity'] = max(0, entry['popularity'] + delta)
+            return entry['popularity']
+
+    def remove(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry:
+                self._remove_rows(key, entry['tokens'])
+
+    def _remove_rows(self, key, tokens):
+        for token in tokens:
+            index = bisect.bisect_left(self._rows, (token, key))
+            if index < len(self._rows) and self._rows[index] == (token, key):
+                del self._rows[index]
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Top `limit` entries whose name has a word starting with `query`"""
+        prefix = normalize(query)
+        if len(prefix) < MIN_QUERY_LENGTH:
+            return []
+        self.ensure_built()
+
+        with self._lock:
+            rows = self._rows
+            matches = set()
+            index = bisect.bisect_left(rows, (prefix,))
+            end = min(len(rows), index + MAX_SCAN)
+            while index < end and rows[index][0].startswith(prefix):
+                matches.add(rows[index][1])
+                index += 1
+            entries = [self._entries[key] for key in matches]
+
+        best = heapq.nlargest(limit, entries, key=lambda entry: (entry['popularity'], -len(entry['label'])))
+        return [
+            {
+                'type': entry['type'],
+                'label': entry['label'],
+                'url': entry['url'],
+                'popularity': entry['popularity'],
+            }
+            for entry in best
+        ]
+
+
+suggest_index = PrefixIndex()
+
+
+def index_location(location):
+    key = ('location', location.pk)
+    if location.status == 'active':
+        suggest_index.upsert(key, location.name, location_url(location.pk, location.place_id))
+    else:
+        suggest_index.remove(key)
+
+
+def index_category(category):
+    suggest_index.upsert(('category', category.pk), category.name, category_url(category.name))
+
+
+def _counted_place(values):
+    """Place an active review counts towards, or None"""
+    return values['place_id'] if values.get('is_active') else None
+
+
+def _adjust_place(place_id, delta, place_name=''):
+    key = ('place', place_id)
+    popularity = suggest_index.adjust_popularity(key, delta)
+    if popularity == 0:
+        # No active reviews left, build() would not list the place either
+        suggest_index.remove(key)
+    elif popularity is None and delta > 0 and place_name:
+        suggest_index.upsert(key, place_name, place_url(place_id), popularity=delta)
+
+
+def index_review(review, created):
+    """
+    Follow a review's contribution to its place popularity when it is
+    created, deactivated, reactivated or moved, adding the place if unseen
+    """
+    current = {'place_id': review.place_id, 'is_active': review.is_active}
+    loaded = review.get_loaded_values()
+    old = None if created or loaded is None else _counted_place(dict(current, **loaded))
+    new = _counted_place(current)
+    if old == new:
+        return
+    if old is not None:
+        _adjust_place(old, -1)
+    if new is not None:
+        _adjust_place(new, 1, review.place_name)
+
+
+def unindex_review(review):
+    place_id = _counted_place({'place_id': review.place_id, 'is_active': review.is_active})
+    if place_id is not None:
+        _adjust_place(place_id, -1)
@@ -0,0 +1,49 @@
+from django import template
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.utils.http import urlencode
+
+from locations.images import derivative_name
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_image(image, sizes='100vw', **attrs):
+    """
+    <picture> serving the WebP or JPEG derivative of an ImageField file
+    that fits `sizes`, e.g. {% responsive_image blog.image sizes="33vw" alt=blog.title class="card-img-top" %}.
+    A plain <img> of the original until the derivatives are recorded on the
+    image's model row (see models.TrackedImageMixin).
+    """
+    if not image:
+        return ''
+    attrs.setdefault('loading', 'lazy')
+    attributes = format_html_join(' ', '{}="{}"', sorted(attrs.items()))
+
+    derivatives_field = getattr(image.instance, 'derivatives_field', None)
+    derivatives = (getattr(image.instance, derivatives_field) if derivatives_field else None) or {}
+    widths, original_width = derivatives.get('widths'), derivatives.get('original_width')
+    if not widths:
+        return format_html('<img src="{}" {}>', image.url, attributes)
+
+    def srcset(extension):
+        candidates = [
+            f'{image.storage.url(derivative_name(image.name, width, extension))} {width}w' for width in widths
+        ]
+        if original_width:
+            # Wider than every derivative, for displays that need more
+            candidates.append(f'{image.url} {original_width}w')
+        return ', '.join(candidates)
+
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" {}></picture>',
+        srcset('webp'), sizes, image.url, srcset('jpg'), sizes, attributes,
+    )
+
+
+@register.simple_tag
+def avatar_url(name):
+    """URL of the initials avatar of `name`, see views_avatars.py"""
+    return f"{reverse('initials-avatar')}?{urlencode({'name': name or ''})}"
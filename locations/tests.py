@@ -1,3 +1,403 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import unittest
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models.signals import post_save
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from .checks import check_engagement_cache
+from .engagement import (
+    DIRTY_SEQ_KEY, _dirty_key, _marked_key, buffer, flush_engagement, pending_engagement, record_engagement,
+)
+from .fragments import render_review_thread
+from .images import derivative_name, generate_derivatives
+from .models import AboutPost, Blog, Comment, CommentReply, Location, Partner, Review, ReviewReply
+from .nearby import initial_browse_results
+from .suggest import suggest_index
+from .views import place_reviews_etag, place_reviews_queryset
+from .views_frontend import contributions_queryset
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Plans are checked against SQLite EXPLAIN QUERY PLAN output')
+class ActiveIndexPlanTests(TestCase):
+    """The hot soft-delete filtered queries are answered from the partial indexes"""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index_name}', plan)
+        # Rows come out of the index already ordered
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_place_reviews_page(self):
+        queryset = place_reviews_queryset('place').order_by('-created_at', '-pk')[:6]
+        self.assertUsesIndex(queryset, 'review_place_feed_idx')
+
+    def test_contributions_feed(self):
+        queryset = contributions_queryset().order_by('-created_at', '-pk')[:25]
+        self.assertUsesIndex(queryset, 'review_active_feed_idx')
+
+    def test_profile_reviews_and_replies(self):
+        self.assertUsesIndex(Review.objects.active().filter(user_id=1).order_by('-created_at')[:10], 'review_user_feed_idx')
+        self.assertUsesIndex(ReviewReply.objects.active().filter(user_id=1).order_by('-created_at')[:10], 'reviewreply_user_feed_idx')
+
+    def test_review_reply_thread(self):
+        queryset = ReviewReply.objects.active().filter(review_id=1).order_by('path')
+        self.assertUsesIndex(queryset, 'reviewreply_thread_idx')
+
+    def test_comment_listing(self):
+        queryset = Comment.objects.active().filter(content_type_id=1, object_id=1).order_by('-created_at')
+        self.assertUsesIndex(queryset, 'comment_visible_idx')
+
+    def test_comment_reply_trees(self):
+        # The query attach_reply_trees() runs for a page of comments
+        queryset = CommentReply.objects.active().filter(comment__in=[1, 2]).order_by('comment_id', 'path')
+        self.assertUsesIndex(queryset, 'commentreply_thread_idx')
+
+
+def fetched_bytes(queryset):
+    """Size of the column values `queryset` reads from the database"""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return sum(len(str(value).encode()) for row in cursor.fetchall() for value in row if value is not None)
+
+
+class CardQuerysetTests(TestCase):
+    """List pages read the card fields only, not the post bodies"""
+
+    BODY = '<p>' + 'Step free access and wide doorways throughout. ' * 400 + '</p>'
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(12):
+            Blog.objects.create(title=f'Blog {i}', content=cls.BODY, status='published')
+            AboutPost.objects.create(title=f'About {i}', content=cls.BODY, status='published')
+            Partner.objects.create(
+                title=f'Partner {i}', short_description='Accessible venues', status='active',
+                content=cls.BODY, partner_spotlight_description=cls.BODY, why_partner_description=cls.BODY,
+                services_description=cls.BODY, why_supports_description=cls.BODY, connect_description=cls.BODY,
+            )
+
+    def setUp(self):
+        # Render the pages instead of serving them from the page cache
+        cache.clear()
+
+    def test_cards_fetch_an_order_of_magnitude_less(self):
+        for model in (Blog, Partner, AboutPost):
+            with self.subTest(model.__name__):
+                full = fetched_bytes(model.objects.all())
+                cards = fetched_bytes(model.objects.cards())
+                self.assertLess(cards * 10, full)
+
+    def test_list_pages_do_not_load_deferred_fields(self):
+        # A template touching a field missing from card_fields costs a query per card
+        for url, queries in (('/blogs/', 1), ('/api/blogs/', 1), ('/partners/', 2), ('/api/partners/', 1), ('/about/', 2)):
+            with self.subTest(url), self.assertNumQueries(queries):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class PageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_pages_are_cached_until_their_group_changes(self):
+        self.client.get('/blogs/')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/blogs/?utm_source=mail').status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Blog.objects.create(title='Ramps everywhere', content='<p>Ramps</p>', status='published')
+        self.assertContains(self.client.get('/blogs/'), 'Ramps everywhere')
+
+    def test_cached_pages_carry_a_fresh_csrf_token(self):
+        self.client.get('/blogs/')
+        response = self.client.get('/blogs/')
+        self.assertNotContains(response, 'page_cache_csrf_token')
+        self.assertIn('csrftoken', response.cookies)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_detail_page_is_not_modified_until_its_comments_change(self):
+        blog = Blog.objects.create(title='Step free museums', content='<p>Lifts</p>', status='published')
+        url = f'/blog/{blog.slug}/'
+        etag = self.client.get(url)['ETag']
+        # Answered from the page cache without touching the database
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # Browsers have to revalidate instead of reusing the page heuristically
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(
+                content_object=blog, author_name='Sam', author_email='sam@example.com',
+                comment_text='Very helpful', is_approved=True,
+            )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_place_reviews_etag_follows_the_place_version(self):
+        url = '/api/places/place-1/reviews/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        review = Review.objects.create(place_id='place-1', author_name='Sam', review_text='Wide aisles')
+        etag = self.client.get(url)['ETag']
+        review.review_text = 'Wide aisles and a ramp'
+        review.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class BrowseResultsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(GOOGLE_MAPS_API_KEY='')
+    def test_initial_results_carry_the_community_rating_of_their_summary(self):
+        Location.objects.create(name='Harbour Cafe', slug='harbour-cafe', address='1 Quay', latitude=1, longitude=1, place_id='cafe', rating=2)
+        Location.objects.create(name='Pier Shop', slug='pier-shop', address='2 Quay', latitude=1.001, longitude=1, place_id='shop')
+        Review.objects.create(place_id='cafe', author_name='Sam', review_text='Level entrance', quality_rating=4)
+
+        results, upstream_included = initial_browse_results(1, 1, 5)
+        self.assertTrue(upstream_included)
+        self.assertEqual({item['place_id']: item['community_rating'] for item in results}, {'cafe': 4.8, 'shop': None})
+
+
+class SuggestIndexTests(TestCase):
+    def test_deactivated_reviews_stop_counting_towards_their_place(self):
+        suggest_index.build()
+        reviews = [
+            Review.objects.create(place_id='museum', place_name='Harbour Museum', author_name='Sam', review_text='Lifts')
+            for _ in range(2)
+        ]
+        self.assertEqual(suggest_index.search('harb')[0]['popularity'], 2)
+
+        reviews[0].is_active = False
+        reviews[0].save()
+        self.assertEqual(suggest_index.search('harb')[0]['popularity'], 1)
+        reviews[1].is_active = False
+        reviews[1].save()
+        self.assertEqual(suggest_index.search('harb'), [])
+
+
+class ReplyPathTests(TestCase):
+    def test_post_save_receivers_see_the_final_path_and_parent(self):
+        review = Review.objects.create(place_id='place-1', author_name='Sam', review_text='Ramp')
+        parent = None
+        with mock.patch.object(ReviewReply, 'MAX_DEPTH', 2):
+            for _ in range(2):
+                parent = ReviewReply.objects.create(review=review, parent_reply=parent, author_name='Alex', reply_text='Yes')
+            seen = []
+
+            def receiver(instance, **kwargs):
+                seen.append((instance.path, instance.parent_reply_id))
+
+            post_save.connect(receiver, sender=ReviewReply)
+            try:
+                reply = ReviewReply.objects.create(review=review, parent_reply=parent, author_name='Kim', reply_text='No')
+            finally:
+                post_save.disconnect(receiver, sender=ReviewReply)
+        reply.refresh_from_db()
+        self.assertEqual(reply.parent_reply_id, parent.parent_reply_id)
+        self.assertEqual(seen, [(reply.path, reply.parent_reply_id)])
+        self.assertEqual(reply.depth, 2)
+
+
+class CommentCounterTests(TestCase):
+    def test_saving_a_stale_post_keeps_its_comment_counters(self):
+        blog = Blog.objects.create(title='Quiet hours', content='<p>Tuesdays</p>', status='published')
+        stale = Blog.objects.get(pk=blog.pk)
+        Comment.objects.create(
+            content_object=blog, author_name='Sam', author_email='sam@example.com',
+            comment_text='Thanks', is_approved=True,
+        )
+        stale.title = 'Quiet hours at the museum'
+        stale.save()
+        blog.refresh_from_db()
+        self.assertEqual(blog.title, 'Quiet hours at the museum')
+        self.assertEqual((blog.comment_count, blog.comments_version), (1, 1))
+
+    def test_saving_a_stale_review_keeps_its_engagement_and_reply_count(self):
+        review = Review.objects.create(place_id='place-1', author_name='Sam', review_text='Ramp')
+        stale = Review.objects.get(pk=review.pk)
+        record_engagement('review', review.pk, 'like', 1)
+        ReviewReply.objects.create(review=review, author_name='Alex', reply_text='Agreed')
+        stale.review_text = 'Step-free ramp'
+        stale.save()
+        review.refresh_from_db()
+        self.assertEqual(review.review_text, 'Step-free ramp')
+        self.assertEqual((review.likes, review.reply_count), (1, 1))
+
+
+# The test process is the only worker, so its LocMemCache stands in for a shared Redis
+@mock.patch('locations.engagement.is_buffered', return_value=True)
+class EngagementBufferTests(TestCase):
+    def setUp(self):
+        buffer.clear()
+
+    def test_removals_and_a_late_log_entry_reach_the_database(self, is_buffered):
+        review = Review.objects.create(place_id='place-1', author_name='Sam', review_text='Ramp', likes=3)
+        record_engagement('review', review.pk, 'like', -1)
+        record_engagement('review', review.pk, 'like', -1)
+        record_engagement('review', review.pk, 'like', 1)
+        self.assertEqual(pending_engagement('review', [review.pk]), {review.pk: {'likes': -1}})
+        flush_engagement()
+        review.refresh_from_db()
+        self.assertEqual(review.likes, 2)
+        self.assertEqual(pending_engagement('review', [review.pk]), {})
+
+        # The sequence number is taken but the entry is written only after a flush ran
+        buffer.set(_marked_key('review', review.pk), 1)
+        seq = buffer.incr(DIRTY_SEQ_KEY)
+        record_engagement('review', review.pk, 'heart', 1)
+        flush_engagement()
+        buffer.set(_dirty_key(seq), ('review', review.pk))
+        flush_engagement()
+        review.refresh_from_db()
+        self.assertEqual(review.hearts, 1)
+
+    def test_buffer_survives_a_full_default_cache(self, is_buffered):
+        review = Review.objects.create(place_id='place-1', author_name='Sam', review_text='Ramp')
+        for _ in range(5):
+            record_engagement('review', review.pk, 'like', 1)
+        for i in range(400):
+            cache.set(f'unrelated:{i}', i)
+        flush_engagement()
+        review.refresh_from_db()
+        self.assertEqual(review.likes, 5)
+
+    def test_cached_cards_threads_and_etags_follow_buffered_clicks(self, is_buffered):
+        cache.clear()
+        review = Review.objects.create(place_id='place-1', author_name='Sam', review_text='Ramp')
+        reply = ReviewReply.objects.create(review=review, author_name='Alex', reply_text='Agreed')
+        review.refresh_from_db()
+        cards, etags, threads = [], set(), []
+        for _ in range(3):
+            record_engagement('review', review.pk, 'like', 1)
+            record_engagement('reply', reply.pk, 'heart', 1)
+            cards.append(self.client.get('/api/places/place-1/reviews/').json()['html'])
+            etags.add(place_reviews_etag(None, 'place-1'))
+            threads.append(render_review_thread(review)[0])
+        for count, (card, thread) in enumerate(zip(cards, threads), 1):
+            self.assertIn(f'👍 {count}', card)
+            self.assertIn(f'❤️ {count}', thread)
+        self.assertEqual(len(etags), 3)
+
+
+class EngagementDirectWriteTests(TestCase):
+    def test_local_memory_cache_writes_through(self):
+        review = Review.objects.create(place_id='place-1', author_name='Sam', review_text='Ramp', likes=1)
+        version = review.version
+        record_engagement('review', review.pk, 'like', 1)
+        record_engagement('review', review.pk, 'dislike', -1)
+        review.refresh_from_db()
+        self.assertEqual((review.likes, review.dislikes), (2, 0))
+        self.assertEqual(review.version, version + 2)
+        self.assertEqual(pending_engagement('review', [review.pk]), {})
+
+    def test_evicting_buffer_cache_is_refused(self):
+        caches = {
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+            'engagement': {'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache'},
+        }
+        with override_settings(CACHES=caches):
+            self.assertEqual([error.id for error in check_engagement_cache(None)], ['locations.E002'])
+        self.assertEqual(check_engagement_cache(None), [])
+
+
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_reviewed_places_are_listed_once_and_served_from_cache(self):
+        Location.objects.create(name='Harbour Cafe', address='1 Quay', latitude=1, longitude=1, place_id='listed')
+        for place_id in ('listed', 'reviewed-only'):
+            with self.captureOnCommitCallbacks(execute=True):
+                Review.objects.create(place_id=place_id, author_name='Sam', review_text='Level entrance')
+
+        content = self.client.get('/sitemap-places.xml').content.decode()
+        self.assertIn('/place/reviewed-only/', content)
+        self.assertNotIn('/place/listed/', content)
+        self.assertIn('/sitemap-places.xml', self.client.get('/sitemap.xml').content.decode())
+        with self.assertNumQueries(0):
+            response = self.client.get('/sitemap-places.xml', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+
+class SlugAllocationTests(TestCase):
+    def test_colliding_titles_get_the_next_free_suffix_with_one_lookup(self):
+        Blog.objects.create(title='Accessible beaches', content='<p>Mats</p>')
+        Blog.objects.create(title='Accessible beaches', content='<p>Mats</p>', slug='accessible-beaches-2')
+        # The slug lookup and the INSERT
+        with self.assertNumQueries(2):
+            blogs = Blog.objects.bulk_create([Blog(title='Accessible beaches', content='<p>Mats</p>') for _ in range(3)])
+        self.assertEqual(
+            [blog.slug for blog in blogs],
+            ['accessible-beaches-1', 'accessible-beaches-3', 'accessible-beaches-4'],
+        )
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media_settings = override_settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+    def upload(self, width, height):
+        buffer = BytesIO()
+        Image.new('RGB', (width, height), 'orange').save(buffer, 'JPEG')
+        return SimpleUploadedFile('ramp.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+    def test_cards_use_the_derivatives_until_the_image_is_replaced(self):
+        blog = Blog.objects.create(title='Ramps', content='<p>Ramps</p>', image=self.upload(800, 600))
+        storage, name = blog.image.storage, blog.image.name
+        derivatives = generate_derivatives(storage, name)
+        self.assertEqual(derivatives, {'widths': [160, 320, 640], 'original_width': 800})
+        Blog.record_derivatives(blog.pk, name, derivatives)
+        blog = Blog.objects.cards().get(pk=blog.pk)
+
+        template = Template('{% load image_tags %}{% responsive_image blog.image sizes="33vw" alt=blog.title %}')
+        # Rendered from the recorded widths, without looking at storage
+        with mock.patch.object(FileSystemStorage, 'exists', side_effect=AssertionError), \
+                mock.patch.object(FileSystemStorage, 'open', side_effect=AssertionError):
+            html = template.render(Context({'blog': blog}))
+        self.assertIn(f'{storage.url(derivative_name(name, 640, "webp"))} 640w', html)
+        self.assertIn(f'{blog.image.url} 800w', html)
+        self.assertIn('sizes="33vw"', html)
+
+        blog.image = self.upload(400, 300)
+        blog.save()
+        self.assertFalse(storage.exists(name))
+        self.assertFalse(storage.exists(derivative_name(name, 320, 'jpg')))
+        blog.refresh_from_db()
+        self.assertEqual(blog.image_derivatives, {})
+        self.assertNotIn('<picture>', template.render(Context({'blog': blog})))
+
+
+class AvatarTests(TestCase):
+    def test_contribution_cards_use_local_initials_avatars(self):
+        Review.objects.create(place_id='place-1', place_name='Harbour Cafe', author_name='Sam Rivers', review_text='Level entrance')
+        content = self.client.get('/all-contributions/').content.decode()
+        self.assertIn('/avatars/initials.svg?name=Sam+Rivers', content)
+        self.assertNotIn('ui-avatars.com', content)
+
+        response = self.client.get('/avatars/initials.svg?name=Sam+Rivers')
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertContains(response, '>SR</text>')
+        self.assertEqual(response.content, self.client.get('/avatars/initials.svg?name=Sam+Rivers').content)
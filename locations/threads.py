@@ -0,0 +1,60 @@
+"""
+Reply trees from materialized paths.
+
+Replies are fetched in (parent, path) order with one indexed query and
+linked into trees in a single pass. Each parent and reply gets its direct
+replies as a plain `children` list, so templates walk `comment.children`
+and `reply.children` at any depth without further queries.
+"""
+from collections import defaultdict
+
+
+def build_reply_tree(replies):
+    """
+    Link replies given in path order into trees and return the top-level
+    ones. Replies under a parent missing from `replies` (inactive or not
+    approved) are left out along with their subtree.
+    """
+    roots, by_id = [], {}
+    children = defaultdict(list)
+    for reply in replies:
+        if reply.parent_reply_id is None:
+            roots.append(reply)
+        elif reply.parent_reply_id in by_id:
+            parent = by_id[reply.parent_reply_id]
+            children[parent.pk].append(reply)
+            type(reply).parent_reply.field.set_cached_value(reply, parent)
+        else:
+            continue
+        by_id[reply.pk] = reply
+
+    for reply in by_id.values():
+        reply.children = children[reply.pk]
+    return roots
+
+
+def attach_reply_trees(parents, reply_model, parent_field):
+    """
+    Load the visible replies (see reply_model.active_condition) of all
+    `parents` (reviews or comments) in one query and attach the top-level
+    ones as each parent's `children`.
+    """
+    parents = list(parents)
+    if not parents:
+        return parents
+    parent_id_field = f'{parent_field}_id'
+    replies = reply_model.objects.active().filter(
+        **{f'{parent_field}__in': [parent.pk for parent in parents]}
+    ).order_by(parent_id_field, 'path')
+
+    grouped = defaultdict(list)
+    for reply in replies:
+        grouped[getattr(reply, parent_id_field)].append(reply)
+
+    forward = getattr(reply_model, parent_field).field
+    for parent in parents:
+        thread = grouped.get(parent.pk, [])
+        for reply in thread:
+            forward.set_cached_value(reply, parent)
+        parent.children = build_reply_tree(thread)
+    return parents
@@ -1,9 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from .views import CategoryCatalogueView, ActiveCategoriesView, SuggestView, PlaceRatingsView, PlaceReviewsView, ReviewRepliesView
+
 router = DefaultRouter()
 
 urlpatterns = [
+    path('categories/', CategoryCatalogueView.as_view(), name='api-categories'),
+    path('categories/active/', ActiveCategoriesView.as_view(), name='api-categories-active'),
+    path('suggest/', SuggestView.as_view(), name='api-suggest'),
+    path('places/ratings/', PlaceRatingsView.as_view(), name='api-place-ratings'),
+    path('places/<str:place_id>/reviews/', PlaceReviewsView.as_view(), name='api-place-reviews'),
+    path('reviews/<int:review_id>/replies/', ReviewRepliesView.as_view(), name='api-review-replies'),
     path('', include(router.urls)),
 ]
-
@@ -6,11 +6,35 @@ from django.views.generic import TemplateView
 from django.shortcuts import render
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 import requests
 import json
 
-from .models import Review, ReviewReply, Category
+from .models import Review, ReviewReply, PlaceRatingSummary
 from .serializers import CategorySerializer
+from .nearby import CATEGORY_SEARCH_TERMS, initial_browse_results, parse_search_point
+from .catalogue import get_category_catalogue, get_active_categories, catalogue_etag
+from .suggest import suggest_index, DEFAULT_LIMIT as SUGGEST_DEFAULT_LIMIT, MAX_LIMIT as SUGGEST_MAX_LIMIT
+from .ratings import get_rating_overlays, MAX_PLACE_IDS
+from .pagination import keyset_page, InvalidCursor
+from .fragments import render_review_cards, render_review_thread
+from .engagement import (
+    ENGAGEMENT_FIELDS, record_engagement, current_engagement, maybe_flush_engagement, apply_pending_engagement,
+    engagement_tag, pending_engagement,
+)
+
+
+# Map category filter values to category names
+CATEGORY_MAP = {
+    'accommodation': 'Accommodation',
+    'entertainment': 'Entertainment',
+    'food': 'Food & Drink',
+    'shopping': 'Shopping',
+    'sport': 'Sports & Recreational',
+    'transport': 'Transport',
+    'travel': 'Flight & Travel',
+    'education': 'Education'
+}
 
 
 class HomeView(TemplateView):
@@ -22,6 +46,32 @@ class HomeView(TemplateView):
         return context
 
 
+PLACE_REVIEWS_PAGE_SIZE = 5
+
+
+def place_reviews_queryset(place_id):
+    """Active reviews of a place, each carrying its reply_count"""
+    return Review.objects.active().filter(place_id=place_id)
+
+
+def place_reviews_etag(request, place_id):
+    """Changes with every review, reply and engagement flush of the place, and with buffered review clicks"""
+    summary = PlaceRatingSummary.objects.filter(place_id=place_id).values_list('version', 'review_count').first()
+    pending = pending_engagement('review', place_reviews_queryset(place_id).values_list('pk', flat=True))
+    return '{}-{}-{}'.format(*(summary or (0, 0)), engagement_tag(pending))
+
+
+def review_replies_etag(request, review_id):
+    """Changes with the review's version and buffered reply clicks, None (no ETag) for missing reviews"""
+    version = Review.objects.filter(id=review_id, is_active=True).values_list('version', flat=True).first()
+    if version is None:
+        return None
+    pending = pending_engagement('reply', ReviewReply.objects.active().filter(
+        review_id=review_id,
+    ).values_list('pk', flat=True))
+    return f'{review_id}-{version}-{engagement_tag(pending)}'
+
+
 class GooglePlaceDetailView(TemplateView):
     """
     Full details page for a Google Place (hotel, restaurant, education, etc.)
@@ -78,34 +128,24 @@ class GooglePlaceDetailView(TemplateView):
                 error_message = 'INVALID_PLACE_ID'
             place = {'error': error_message, 'name': 'Configuration Error'}
 
-        # Get reviews for this place from database with replies and nested replies
-        reviews = []
+        # Only the first page of reviews is rendered, the rest and the reply
+        # threads are fetched by the page from PlaceReviewsView and ReviewRepliesView
+        reviews, reviews_next_cursor = [], None
         if place_id:
-            from django.db.models import Prefetch
-            reviews = Review.objects.filter(
-                place_id=place_id, 
-                is_active=True
-            ).prefetch_related(
-                Prefetch(
-                    'replies', 
-                    queryset=ReviewReply.objects.filter(
-                        is_active=True, 
-                        parent_reply__isnull=True
-                    ).prefetch_related(
-                        Prefetch(
-                            'child_replies',
-                            queryset=ReviewReply.objects.filter(is_active=True).order_by('created_at')
-                        )
-                    ).order_by('created_at')
-                )
-            ).order_by('-created_at')
+            reviews, reviews_next_cursor = keyset_page(
+                place_reviews_queryset(place_id), page_size=PLACE_REVIEWS_PAGE_SIZE
+            )
+            apply_pending_engagement('review', reviews)
 
         context['place'] = place
+        context['reviews_html'] = render_review_cards(reviews)
         context['lat'] = lat if lat else 0
         context['lng'] = lng if lng else 0
         context['GOOGLE_MAPS_API_KEY'] = api_key
         context['reviews'] = reviews
+        context['reviews_next_cursor'] = reviews_next_cursor
         context['place_id'] = place_id
+        context['rating_summary'] = PlaceRatingSummary.objects.filter(place_id=place_id).first() if place_id else None
         
         # Debug info
         if place.get('photos'):
@@ -132,8 +172,8 @@ class SearchResultsView(TemplateView):
         keywords = self.request.GET.get('keywords', '').strip()
         amenity = self.request.GET.get('amenity', '').strip()
         
-        # Get all categories from database
-        categories = Category.objects.all().order_by('name')
+        # Get all categories from the cached catalogue
+        categories = get_category_catalogue()
         
         context['location_name'] = location_name
         context['category_name'] = category_name
@@ -167,21 +207,9 @@ class ListingsView(TemplateView):
         selected_features = self.request.GET.getlist('feature')
         
         # Get all categories for filters
-        categories = Category.objects.all().order_by('name')
-        
-        # Map category values to names
-        category_map = {
-            'accommodation': 'Accommodation',
-            'entertainment': 'Entertainment',
-            'food': 'Food & Drink',
-            'shopping': 'Shopping',
-            'sport': 'Sports & Recreational',
-            'transport': 'Transport',
-            'travel': 'Flight & Travel',
-            'education': 'Education'
-        }
+        categories = get_category_catalogue()
         
-        selected_category = category_map.get(category_value, '')
+        selected_category = CATEGORY_MAP.get(category_value, '')
         
         # All results from Google Places API - loaded by JavaScript
         context['locations'] = []
@@ -203,6 +231,8 @@ class ListingsView(TemplateView):
 class BrowseView(TemplateView):
     """
     Browse page - uses Google Places API for results
+    When lat/lng are given, the first page of results is built on the server
+    and embedded in the page, so it renders before the Maps JS bundle loads
     """
     template_name = 'browse.html'
 
@@ -211,7 +241,7 @@ class BrowseView(TemplateView):
         api_key = getattr(settings, 'GOOGLE_MAPS_API_KEY', '')
         
         # Get all categories for filters
-        categories = Category.objects.all().order_by('name')
+        categories = get_category_catalogue()
         
         # Get filter parameters
         keywords = self.request.GET.get('keywords', '').strip()
@@ -224,8 +254,28 @@ class BrowseView(TemplateView):
         user_lng = self.request.GET.get('lng', '').strip()
         radius = self.request.GET.get('radius', '25').strip()
         
+        # Initial page: DB locations + cached Google results, nearest first.
+        # Without cached Google results the page fetches them at the same point.
+        initial_results = []
+        initial_search = None
+        search_point = parse_search_point(user_lat, user_lng, radius)
+        if search_point:
+            search_lat, search_lng, radius_km = search_point
+            query = ' '.join(filter(None, [CATEGORY_SEARCH_TERMS.get(category_value, category_value), keywords]))
+            initial_results, upstream_included = initial_browse_results(
+                search_lat, search_lng, radius_km,
+                category_name=CATEGORY_MAP.get(category_value, ''),
+                query=query,
+                keywords=keywords,
+            )
+            initial_search = {
+                'lat': search_lat, 'lng': search_lng, 'query': query, 'complete': upstream_included,
+            }
+        
         # All results from Google Places API
         context['locations'] = []
+        context['initial_results'] = initial_results
+        context['initial_search'] = initial_search
         context['categories'] = categories
         context['GOOGLE_MAPS_API_KEY'] = api_key
         context['selected_category'] = category_value
@@ -241,6 +291,107 @@ class BrowseView(TemplateView):
         return context
 
 
+@method_decorator(condition(etag_func=lambda request: catalogue_etag()), name='get')
+class CategoryCatalogueView(APIView):
+    """API endpoint listing all categories with active location and review counts"""
+    
+    def get(self, request):
+        return Response(get_category_catalogue())
+
+
+@method_decorator(condition(etag_func=lambda request: catalogue_etag(active_only=True)), name='get')
+class ActiveCategoriesView(APIView):
+    """API endpoint listing categories that have active locations"""
+    
+    def get(self, request):
+        return Response(get_active_categories())
+
+
+class SuggestView(APIView):
+    """API endpoint for search box suggestions from our own locations, categories and reviewed places"""
+    
+    def get(self, request):
+        query = request.GET.get('q', '').strip()
+        try:
+            limit = int(request.GET.get('limit', SUGGEST_DEFAULT_LIMIT))
+        except (ValueError, TypeError):
+            limit = SUGGEST_DEFAULT_LIMIT
+        limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+        
+        response = Response({
+            'query': query,
+            'results': suggest_index.search(query, limit=limit),
+        })
+        response['Cache-Control'] = 'public, max-age=60'
+        return response
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class PlaceRatingsView(APIView):
+    """API endpoint returning our community ratings for a page of Google place_ids"""
+    
+    def post(self, request):
+        place_ids = request.data.get('place_ids')
+        if not isinstance(place_ids, list) or not all(isinstance(place_id, str) for place_id in place_ids):
+            return Response(
+                {'error': 'place_ids must be a list of Google Place IDs'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(place_ids) > MAX_PLACE_IDS:
+            return Response(
+                {'error': f'At most {MAX_PLACE_IDS} place IDs can be requested at once'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({'ratings': get_rating_overlays(place_ids)})
+
+
+@method_decorator(condition(etag_func=place_reviews_etag), name='get')
+class PlaceReviewsView(APIView):
+    """API endpoint returning a page of a place's reviews as rendered cards"""
+    
+    def get(self, request, place_id):
+        try:
+            reviews, next_cursor = keyset_page(
+                place_reviews_queryset(place_id),
+                cursor=request.GET.get('cursor'),
+                page_size=PLACE_REVIEWS_PAGE_SIZE,
+            )
+        except InvalidCursor:
+            return Response(
+                {'success': False, 'error': 'Invalid cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        apply_pending_engagement('review', reviews)
+        
+        return Response({
+            'success': True,
+            'html': render_review_cards(reviews),
+            'reviews': [{'id': review.id, 'reply_count': review.reply_count} for review in reviews],
+            'next_cursor': next_cursor,
+        })
+
+
+@method_decorator(condition(etag_func=review_replies_etag), name='get')
+class ReviewRepliesView(APIView):
+    """API endpoint returning the reply thread of a review as rendered markup"""
+    
+    def get(self, request, review_id):
+        review = Review.objects.filter(id=review_id, is_active=True).only('id', 'version').first()
+        if review is None:
+            return Response(
+                {'success': False, 'error': 'Review not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        html, count = render_review_thread(review)
+        
+        return Response({
+            'success': True,
+            'html': html,
+            'count': count,
+        })
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class SubmitReviewView(APIView):
     """API endpoint to submit a review"""
@@ -436,6 +587,7 @@ class SubmitReplyView(APIView):
             reply = ReviewReply.objects.create(
                 review=review,
                 parent_reply=parent_reply,
+                user=request.user if request.user.is_authenticated else None,
                 author_name=author_name,
                 author_email=author_email,
                 reply_text=reply_text,
@@ -491,96 +643,36 @@ class UpdateReviewEngagementView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            # Handle reply engagement
+            # Frontend tracks user state, backend just increments/decrements
+            # Frontend sends 'toggle' = true if user wants to undo (decrement)
+            # Frontend sends 'toggle' = false if user wants to like (increment)
             if reply_id:
-                try:
-                    reply = ReviewReply.objects.get(id=reply_id, is_active=True)
-                except ReviewReply.DoesNotExist:
-                    return Response(
-                        {'error': 'Reply not found'},
-                        status=status.HTTP_404_NOT_FOUND
-                    )
-                
-                if action_type == 'like':
-                    if is_toggle:
-                        reply.likes = max(0, reply.likes - 1)
-                        is_active = False
-                    else:
-                        reply.likes += 1
-                        is_active = True
-                elif action_type == 'dislike':
-                    if is_toggle:
-                        reply.dislikes = max(0, reply.dislikes - 1)
-                        is_active = False
-                    else:
-                        reply.dislikes += 1
-                        is_active = True
-                elif action_type == 'heart':
-                    if is_toggle:
-                        reply.hearts = max(0, reply.hearts - 1)
-                        is_active = False
-                    else:
-                        reply.hearts += 1
-                        is_active = True
-                
-                reply.save()
-                
-                return Response({
-                    'success': True,
-                    'likes': reply.likes,
-                    'dislikes': reply.dislikes,
-                    'hearts': reply.hearts,
-                    'is_active': is_active,
-                }, status=status.HTTP_200_OK)
+                kind, pk, queryset, missing = 'reply', reply_id, ReviewReply.objects, 'Reply not found'
+            else:
+                kind, pk, queryset, missing = 'review', review_id, Review.objects, 'Review not found'
             
-            # Handle review engagement
-            try:
-                review = Review.objects.get(id=review_id, is_active=True)
-            except Review.DoesNotExist:
+            stored = queryset.filter(id=pk, is_active=True).values('id', 'likes', 'dislikes', 'hearts').first()
+            if stored is None:
                 return Response(
-                    {'error': 'Review not found'},
+                    {'error': missing},
                     status=status.HTTP_404_NOT_FOUND
                 )
             
-            # Toggle functionality: frontend tracks user state, backend just increments/decrements
-            # Frontend sends 'is_toggle' = true if user wants to unlike (decrement)
-            # Frontend sends 'is_toggle' = false if user wants to like (increment)
-            
-            if action_type == 'like':
-                if is_toggle:
-                    # User wants to unlike (decrement)
-                    review.likes = max(0, review.likes - 1)
-                    is_active = False
-                else:
-                    # User wants to like (increment)
-                    review.likes += 1
-                    is_active = True
-            elif action_type == 'dislike':
-                if is_toggle:
-                    # User wants to undislike (decrement)
-                    review.dislikes = max(0, review.dislikes - 1)
-                    is_active = False
-                else:
-                    # User wants to dislike (increment)
-                    review.dislikes += 1
-                    is_active = True
-            elif action_type == 'heart':
-                if is_toggle:
-                    # User wants to unheart (decrement)
-                    review.hearts = max(0, review.hearts - 1)
-                    is_active = False
-                else:
-                    # User wants to heart (increment)
-                    review.hearts += 1
-                    is_active = True
-            
-            review.save()
+            # Counts are buffered and written in batches, see engagement.py
+            is_active = not is_toggle
+            counts = current_engagement(kind, stored['id'], stored)
+            field = ENGAGEMENT_FIELDS[action_type]
+            if is_active or counts[field] > 0:
+                delta = 1 if is_active else -1
+                record_engagement(kind, stored['id'], action_type, delta)
+                counts[field] += delta
+            maybe_flush_engagement()
             
             return Response({
                 'success': True,
-                'likes': review.likes,
-                'dislikes': review.dislikes,
-                'hearts': review.hearts,
+                'likes': counts['likes'],
+                'dislikes': counts['dislikes'],
+                'hearts': counts['hearts'],
                 'is_active': is_active,
             }, status=status.HTTP_200_OK)
             
@@ -617,7 +709,8 @@ class UpdateReviewView(APIView):
                 try:
                     reply = ReviewReply.objects.get(id=reply_id, is_active=True)
                     reply.reply_text = new_text
-                    reply.save()
+                    # Only the text, engagement counters are written by the flush (see engagement.py)
+                    reply.save(update_fields=['reply_text', 'updated_at'])
                     
                     return Response({
                         'success': True,
@@ -639,7 +732,9 @@ class UpdateReviewView(APIView):
                 try:
                     review = Review.objects.get(id=review_id, is_active=True)
                     review.review_text = new_text
-                    review.save()
+                    # Only the text, engagement counters are written by the flush (see engagement.py);
+                    # save() bumps the version along with it
+                    review.save(update_fields=['review_text', 'updated_at'])
                     
                     return Response({
                         'success': True,
@@ -3,65 +3,69 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
+from django.contrib.contenttypes.models import ContentType
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 import json
 
-from .models import Partner, PartnerComment, PartnerCommentReply
+from .comments import COMMENT_TARGETS
+from .models import Comment, CommentReply
 
 
 @method_decorator(csrf_exempt, name='dispatch')
-class SubmitPartnerCommentView(APIView):
+class SubmitCommentView(APIView):
     parser_classes = [JSONParser]
     permission_classes = [IsAuthenticated]
-    """API endpoint to submit a comment on a partner post"""
-    
+    """API endpoint to submit a comment on a blog, partner or about post"""
+    # Key of COMMENT_TARGETS, set per URL with as_view(target=...)
+    target = None
+
     def post(self, request):
+        target = COMMENT_TARGETS[self.target]
         try:
-            # DRF automatically parses JSON when JSONParser is used
             data = request.data if hasattr(request, 'data') else {}
-            
-            partner_id = data.get('partner_id')
+
+            object_id = data.get(target.id_field)
             author_name = data.get('author_name', '').strip()
             author_email = data.get('author_email', '').strip()
             comment_text = data.get('comment_text', '').strip()
             save_info = data.get('save_info', False)
-            
-            if not partner_id:
+
+            if not object_id:
                 return Response(
-                    {'error': 'Partner ID is required'},
+                    {'error': f'{target.label} ID is required'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
+
             if not author_name:
                 return Response(
                     {'error': 'Name is required'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
+
             if not author_email:
                 return Response(
                     {'error': 'Email is required'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
+
             if not comment_text:
                 return Response(
                     {'error': 'Comment text is required'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
+
             try:
-                partner = Partner.objects.get(id=partner_id, status__in=['active', 'published'])
-            except Partner.DoesNotExist:
+                content_object = target.model.objects.get(id=object_id, status__in=target.statuses)
+            except (target.model.DoesNotExist, ValueError):
                 return Response(
-                    {'error': 'Partner not found'},
+                    {'error': f'{target.label} not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
-            
+
             # Create comment (auto-approved)
-            comment = PartnerComment.objects.create(
-                partner=partner,
+            comment = Comment.objects.create(
+                content_object=content_object,
                 author_name=author_name,
                 author_email=author_email,
                 comment_text=comment_text,
@@ -69,13 +73,13 @@ class SubmitPartnerCommentView(APIView):
                 is_approved=True,  # Auto-approved
                 is_active=True
             )
-            
+
             return Response({
                 'success': True,
                 'message': 'Comment submitted successfully!',
                 'comment_id': comment.id
             }, status=status.HTTP_201_CREATED)
-            
+
         except json.JSONDecodeError:
             return Response(
                 {'error': 'Invalid JSON data'},
@@ -89,65 +93,71 @@ class SubmitPartnerCommentView(APIView):
 
 
 @method_decorator(csrf_exempt, name='dispatch')
-class SubmitPartnerCommentReplyView(APIView):
+class SubmitCommentReplyView(APIView):
     parser_classes = [JSONParser]
     permission_classes = [IsAuthenticated]
-    """API endpoint to submit a reply to a partner comment"""
-    
+    """API endpoint to submit a reply to a comment or to another reply"""
+    # Key of COMMENT_TARGETS, set per URL with as_view(target=...)
+    target = None
+
     def post(self, request):
+        target = COMMENT_TARGETS[self.target]
         try:
-            # DRF automatically parses JSON when JSONParser is used
             data = request.data if hasattr(request, 'data') else {}
-            
+
             comment_id = data.get('comment_id')
             parent_reply_id = data.get('parent_reply_id')
             author_name = data.get('author_name', '').strip()
             author_email = data.get('author_email', '').strip()
             reply_text = data.get('reply_text', '').strip()
-            
+
             if not comment_id:
                 return Response(
                     {'error': 'Comment ID is required'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
+
             if not author_name:
                 return Response(
                     {'error': 'Name is required'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
+
             if not author_email:
                 return Response(
                     {'error': 'Email is required'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
+
             if not reply_text:
                 return Response(
                     {'error': 'Reply text is required'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            
+
             try:
-                comment = PartnerComment.objects.get(id=comment_id, is_active=True)
-            except PartnerComment.DoesNotExist:
+                comment = Comment.objects.get(
+                    id=comment_id,
+                    content_type=ContentType.objects.get_for_model(target.model),
+                    is_active=True,
+                )
+            except (Comment.DoesNotExist, ValueError):
                 return Response(
                     {'error': 'Comment not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
-            
+
             parent_reply = None
             if parent_reply_id:
                 try:
-                    parent_reply = PartnerCommentReply.objects.get(id=parent_reply_id, is_active=True, comment=comment)
-                except PartnerCommentReply.DoesNotExist:
+                    parent_reply = CommentReply.objects.get(id=parent_reply_id, is_active=True, comment=comment)
+                except (CommentReply.DoesNotExist, ValueError):
                     return Response(
                         {'error': 'Parent reply not found'},
                         status=status.HTTP_404_NOT_FOUND
                     )
-            
-            reply = PartnerCommentReply.objects.create(
+
+            reply = CommentReply.objects.create(
                 comment=comment,
                 parent_reply=parent_reply,
                 author_name=author_name,
@@ -156,13 +166,13 @@ class SubmitPartnerCommentReplyView(APIView):
                 is_approved=True,  # Auto-approve replies so they show immediately
                 is_active=True
             )
-            
+
             return Response({
                 'success': True,
                 'message': 'Reply submitted successfully!',
                 'reply_id': reply.id
             }, status=status.HTTP_201_CREATED)
-            
+
         except json.JSONDecodeError:
             return Response(
                 {'error': 'Invalid JSON data'},
@@ -173,4 +183,3 @@ class SubmitPartnerCommentReplyView(APIView):
                 {'error': str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-
@@ -1,10 +1,17 @@
 from django.views.generic import TemplateView, DetailView, ListView
 from django.views import View
 from django.shortcuts import get_object_or_404, render
+from django.template.loader import render_to_string
 from django.http import JsonResponse
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from locations.models import Review, Partner, Blog, AboutPost, AboutComment, AboutCommentReply, DonationCampaign, Category
+from django.utils.decorators import method_decorator
+from locations.models import Review, Partner, Blog, AboutPost, DonationCampaign
+from locations.catalogue import get_category_catalogue
+from locations.pagination import keyset_page, InvalidCursor
+from locations.comments import comments_for
+from locations.page_cache import cache_anonymous_page
+from locations.conditional import ConditionalDetailMixin
 import json
 import requests
 
@@ -16,7 +23,7 @@ class SubmitListingView(LoginRequiredMixin, View):
     
     def get(self, request):
         context = {
-            'categories': Category.objects.all().order_by('name'),
+            'categories': get_category_catalogue(),
             'GOOGLE_MAPS_API_KEY': getattr(settings, 'GOOGLE_MAPS_API_KEY', '')
         }
         return render(request, self.template_name, context)
@@ -165,13 +172,12 @@ class AccessAdvisrIndexView(TemplateView):
         context['GOOGLE_MAPS_API_KEY'] = getattr(settings, 'GOOGLE_MAPS_API_KEY', '')
         
         # Fetch 6 most recent active reviews
-        context['recent_contributions'] = Review.objects.filter(
-            is_active=True
-        ).order_by('-created_at')[:6]
+        context['recent_contributions'] = Review.objects.active().order_by('-created_at')[:6]
         
         return context
 
 
+@method_decorator(cache_anonymous_page('about'), name='dispatch')
 class AboutView(ListView):
     """List view for all about posts"""
     model = AboutPost
@@ -181,18 +187,20 @@ class AboutView(ListView):
     
     def get_queryset(self):
         """Only show published about posts"""
-        return AboutPost.objects.filter(status='published').order_by('order', '-created_at')
+        return AboutPost.objects.filter(status='published').cards().order_by('order', '-created_at')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Get all published posts for the cards section
-        context['all_about_posts'] = AboutPost.objects.filter(status='published').order_by('order', '-created_at')
+        context['all_about_posts'] = AboutPost.objects.filter(status='published').cards().order_by('order', '-created_at')
         return context
 
 
-class AboutPostDetailView(DetailView):
+@method_decorator(cache_anonymous_page('about'), name='dispatch')
+class AboutPostDetailView(ConditionalDetailMixin, DetailView):
     """Detail view for an about post"""
     model = AboutPost
+    page_cache_group = 'about'
     template_name = 'about_post_detail.html'
     context_object_name = 'about_post'
     slug_field = 'slug'
@@ -208,66 +216,62 @@ class AboutPostDetailView(DetailView):
         # Get recent about posts (excluding current one) for sidebar
         context['recent_about_posts'] = AboutPost.objects.filter(
             status='published'
-        ).exclude(id=self.object.id).order_by('order', '-created_at')[:4]
+        ).cards().exclude(id=self.object.id).order_by('order', '-created_at')[:4]
         
-        # Get all approved comments with nested replies
-        from django.db.models import Prefetch
-        
-        replies_prefetch = Prefetch(
-            'replies',
-            queryset=AboutCommentReply.objects.filter(
-                is_active=True,
-                is_approved=True,
-                parent_reply__isnull=True
-            ).prefetch_related(
-                Prefetch(
-                    'child_replies',
-                    queryset=AboutCommentReply.objects.filter(
-                        is_active=True,
-                        is_approved=True
-                    ).order_by('created_at')
-                )
-            ).order_by('created_at')
-        )
-        
-        context['comments'] = AboutComment.objects.filter(
-            about_post=self.object,
-            is_active=True,
-            is_approved=True
-        ).select_related('about_post').prefetch_related(replies_prefetch).order_by('-created_at')
+        # Get all approved comments with their approved replies at any depth
+        context['comments'] = comments_for(self.object)
         
         # Count all approved comments
-        context['total_comments_count'] = AboutComment.objects.filter(
-            about_post=self.object,
-            is_active=True,
-            is_approved=True
-        ).count()
+        context['total_comments_count'] = self.object.comment_count
         
         return context
 
 
+BLOGS_PAGE_SIZE = 9
+def blog_cards_queryset():
+    """Published blogs with just the card fields and an excerpt of the body"""
+    return Blog.objects.filter(status='published').cards()
+
+
+@method_decorator(cache_anonymous_page('blogs'), name='dispatch')
 class BlogsView(TemplateView):
     template_name = 'blogs.html'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Get all published blogs, ordered by most recent first
-        all_blogs = Blog.objects.filter(status='published').order_by('-created_at')
-        
-        # Pagination - show 9 blogs initially
-        page_size = 9
-        context['blogs'] = all_blogs[:page_size]
-        context['remaining_blogs'] = all_blogs[page_size:]
-        context['total_blogs'] = all_blogs.count()
-        context['showing_count'] = min(page_size, context['total_blogs'])
-        context['has_more'] = context['total_blogs'] > page_size
-        
+        # Only the first page is rendered, the rest is fetched from BlogsPageView
+        context['blogs'], context['next_cursor'] = keyset_page(blog_cards_queryset(), page_size=BLOGS_PAGE_SIZE)
         return context
 
 
-class BlogDetailView(DetailView):
+@method_decorator(cache_anonymous_page('blogs'), name='dispatch')
+class BlogsPageView(View):
+    """JSON "load more" endpoint for the Blogs page"""
+    
+    def get(self, request):
+        try:
+            blogs, next_cursor = keyset_page(
+                blog_cards_queryset(),
+                cursor=request.GET.get('cursor'),
+                page_size=BLOGS_PAGE_SIZE,
+            )
+        except InvalidCursor:
+            return JsonResponse({'success': False, 'error': 'Invalid cursor'}, status=400)
+        
+        html = render_to_string('components/blog_cards.html', {'blogs': blogs}, request=request)
+        return JsonResponse({
+            'success': True,
+            'html': html,
+            'count': len(blogs),
+            'next_cursor': next_cursor,
+        })
+
+
+@method_decorator(cache_anonymous_page('blogs'), name='dispatch')
+class BlogDetailView(ConditionalDetailMixin, DetailView):
     """Detail view for a blog post"""
     model = Blog
+    page_cache_group = 'blogs'
     template_name = 'blog_detail.html'
     context_object_name = 'blog'
     slug_field = 'slug'
@@ -283,47 +287,18 @@ class BlogDetailView(DetailView):
         # Get recent blogs (excluding current one) for sidebar
         context['recent_blogs'] = Blog.objects.filter(
             status='published'
-        ).exclude(id=self.object.id).order_by('-created_at')[:4]
+        ).cards().exclude(id=self.object.id).order_by('-created_at')[:4]
         
         # Get popular blogs (excluding current one, ordered by most recent)
         context['popular_blogs'] = Blog.objects.filter(
             status='published'
-        ).exclude(id=self.object.id).order_by('-created_at')[:2]
+        ).cards().exclude(id=self.object.id).order_by('-created_at')[:2]
         
-        # Get all approved comments with nested replies
-        from locations.models import BlogComment, BlogCommentReply
-        from django.db.models import Prefetch
-        
-        # Prefetch replies with nested replies properly
-        replies_prefetch = Prefetch(
-            'replies',
-            queryset=BlogCommentReply.objects.filter(
-                is_active=True,
-                is_approved=True,
-                parent_reply__isnull=True  # Only top-level replies
-            ).prefetch_related(
-                Prefetch(
-                    'child_replies',
-                    queryset=BlogCommentReply.objects.filter(
-                        is_active=True,
-                        is_approved=True
-                    ).order_by('created_at')
-                )
-            ).order_by('created_at')
-        )
-        
-        context['comments'] = BlogComment.objects.filter(
-            blog=self.object,
-            is_active=True,
-            is_approved=True
-        ).select_related('blog').prefetch_related(replies_prefetch).order_by('-created_at')
+        # Get all approved comments with their approved replies at any depth
+        context['comments'] = comments_for(self.object)
         
         # Count all approved comments
-        context['total_comments_count'] = BlogComment.objects.filter(
-            blog=self.object,
-            is_active=True,
-            is_approved=True
-        ).count()
+        context['total_comments_count'] = self.object.comment_count
         
         return context
 
@@ -378,6 +353,7 @@ class ContactView(View):
             }, status=500)
 
 
+@method_decorator(cache_anonymous_page('donate'), name='dispatch')
 class DonateView(TemplateView):
     template_name = 'donate.html'
     
@@ -388,49 +364,84 @@ class DonateView(TemplateView):
         return context
 
 
+PARTNERS_PAGE_SIZE = 6
+# The first partners are shown as sponsors, the rest in pages below them
+SPONSOR_COUNT = 3
+PARTNER_ORDERING = ('order', 'title', 'pk')
+
+
+def partner_cards_queryset():
+    """Active partners with just the card fields, leaving out the detail page sections"""
+    return Partner.objects.filter(status__in=['active', 'published']).cards()
+
+
+def partner_card_context():
+    """Sponsors and the first page of remaining partners for the partner card sections"""
+    sponsors, cursor = keyset_page(partner_cards_queryset(), page_size=SPONSOR_COUNT, ordering=PARTNER_ORDERING)
+    remaining, next_cursor = [], None
+    if cursor:
+        remaining, next_cursor = keyset_page(
+            partner_cards_queryset(), cursor=cursor, page_size=PARTNERS_PAGE_SIZE, ordering=PARTNER_ORDERING,
+        )
+    return {
+        'partners': sponsors,
+        'remaining_partners': remaining,
+        'next_cursor': next_cursor,
+    }
+
+
+@method_decorator(cache_anonymous_page('partners'), name='dispatch')
 class PackagesView(TemplateView):
     template_name = 'packages.html'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Get all active partners
-        all_partners = Partner.objects.filter(status__in=['active', 'published']).order_by('order', 'title')
-        # Get first 3 active partners
-        context['partners'] = all_partners[:3]
-        # Get remaining partners
-        context['remaining_partners'] = all_partners[3:]
-        context['total_partners'] = all_partners.count()
+        context.update(partner_card_context())
         return context
 
 
+@method_decorator(cache_anonymous_page('partners'), name='dispatch')
 class PartnersView(TemplateView):
     template_name = 'partners.html'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Get all active partners
-        all_partners = Partner.objects.filter(status__in=['active', 'published']).order_by('order', 'title')
-        
-        # First section: Show only first 3 partners
-        context['partners'] = all_partners[:3]
-        # Keep old variable name for backward compatibility
-        context['sponsors'] = context['partners']
-        
-        # Second section: Remaining partners (skip first 3)
-        remaining_partners = list(all_partners[3:])
-        context['remaining_partners'] = remaining_partners[:6]  # Show 6 initially
-        context['remaining_partners_all'] = remaining_partners  # All remaining for load more
-        context['remaining_partners_count'] = len(remaining_partners)
-        context['remaining_partners_showing'] = len(context['remaining_partners'])
-        # Keep old variable names for backward compatibility
-        context['remaining_sponsors'] = context['remaining_partners']
-        context['remaining_sponsors_all'] = context['remaining_partners_all']
-        context['remaining_sponsors_count'] = context['remaining_partners_count']
-        context['remaining_sponsors_showing'] = context['remaining_partners_showing']
-        
+        context.update(partner_card_context())
         return context
 
 
+@method_decorator(cache_anonymous_page('partners'), name='dispatch')
+class PartnersPageView(View):
+    """JSON "load more" endpoint for the partner cards on the Partners and Packages pages"""
+    
+    def get(self, request):
+        try:
+            partners, next_cursor = keyset_page(
+                partner_cards_queryset(),
+                cursor=request.GET.get('cursor'),
+                page_size=PARTNERS_PAGE_SIZE,
+                ordering=PARTNER_ORDERING,
+            )
+        except InvalidCursor:
+            return JsonResponse({'success': False, 'error': 'Invalid cursor'}, status=400)
+        
+        html = render_to_string('components/partner_cards.html', {'partners': partners}, request=request)
+        return JsonResponse({
+            'success': True,
+            'html': html,
+            'count': len(partners),
+            'next_cursor': next_cursor,
+        })
+
+
+CONTRIBUTIONS_PAGE_SIZE = 24
+
+
+def contributions_queryset():
+    """Active reviews with the author's profile joined in for the avatar"""
+    return Review.objects.active().select_related('user__profile')
+
+
 class AllContributionsView(TemplateView):
     template_name = 'all_contributions.html'
     
@@ -438,14 +449,41 @@ class AllContributionsView(TemplateView):
         context = super().get_context_data(**kwargs)
         context['GOOGLE_MAPS_API_KEY'] = getattr(settings, 'GOOGLE_MAPS_API_KEY', '')
         
-        # Fetch all active reviews, ordered by most recent first
-        context['all_contributions'] = Review.objects.filter(
-            is_active=True
-        ).order_by('-created_at')
+        # Only the first page is rendered, the rest is fetched from ContributionsPageView
+        contributions, next_cursor = keyset_page(contributions_queryset(), page_size=CONTRIBUTIONS_PAGE_SIZE)
+        context['all_contributions'] = contributions
+        context['next_cursor'] = next_cursor
         
         return context
 
 
+class ContributionsPageView(View):
+    """JSON "load more" endpoint for the All Contributions page"""
+    
+    def get(self, request):
+        try:
+            contributions, next_cursor = keyset_page(
+                contributions_queryset(),
+                cursor=request.GET.get('cursor'),
+                page_size=CONTRIBUTIONS_PAGE_SIZE,
+            )
+        except InvalidCursor:
+            return JsonResponse({'success': False, 'error': 'Invalid cursor'}, status=400)
+        
+        html = render_to_string(
+            'components/contribution_cards.html',
+            {'contributions': contributions},
+            request=request,
+        )
+        return JsonResponse({
+            'success': True,
+            'html': html,
+            'count': len(contributions),
+            'next_cursor': next_cursor,
+        })
+
+
+@method_decorator(cache_anonymous_page('landing'), name='dispatch')
 class EntertainmentView(TemplateView):
     template_name = 'entertainment.html'
     
@@ -455,6 +493,7 @@ class EntertainmentView(TemplateView):
         return context
 
 
+@method_decorator(cache_anonymous_page('landing'), name='dispatch')
 class FoodDrinkView(TemplateView):
     template_name = 'food_drink.html'
     
@@ -464,6 +503,7 @@ class FoodDrinkView(TemplateView):
         return context
 
 
+@method_decorator(cache_anonymous_page('landing'), name='dispatch')
 class ShoppingView(TemplateView):
     template_name = 'shopping.html'
     
@@ -473,6 +513,7 @@ class ShoppingView(TemplateView):
         return context
 
 
+@method_decorator(cache_anonymous_page('landing'), name='dispatch')
 class SportsRecreationalView(TemplateView):
     template_name = 'sports_recreational.html'
     
@@ -482,6 +523,7 @@ class SportsRecreationalView(TemplateView):
         return context
 
 
+@method_decorator(cache_anonymous_page('landing'), name='dispatch')
 class TransportView(TemplateView):
     template_name = 'transport.html'
     
@@ -491,6 +533,7 @@ class TransportView(TemplateView):
         return context
 
 
+@method_decorator(cache_anonymous_page('landing'), name='dispatch')
 class FlightTravelView(TemplateView):
     template_name = 'flight_travel.html'
     
@@ -500,6 +543,7 @@ class FlightTravelView(TemplateView):
         return context
 
 
+@method_decorator(cache_anonymous_page('landing'), name='dispatch')
 class EducationView(TemplateView):
     template_name = 'education.html'
     
@@ -509,6 +553,7 @@ class EducationView(TemplateView):
         return context
 
 
+@method_decorator(cache_anonymous_page('landing'), name='dispatch')
 class AccommodationView(TemplateView):
     template_name = 'accommodation.html'
     
@@ -518,9 +563,11 @@ class AccommodationView(TemplateView):
         return context
 
 
-class PartnerDetailView(DetailView):
+@method_decorator(cache_anonymous_page('partners'), name='dispatch')
+class PartnerDetailView(ConditionalDetailMixin, DetailView):
     """Detail view for a partner"""
     model = Partner
+    page_cache_group = 'partners'
     template_name = 'partner_detail.html'
     context_object_name = 'partner'
     slug_field = 'slug'
@@ -535,37 +582,15 @@ class PartnerDetailView(DetailView):
         # Get other active partners for sidebar (excluding current one)
         context['recent_partners'] = Partner.objects.filter(
             status__in=['active', 'published']
-        ).exclude(id=self.object.id).order_by('-created_at')[:4]
-        # Get all active comments (approved and unapproved - so users can see their own pending comments)
-        from locations.models import PartnerComment, PartnerCommentReply
-        from django.db.models import Prefetch
-        
-        # Prefetch replies with nested replies properly
-        replies_prefetch = Prefetch(
-            'replies',
-            queryset=PartnerCommentReply.objects.filter(
-                is_active=True,
-                parent_reply__isnull=True  # Only top-level replies
-            ).prefetch_related(
-                Prefetch(
-                    'child_replies',
-                    queryset=PartnerCommentReply.objects.filter(is_active=True).order_by('created_at')
-                )
-            ).order_by('created_at')
-        )
-        
-        context['comments'] = PartnerComment.objects.filter(
-            partner=self.object,
-            is_active=True
-        ).select_related('partner').prefetch_related(replies_prefetch).order_by('-created_at')
-        # Count all comments (both approved and unapproved) for display
-        context['total_comments_count'] = PartnerComment.objects.filter(
-            partner=self.object,
-            is_active=True
-        ).count()
+        ).cards().exclude(id=self.object.id).order_by('-created_at')[:4]
+        # Get all approved comments with their approved replies at any depth
+        context['comments'] = comments_for(self.object)
+        # Approved comments, kept up to date by the comment signals
+        context['total_comments_count'] = self.object.comment_count
         return context
 
 
+@method_decorator(cache_anonymous_page('partners'), name='dispatch')
 class PartnerListView(ListView):
     """List view for all partners"""
     model = Partner
@@ -575,7 +600,7 @@ class PartnerListView(ListView):
     
     def get_queryset(self):
         """Only show active/published partners"""
-        return Partner.objects.filter(status__in=['active', 'published']).order_by('order', 'title')
+        return Partner.objects.filter(status__in=['active', 'published']).cards().order_by('order', 'title')
 
 
 # Keep old class names for backward compatibility
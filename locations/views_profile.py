@@ -5,10 +5,15 @@ from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.db.models import Count, Avg
-from .models import Review, ReviewReply, UserProfile
+from .models import Review, ReviewReply, UserProfile, UserStats
 import json
 
 
+def user_stats(user):
+    """Stored contribution totals of `user`, zeros for users who have not contributed yet"""
+    return UserStats.objects.filter(user=user).first() or UserStats(user=user)
+
+
 @login_required
 def profile_view(request, username=None):
     """View user profile with statistics and activity"""
@@ -17,41 +22,29 @@ def profile_view(request, username=None):
     else:
         user = request.user
     
-    # Get user's reviews using author_email
-    user_reviews = Review.objects.filter(author_email=user.email).order_by('-created_at')[:10]
+    # Reviews and replies are looked up by owner through the partial (user, created_at) indexes
+    user_reviews = list(Review.objects.active().filter(user=user).order_by('-created_at')[:10])
+    user_replies = ReviewReply.objects.active().filter(user=user).select_related('review').order_by('-created_at')[:10]
     
-    # Get user's review replies using author_email
-    user_replies = ReviewReply.objects.filter(author_email=user.email).select_related('review').order_by('-created_at')[:10]
+    # All-time totals, maintained incrementally by the review and reply signals
+    stats = user_stats(user)
     
-    # Calculate statistics (optimized)
-    total_reviews = user_reviews.count() if len(user_reviews) < 10 else Review.objects.filter(author_email=user.email).count()
-    total_replies = ReviewReply.objects.filter(author_email=user.email).count()
-    
-    # Calculate average rating and engagement stats from user_reviews
-    if user_reviews:
-        avg_rating = sum(review.get_average_rating() for review in user_reviews) / len(user_reviews)
-        total_likes = sum(review.likes for review in user_reviews)
-        total_dislikes = sum(review.dislikes for review in user_reviews)
-        total_hearts = sum(review.hearts for review in user_reviews)
-    else:
-        avg_rating = 0
-        total_likes = total_dislikes = total_hearts = 0
-    
-    # Get recently reviewed places - just get unique place_ids from reviews
-    recent_reviews_with_places = Review.objects.filter(
-        author_email=user.email
-    ).values('place_id', 'place_name', 'created_at').distinct()[:6]
+    # Recently reviewed places, taken from the latest reviews already loaded
+    recent_reviews_with_places = [
+        {'place_id': review.place_id, 'place_name': review.place_name, 'created_at': review.created_at}
+        for review in user_reviews[:6]
+    ]
     
     context = {
         'profile_user': user,
         'user_reviews': user_reviews,
         'user_replies': user_replies,
-        'total_reviews': total_reviews,
-        'total_replies': total_replies,
-        'avg_rating': round(avg_rating, 1),
-        'total_likes': total_likes,
-        'total_dislikes': total_dislikes,
-        'total_hearts': total_hearts,
+        'total_reviews': stats.review_count,
+        'total_replies': stats.reply_count,
+        'avg_rating': stats.average_rating,
+        'total_likes': stats.likes,
+        'total_dislikes': stats.dislikes,
+        'total_hearts': stats.hearts,
         'recent_reviews': recent_reviews_with_places,
         'is_own_profile': user == request.user,
     }
@@ -100,9 +93,7 @@ def profile_edit(request):
             
             # Handle profile picture upload
             if 'profile_picture' in request.FILES:
-                # Delete old profile picture if exists
-                if profile.profile_picture:
-                    profile.profile_picture.delete(save=False)
+                # The old picture and its derivatives are deleted on save
                 profile.profile_picture = request.FILES['profile_picture']
             
             profile.save()
@@ -124,19 +115,13 @@ def profile_edit(request):
 @login_required
 def my_reviews(request):
     """View all reviews by current user"""
-    reviews = Review.objects.filter(author_email=request.user.email).order_by('-created_at')
-    
-    # Get statistics
-    total_reviews = reviews.count()
-    if reviews.exists():
-        avg_rating = sum(review.get_average_rating() for review in reviews) / reviews.count()
-    else:
-        avg_rating = 0
+    reviews = Review.objects.active().filter(user=request.user).order_by('-created_at')
+    stats = user_stats(request.user)
     
     context = {
         'reviews': reviews,
-        'total_reviews': total_reviews,
-        'avg_rating': round(avg_rating, 1),
+        'total_reviews': stats.review_count,
+        'avg_rating': stats.average_rating,
     }
     
     return render(request, 'profile/my_reviews.html', context)
@@ -146,10 +131,10 @@ def my_reviews(request):
 def my_favorites(request):
     """View user's favorite locations (places with liked/hearted reviews)"""
     # Get reviews where user has given hearts or likes
-    favorite_reviews = Review.objects.filter(
-        author_email=request.user.email,
+    favorite_reviews = Review.objects.active().filter(
+        user=request.user,
         hearts__gt=0
-    ).values('place_id', 'place_name', 'created_at', 'hearts', 'likes').distinct()
+    ).order_by('-created_at').values('place_id', 'place_name', 'created_at', 'hearts', 'likes').distinct()
     
     context = {
         'favorite_reviews': favorite_reviews,
@@ -196,7 +181,7 @@ def profile_settings(request):
 def delete_review(request, review_id):
     """Delete user's own review"""
     try:
-        review = get_object_or_404(Review, id=review_id, author_email=request.user.email)
+        review = get_object_or_404(Review, id=review_id, user=request.user)
         review.delete()
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
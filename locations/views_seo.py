@@ -1,8 +1,75 @@
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
 from django.views.generic import View
 from django.conf import settings
+from django.contrib.sitemaps import views as sitemap_views
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date
+from functools import wraps
+import gzip
+import hashlib
 import os
 
+from .page_cache import group_version
+from .sitemaps import sitemap_cache_group
+
+
+SITEMAP_CACHE_TIMEOUT = 60 * 60 * 24
+# Headers of the sitemap views kept with the cached output
+SITEMAP_HEADERS = ('Last-Modified', 'X-Robots-Tag')
+
+
+def _sitemap_cache_key(request, sections, section):
+    """Changes with the host, the requested page and the version of every section involved"""
+    parts = [request.scheme, request.get_host(), section or 'index', request.GET.get('p', '1')]
+    parts += [f'{name}:{group_version(sitemap_cache_group(name))}' for name in sections]
+    return hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+
+def cached_sitemap(view):
+    """
+    Serve a django.contrib.sitemaps view from a gzipped cache entry. The
+    entry is rendered on the first request after one of its sections
+    changed, every other crawler hit costs no queries. The key doubles as
+    the ETag.
+    """
+    @wraps(view)
+    def wrapper(request, sitemaps, section=None, **kwargs):
+        if section is not None:
+            if section not in sitemaps:
+                raise Http404(f'No sitemap available for section: {section!r}')
+            kwargs['section'] = section
+        key = _sitemap_cache_key(request, [section] if section else list(sitemaps), section)
+        cached = cache.get(f'sitemap:{key}')
+        if cached is None:
+            response = view(request, sitemaps, **kwargs)
+            response.render()
+            headers = {header: response[header] for header in SITEMAP_HEADERS if response.has_header(header)}
+            cached = (gzip.compress(response.content), response['Content-Type'], headers)
+            cache.set(f'sitemap:{key}', cached, SITEMAP_CACHE_TIMEOUT)
+
+        content, content_type, headers = cached
+        last_modified = headers.get('Last-Modified')
+        response = get_conditional_response(
+            request, etag=f'"{key}"', last_modified=last_modified and parse_http_date(last_modified),
+        )
+        if response is None:
+            if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+                response = HttpResponse(content, content_type=content_type)
+                response['Content-Encoding'] = 'gzip'
+            else:
+                response = HttpResponse(gzip.decompress(content), content_type=content_type)
+        response['ETag'] = f'"{key}"'
+        for header, value in headers.items():
+            response[header] = value
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+    return wrapper
+
+
+sitemap_index = cached_sitemap(sitemap_views.index)
+sitemap_section = cached_sitemap(sitemap_views.sitemap)
+
 
 class RobotsView(View):
     """Serve robots.txt file"""
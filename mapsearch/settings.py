@@ -87,6 +87,27 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# cache (e.g. Redis or Memcached) when running several workers.
+# The engagement alias buffers review likes, dislikes and hearts. It must be a
+# Redis that every worker shares and that does not evict (maxmemory-policy
+# noeviction), separate from the default cache. While it is local memory,
+# clicks are written to the database directly (see locations/engagement.py).
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='accessadvisr'),
+    },
+    'engagement': {
+        'BACKEND': config('ENGAGEMENT_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('ENGAGEMENT_CACHE_LOCATION', default='accessadvisr-engagement'),
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
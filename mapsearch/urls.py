@@ -19,26 +19,15 @@ from django.urls import path, include
 from django.views.generic import RedirectView
 from django.conf import settings
 from django.conf.urls.static import static
-from django.contrib.sitemaps.views import sitemap
-from locations.sitemaps import StaticViewSitemap, BlogSitemap, PartnerSitemap, AboutPostSitemap, LocationSitemap
+from locations.sitemaps import SITEMAPS
 from locations.views import HomeView, GooglePlaceDetailView, SearchResultsView, SubmitReviewView, UpdateReviewEngagementView, SubmitReplyView, UpdateReviewView, ListingsView, BrowseView
-from locations.views_partner_comments import SubmitPartnerCommentView, SubmitPartnerCommentReplyView
-from locations.views_blog_comments import SubmitBlogCommentView, SubmitBlogCommentReplyView
-from locations.views_about_comments import SubmitAboutCommentView, SubmitAboutCommentReplyView
+from locations.views_comments import SubmitCommentView, SubmitCommentReplyView
 from locations.views_donations import SubmitDonationView
-from locations.views_frontend import AccessAdvisrIndexView, AboutView, AboutPostDetailView, BlogsView, BlogDetailView, ContactView, DonateView, PackagesView, PartnersView, AllContributionsView, AccommodationView, EntertainmentView, FoodDrinkView, ShoppingView, SportsRecreationalView, TransportView, FlightTravelView, EducationView, PartnerDetailView, PartnerListView, SponsorDetailView, SponsorListView, SubmitListingView
+from locations.views_frontend import AccessAdvisrIndexView, AboutView, AboutPostDetailView, BlogsView, BlogsPageView, BlogDetailView, ContactView, DonateView, PackagesView, PartnersView, PartnersPageView, AllContributionsView, ContributionsPageView, AccommodationView, EntertainmentView, FoodDrinkView, ShoppingView, SportsRecreationalView, TransportView, FlightTravelView, EducationView, PartnerDetailView, PartnerListView, SponsorDetailView, SponsorListView, SubmitListingView
 from locations.views_auth import RegisterView, LoginView, LogoutView
 from locations.views_profile import profile_view, profile_edit, my_reviews, my_favorites, profile_settings, delete_review
-from locations.views_seo import RobotsView
-
-# Sitemap configuration
-sitemaps = {
-    'static': StaticViewSitemap,
-    'blogs': BlogSitemap,
-    'partners': PartnerSitemap,
-    'about': AboutPostSitemap,
-    'locations': LocationSitemap,
-}
+from locations.views_seo import RobotsView, sitemap_index, sitemap_section
+from locations.views_avatars import InitialsAvatarView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -66,15 +55,15 @@ urlpatterns = [
     path('api/reviews/update/', UpdateReviewView.as_view(), name='update-review'),
     path('api/reviews/engagement/', UpdateReviewEngagementView.as_view(), name='update-review-engagement'),
     path('api/reviews/reply/', SubmitReplyView.as_view(), name='submit-reply'),
-    path('api/partner-comments/submit/', SubmitPartnerCommentView.as_view(), name='submit-partner-comment'),
-    path('api/partner-comments/reply/', SubmitPartnerCommentReplyView.as_view(), name='submit-partner-comment-reply'),
+    path('api/partner-comments/submit/', SubmitCommentView.as_view(target='partner'), name='submit-partner-comment'),
+    path('api/partner-comments/reply/', SubmitCommentReplyView.as_view(target='partner'), name='submit-partner-comment-reply'),
     # Keep old URLs for backward compatibility
-    path('api/sponsor-comments/submit/', SubmitPartnerCommentView.as_view(), name='submit-sponsor-comment'),
-    path('api/sponsor-comments/reply/', SubmitPartnerCommentReplyView.as_view(), name='submit-sponsor-comment-reply'),
-    path('api/blog-comments/submit/', SubmitBlogCommentView.as_view(), name='submit-blog-comment'),
-    path('api/blog-comments/reply/', SubmitBlogCommentReplyView.as_view(), name='submit-blog-comment-reply'),
-    path('api/about-comments/submit/', SubmitAboutCommentView.as_view(), name='submit-about-comment'),
-    path('api/about-comments/reply/', SubmitAboutCommentReplyView.as_view(), name='submit-about-comment-reply'),
+    path('api/sponsor-comments/submit/', SubmitCommentView.as_view(target='partner'), name='submit-sponsor-comment'),
+    path('api/sponsor-comments/reply/', SubmitCommentReplyView.as_view(target='partner'), name='submit-sponsor-comment-reply'),
+    path('api/blog-comments/submit/', SubmitCommentView.as_view(target='blog'), name='submit-blog-comment'),
+    path('api/blog-comments/reply/', SubmitCommentReplyView.as_view(target='blog'), name='submit-blog-comment-reply'),
+    path('api/about-comments/submit/', SubmitCommentView.as_view(target='about'), name='submit-about-comment'),
+    path('api/about-comments/reply/', SubmitCommentReplyView.as_view(target='about'), name='submit-about-comment-reply'),
     path('api/donations/submit/', SubmitDonationView.as_view(), name='submit-donation'),
     path('place/google/<str:place_id>/', GooglePlaceDetailView.as_view(), name='google-place-detail'),
     path('place/<str:place_id>/', GooglePlaceDetailView.as_view(), name='place-detail'),
@@ -88,11 +77,13 @@ urlpatterns = [
     path('about/', AboutView.as_view(), name='about'),
     path('about/<slug:slug>/', AboutPostDetailView.as_view(), name='about-post-detail'),
     path('blogs/', BlogsView.as_view(), name='blogs'),
+    path('api/blogs/', BlogsPageView.as_view(), name='api-blogs'),
     path('blog/<slug:slug>/', BlogDetailView.as_view(), name='blog-detail'),
     path('contact/', ContactView.as_view(), name='contact'),
     path('donate/', DonateView.as_view(), name='donate'),
     path('packages/', PackagesView.as_view(), name='packages'),
     path('partners/', PartnersView.as_view(), name='partners'),
+    path('api/partners/', PartnersPageView.as_view(), name='api-partners'),
     path('partners-list/', PartnerListView.as_view(), name='partners-list'),
     path('partner/<slug:slug>/', PartnerDetailView.as_view(), name='partner-detail'),
     # Keep old URLs for backward compatibility
@@ -100,6 +91,7 @@ urlpatterns = [
     path('sponsor/<slug:slug>/', SponsorDetailView.as_view(), name='sponsor-detail'),
     path('contributions/', RedirectView.as_view(url='/all-contributions/', permanent=False), name='contributions-redirect'),
     path('all-contributions/', AllContributionsView.as_view(), name='all-contributions'),
+    path('api/contributions/', ContributionsPageView.as_view(), name='api-contributions'),
     path('accommodation/', AccommodationView.as_view(), name='accommodation'),
     path('entertainment/', EntertainmentView.as_view(), name='entertainment'),
     path('food-drink/', FoodDrinkView.as_view(), name='food-drink'),
@@ -110,11 +102,15 @@ urlpatterns = [
     path('education/', EducationView.as_view(), name='education'),
 
     # Sitemap URLs
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    path('sitemap.xml', sitemap_index, {'sitemaps': SITEMAPS}, name='sitemap-index'),
+    path('sitemap-<section>.xml', sitemap_section, {'sitemaps': SITEMAPS}, name='django.contrib.sitemaps.views.sitemap'),
     
     # SEO URLs
     path('robots.txt', RobotsView.as_view(), name='robots_txt'),
 
+    # Initials avatars for authors and places without a picture
+    path('avatars/initials.svg', InitialsAvatarView.as_view(), name='initials-avatar'),
+
         # Keep the original home as default, or change to accessadvisr_index
         path('', AccessAdvisrIndexView.as_view(), name='home'),
     path('', AccessAdvisrIndexView.as_view(), name='index'),
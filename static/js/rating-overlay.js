@@ -0,0 +1,128 @@
+// Community rating badges for Google result cards
+// Any element with data-place-id gets our own review average, review count and
+// most reported accessibility features from /api/places/ratings/. Cards added
+// in one render pass are collected and looked up in a single request. Pages
+// read the same averages through getCommunityRatings() to rate and sort cards.
+
+(function() {
+    const RATINGS_URL = '/api/places/ratings/';
+    const MAX_BATCH = 100;
+    const BATCH_DELAY_MS = 50;
+    const ratingCache = {};
+    let pending = new Set();
+    let timer = null;
+
+    function scheduleLookup() {
+        clearTimeout(timer);
+        timer = setTimeout(flush, BATCH_DELAY_MS);
+    }
+
+    function collect(root) {
+        const cards = root.matches && root.matches('[data-place-id]')
+            ? [root]
+            : Array.from(root.querySelectorAll ? root.querySelectorAll('[data-place-id]') : []);
+        cards.forEach(function(card) {
+            const placeId = card.getAttribute('data-place-id');
+            if (!placeId || card.hasAttribute('data-rating-overlay')) return;
+            if (placeId in ratingCache) {
+                decorate(card, ratingCache[placeId]);
+            } else {
+                pending.add(placeId);
+            }
+        });
+        if (pending.size) scheduleLookup();
+    }
+
+    // Looks up one batch into ratingCache, returns whether it succeeded
+    async function lookup(batch) {
+        try {
+            const response = await fetch(RATINGS_URL, {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({place_ids: batch})
+            });
+            if (!response.ok) return false;
+            const ratings = (await response.json()).ratings || {};
+            batch.forEach(function(placeId) {
+                ratingCache[placeId] = ratings[placeId] || null;
+            });
+            return true;
+        } catch (error) {
+            console.error('Community rating lookup failed:', error);
+            return false;
+        }
+    }
+
+    async function flush() {
+        const placeIds = Array.from(pending);
+        pending = new Set();
+        for (let start = 0; start < placeIds.length; start += MAX_BATCH) {
+            const batch = placeIds.slice(start, start + MAX_BATCH);
+            if (!await lookup(batch)) continue;
+            batch.forEach(function(placeId) {
+                document.querySelectorAll(`[data-place-id="${CSS.escape(placeId)}"]`).forEach(function(card) {
+                    decorate(card, ratingCache[placeId]);
+                });
+            });
+        }
+    }
+
+    function decorate(card, rating) {
+        if (card.hasAttribute('data-rating-overlay')) return;
+        card.setAttribute('data-rating-overlay', '');
+        if (!rating) return;
+
+        const badge = document.createElement('div');
+        badge.className = 'community-rating small mt-2';
+        badge.title = 'AccessAdvisr community rating';
+
+        const score = document.createElement('span');
+        score.className = 'badge text-white';
+        score.style.backgroundColor = '#FF431E';
+        score.innerHTML = '<i class="bi bi-people-fill me-1"></i>';
+        score.appendChild(document.createTextNode(
+            `${rating.average_rating.toFixed(1)} (${rating.review_count} review${rating.review_count !== 1 ? 's' : ''})`
+        ));
+        badge.appendChild(score);
+
+        rating.top_features.forEach(function(feature) {
+            const tag = document.createElement('span');
+            tag.className = 'badge bg-light text-dark ms-1';
+            tag.textContent = feature.name;
+            badge.appendChild(tag);
+        });
+
+        (card.querySelector('.card-body') || card).appendChild(badge);
+    }
+
+    window.loadCommunityRatings = function(root) {
+        collect(root || document);
+    };
+
+    // {place_id: rating or null} for sorting and card ratings, sharing the cache of the badges.
+    // Ids whose lookup failed are left out.
+    window.getCommunityRatings = async function(placeIds) {
+        const misses = Array.from(new Set(placeIds.filter(function(placeId) {
+            return placeId && !(placeId in ratingCache);
+        })));
+        for (let start = 0; start < misses.length; start += MAX_BATCH) {
+            await lookup(misses.slice(start, start + MAX_BATCH));
+        }
+        const ratings = {};
+        placeIds.forEach(function(placeId) {
+            if (placeId in ratingCache) ratings[placeId] = ratingCache[placeId];
+        });
+        return ratings;
+    };
+
+    document.addEventListener('DOMContentLoaded', function() {
+        collect(document);
+        new MutationObserver(function(mutations) {
+            mutations.forEach(function(mutation) {
+                mutation.addedNodes.forEach(function(node) {
+                    if (node.nodeType === Node.ELEMENT_NODE) collect(node);
+                });
+            });
+        }).observe(document.body, {childList: true, subtree: true});
+    });
+})();
@@ -0,0 +1,55 @@
+// Search box suggestions from /api/suggest/
+// Add data-suggest to any text input to get a dropdown of our own locations,
+// categories and reviewed places while typing, without calling Google.
+
+(function() {
+    const SUGGEST_URL = '/api/suggest/';
+    const MIN_LENGTH = 2;
+    const DEBOUNCE_MS = 150;
+    const responseCache = {};
+
+    function attachSuggestions(input, index) {
+        const list = document.createElement('datalist');
+        list.id = `suggest-list-${index}`;
+        document.body.appendChild(list);
+        input.setAttribute('list', list.id);
+        input.setAttribute('autocomplete', 'off');
+
+        let timer = null;
+        let lastQuery = '';
+
+        input.addEventListener('input', function() {
+            const query = input.value.trim();
+            clearTimeout(timer);
+            if (query.length < MIN_LENGTH || query === lastQuery) return;
+
+            timer = setTimeout(async function() {
+                lastQuery = query;
+                const key = query.toLowerCase();
+                try {
+                    if (!responseCache[key]) {
+                        const response = await fetch(`${SUGGEST_URL}?q=${encodeURIComponent(query)}`);
+                        if (!response.ok) return;
+                        responseCache[key] = (await response.json()).results || [];
+                    }
+                    renderOptions(list, responseCache[key]);
+                } catch (error) {
+                    console.error('Suggestion lookup failed:', error);
+                }
+            }, DEBOUNCE_MS);
+        });
+    }
+
+    function renderOptions(list, results) {
+        list.innerHTML = '';
+        results.forEach(function(result) {
+            const option = document.createElement('option');
+            option.value = result.label;
+            list.appendChild(option);
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        document.querySelectorAll('input[data-suggest]').forEach(attachSuggestions);
+    });
+})();